@@ -0,0 +1,137 @@
+import argparse
+import datetime
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from mysql.connector import Error
+
+from connection_pool import ConnectionPool
+from sequence_allocator import SequenceAllocator
+
+CLOSED_STATUSES = ("Completed", "Cancelled", "No-show")
+
+APPOINTMENT_COLUMNS = "appointmentID, dateTime, duration, status, type, notes, patientID, doctorID, roomNumber, updatedAt"
+
+APPOINTMENT_TABLES = ("APPOINTMENT", "APPOINTMENT_ARCHIVE")
+
+
+def all_appointments(query: str, params: Sequence[Any] = ()) -> Tuple[str, List[Any]]:
+    # Runs query, which reads "{appointments}", against the live and the archive table and joins the results with
+    # UNION ALL. Each copy keeps its own WHERE clause: MySQL before 8.0.22 cannot push an outer predicate into a
+    # UNION derived table and would read both tables in full.
+    statement = " UNION ALL ".join(query.format(appointments=table) for table in APPOINTMENT_TABLES)
+    return statement, list(params) * len(APPOINTMENT_TABLES)
+
+
+@dataclass
+class ArchiveResult:
+    cutoff: datetime.datetime
+    moved: int
+    batches: int
+    seconds: float
+
+
+class AppointmentArchiver:
+    def __init__(self, pool: ConnectionPool, sequences: SequenceAllocator,
+                 batch_size: int = 1000, pause: float = 0.0):
+        self.pool = pool
+        self.sequences = sequences
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def _move_batch(self, cutoff: datetime.datetime) -> int:
+        statuses = ", ".join(["%s"] * len(CLOSED_STATUSES))
+
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                SELECT appointmentID FROM APPOINTMENT
+                WHERE status IN ({statuses}) AND dateTime < %s
+                ORDER BY dateTime
+                LIMIT %s
+            """, (*CLOSED_STATUSES, cutoff, self.batch_size))
+            appointment_ids = [row[0] for row in cursor.fetchall()]
+
+            if appointment_ids:
+                placeholders = ", ".join(["%s"] * len(appointment_ids))
+                cursor.execute(f"""
+                    INSERT INTO APPOINTMENT_ARCHIVE ({APPOINTMENT_COLUMNS}, archivedAt)
+                    SELECT {APPOINTMENT_COLUMNS}, %s FROM APPOINTMENT
+                    WHERE appointmentID IN ({placeholders}) AND status IN ({statuses})
+                """, (datetime.datetime.now(), *appointment_ids, *CLOSED_STATUSES))
+                cursor.execute(f"""
+                    DELETE FROM APPOINTMENT
+                    WHERE appointmentID IN ({placeholders}) AND status IN ({statuses})
+                """, (*appointment_ids, *CLOSED_STATUSES))
+
+            connection.commit()
+            cursor.close()
+
+        return len(appointment_ids)
+
+    def archive(self, older_than_days: int = 30, max_batches: Optional[int] = None) -> ArchiveResult:
+        # New IDs are seeded from the live table, so the sequence must exist before rows leave it.
+        self.sequences.ensure_sequence("APPOINTMENT", "appointmentID", "APP")
+
+        cutoff = datetime.datetime.combine(datetime.date.today() - datetime.timedelta(days=older_than_days), datetime.time())
+        start = time.perf_counter()
+        moved = batches = 0
+
+        while max_batches is None or batches < max_batches:
+            count = self._move_batch(cutoff)
+            if not count:
+                break
+            moved += count
+            batches += 1
+            if count < self.batch_size:
+                break
+            if self.pause:
+                time.sleep(self.pause)
+
+        return ArchiveResult(cutoff, moved, batches, time.perf_counter() - start)
+
+    def counts(self) -> List[int]:
+        def fetch(connection):
+            cursor = connection.cursor()
+            cursor.execute("SELECT COUNT(*) FROM APPOINTMENT")
+            live = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM APPOINTMENT_ARCHIVE")
+            archived = cursor.fetchone()[0]
+            cursor.close()
+            return [live, archived]
+
+        return self.pool.read(fetch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move closed appointments older than a cutoff into APPOINTMENT_ARCHIVE in small batches.")
+    parser.add_argument("--older-than-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-batches", type=int, help="Stop after this many batches, to bound one run")
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds to wait between batches")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    from hospital_management import HospitalManagementSystem
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database, pool_size=1)
+    archiver = AppointmentArchiver(hospital_system.pool, hospital_system.sequences,
+                                   batch_size=args.batch_size, pause=args.pause)
+
+    try:
+        result = archiver.archive(args.older_than_days, args.max_batches)
+        live, archived = archiver.counts()
+    except Error as e:
+        print(f"Error archiving appointments: {e}")
+        raise SystemExit(1)
+
+    print(f"Moved {result.moved} closed appointments before {result.cutoff:%Y-%m-%d} in {result.batches} batches ({result.seconds:.1f}s)")
+    print(f"Live appointments: {live}, archived: {archived}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import asyncio
+import contextvars
+import datetime
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from hospital_management import HospitalManagementSystem
+from listings import Page
+from medical_history import PatientHistory
+from models import AppointmentConfirmation, NotFoundError, PatientMatch, SlotOption
+from recurring import RecurrenceRule, SeriesReport
+from replication import current_session
+
+
+class AsyncHospitalService:
+    def __init__(self, hospital_system: HospitalManagementSystem, max_workers: Optional[int] = None):
+        self.hospital_system = hospital_system
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or hospital_system.pool.size,
+            thread_name_prefix="hospital-service"
+        )
+
+    async def _run(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        current_session()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, context.run, functools.partial(function, *args, **kwargs))
+
+    async def is_valid_patient(self, patient_id: str) -> bool:
+        return await self._run(self.hospital_system.is_valid_patient, patient_id)
+
+    async def is_valid_doctor(self, doctor_id: str) -> bool:
+        return await self._run(self.hospital_system.is_valid_doctor, doctor_id)
+
+    async def is_valid_department(self, dept_id: str) -> bool:
+        return await self._run(self.hospital_system.is_valid_department, dept_id)
+
+    async def schedule_appointment(self, patient_id: str, doctor_id: str, date_time: datetime.datetime,
+                                   duration: int, appointment_type: str, preferred_room: str = "",
+                                   notes: str = "") -> AppointmentConfirmation:
+        current_session()
+        patient_valid, doctor_valid = await asyncio.gather(
+            self.is_valid_patient(patient_id),
+            self.is_valid_doctor(doctor_id)
+        )
+
+        if not patient_valid:
+            raise NotFoundError("Invalid patient ID. Please check and try again.")
+
+        if not doctor_valid:
+            raise NotFoundError("Invalid doctor ID. Please check and try again.")
+
+        return await self._run(
+            self.hospital_system.book_appointment,
+            patient_id, doctor_id, date_time, duration, appointment_type, preferred_room, notes
+        )
+
+    async def schedule_appointment_series(self, patient_id: str, doctor_id: str, rule: RecurrenceRule,
+                                          appointment_type: str, preferred_room: str = "", notes: str = "",
+                                          all_or_nothing: bool = False) -> SeriesReport:
+        return await self._run(
+            self.hospital_system.schedule_appointment_series,
+            patient_id, doctor_id, rule, appointment_type, preferred_room, notes, all_or_nothing
+        )
+
+    async def patient_history(self, patient_id: str, start_date: Optional[str] = None,
+                              end_date: Optional[str] = None) -> Optional[PatientHistory]:
+        return await self._run(self.hospital_system.get_patient_medical_history, patient_id, start_date, end_date)
+
+    async def patient_histories(self, patient_ids: List[str], start_date: Optional[str] = None,
+                                end_date: Optional[str] = None) -> Dict[str, PatientHistory]:
+        return await self._run(self.hospital_system.get_patient_medical_histories, patient_ids, start_date, end_date)
+
+    async def list_appointments(self, doctor_id: Optional[str] = None, patient_id: Optional[str] = None,
+                                today_only: bool = False, page_size: Optional[int] = None,
+                                resume_token: Optional[str] = None) -> Page:
+        return await self._run(
+            self.hospital_system.listings.appointments_page,
+            doctor_id=doctor_id,
+            patient_id=patient_id,
+            today_only=today_only,
+            page_size=page_size,
+            resume_token=resume_token
+        )
+
+    async def find_available_slots(self, duration: int, start_date: datetime.date, end_date: datetime.date,
+                                   **filters: Any) -> List[SlotOption]:
+        return await self._run(self.hospital_system.find_available_slots, duration, start_date, end_date, **filters)
+
+    async def search_patients(self, query: str, limit: int = 10) -> List[PatientMatch]:
+        return await self._run(self.hospital_system.search_patients, query, limit)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncHospitalService":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,211 @@
+import bisect
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from connection_pool import ConnectionPool
+
+
+class IntervalList:
+    def __init__(self):
+        self.starts: List[datetime.datetime] = []
+        self.entries: List[Tuple[datetime.datetime, datetime.datetime, str]] = []
+        self.longest = datetime.timedelta(0)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, start: datetime.datetime, end: datetime.datetime, appointment_id: str) -> None:
+        index = bisect.bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.entries.insert(index, (start, end, appointment_id))
+        self.longest = max(self.longest, end - start)
+
+    def copy(self) -> "IntervalList":
+        duplicate = IntervalList()
+        duplicate.starts = list(self.starts)
+        duplicate.entries = list(self.entries)
+        duplicate.longest = self.longest
+        return duplicate
+
+    def remove(self, appointment_id: str) -> bool:
+        for index, entry in enumerate(self.entries):
+            if entry[2] == appointment_id:
+                del self.starts[index]
+                del self.entries[index]
+                return True
+        return False
+
+    def has_conflict(self, start: datetime.datetime, end: datetime.datetime) -> bool:
+        low = bisect.bisect_right(self.starts, start - self.longest)
+        high = bisect.bisect_left(self.starts, end)
+        for index in range(low, high):
+            if self.entries[index][1] > start:
+                return True
+        return False
+
+    def busy(self, start: datetime.datetime, end: datetime.datetime) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+        low = bisect.bisect_right(self.starts, start - self.longest)
+        high = bisect.bisect_left(self.starts, end)
+        return [(entry[0], entry[1]) for entry in self.entries[low:high] if entry[1] > start]
+
+
+def _add(doctors: Dict[str, IntervalList], rooms: Dict[str, IntervalList], appointment_id: str, doctor_id: str,
+         room_number: str, start: datetime.datetime, end: datetime.datetime) -> None:
+    doctors.setdefault(doctor_id, IntervalList()).add(start, end, appointment_id)
+    rooms.setdefault(room_number, IntervalList()).add(start, end, appointment_id)
+
+
+def _remove(doctors: Dict[str, IntervalList], rooms: Dict[str, IntervalList], appointment_id: str, doctor_id: str,
+            room_number: str) -> None:
+    if doctor_id in doctors:
+        doctors[doctor_id].remove(appointment_id)
+    if room_number in rooms:
+        rooms[room_number].remove(appointment_id)
+
+
+class AvailabilityIndex:
+    def __init__(self, pool: ConnectionPool, refresh_interval: float = 60.0):
+        self.pool = pool
+        self.refresh_interval = refresh_interval
+
+        self._doctors: Dict[str, IntervalList] = {}
+        self._rooms: Dict[str, IntervalList] = {}
+        self._room_info: Dict[str, Tuple[str, str]] = {}
+        self._department_rooms: Dict[str, List[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._changes: Optional[List[Tuple[str, tuple]]] = None
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        def fetch(connection):
+            cursor = connection.cursor()
+
+            cursor.execute("SELECT roomNumber, departmentID, status FROM ROOM ORDER BY roomNumber")
+            rooms = cursor.fetchall()
+
+            cursor.execute("""
+                SELECT appointmentID, doctorID, roomNumber, dateTime, duration
+                FROM APPOINTMENT
+                WHERE status = 'Scheduled'
+            """)
+            appointments = cursor.fetchall()
+            cursor.close()
+            return rooms, appointments
+
+        # Bookings and removals made while the rows are read are logged, and replayed onto the new maps below.
+        with self._lock:
+            self._changes = []
+        try:
+            rooms, appointments = self.pool.read(fetch, primary=True)
+        except Exception:
+            with self._lock:
+                self._changes = None
+            raise
+
+        doctors: Dict[str, IntervalList] = {}
+        room_intervals: Dict[str, IntervalList] = {}
+        room_info: Dict[str, Tuple[str, str]] = {}
+        department_rooms: Dict[str, List[str]] = {}
+
+        for room_number, department_id, status in rooms:
+            room_info[room_number] = (department_id, status)
+            department_rooms.setdefault(department_id, []).append(room_number)
+
+        for appointment_id, doctor_id, room_number, start, duration in sorted(appointments, key=lambda row: row[3]):
+            _add(doctors, room_intervals, appointment_id, doctor_id, room_number, start,
+                 start + datetime.timedelta(minutes=duration))
+
+        with self._lock:
+            for change, args in self._changes:
+                if change == "add":
+                    # The read may already include the booking, so it is removed before it is added again.
+                    _remove(doctors, room_intervals, args[0], args[1], args[2])
+                    _add(doctors, room_intervals, *args)
+                else:
+                    _remove(doctors, room_intervals, *args)
+            self._changes = None
+
+            self._doctors = doctors
+            self._rooms = room_intervals
+            self._room_info = room_info
+            self._department_rooms = department_rooms
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_interval:
+            self.refresh()
+
+    def is_doctor_available(self, doctor_id: str, start: datetime.datetime, duration: int) -> bool:
+        self._ensure_loaded()
+        end = start + datetime.timedelta(minutes=duration)
+        with self._lock:
+            intervals = self._doctors.get(doctor_id)
+            return intervals is None or not intervals.has_conflict(start, end)
+
+    def is_room_available(self, room_number: str, start: datetime.datetime, duration: int) -> bool:
+        self._ensure_loaded()
+        end = start + datetime.timedelta(minutes=duration)
+        with self._lock:
+            intervals = self._rooms.get(room_number)
+            return intervals is None or not intervals.has_conflict(start, end)
+
+    def doctor_busy(self, doctor_id: str, start: datetime.datetime, end: datetime.datetime) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+        self._ensure_loaded()
+        with self._lock:
+            intervals = self._doctors.get(doctor_id)
+            return intervals.busy(start, end) if intervals else []
+
+    def room_busy(self, room_number: str, start: datetime.datetime, end: datetime.datetime) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+        self._ensure_loaded()
+        with self._lock:
+            intervals = self._rooms.get(room_number)
+            return intervals.busy(start, end) if intervals else []
+
+    def available_rooms(self, department_id: str) -> List[str]:
+        self._ensure_loaded()
+        with self._lock:
+            return [room for room in self._department_rooms.get(department_id, []) if self._room_info[room][1] == 'Available']
+
+    def candidate_rooms(self, department_id: str, preferred_room: str, start: datetime.datetime, duration: int) -> List[str]:
+        self._ensure_loaded()
+        end = start + datetime.timedelta(minutes=duration)
+        available = []
+
+        with self._lock:
+            candidates = self._department_rooms.get(department_id, [])
+            if preferred_room and preferred_room in candidates:
+                candidates = [preferred_room] + [room for room in candidates if room != preferred_room]
+
+            for room_number in candidates:
+                if self._room_info[room_number][1] != 'Available':
+                    continue
+                intervals = self._rooms.get(room_number)
+                if intervals is None or not intervals.has_conflict(start, end):
+                    available.append(room_number)
+
+        return available
+
+    def find_room(self, department_id: str, preferred_room: str, start: datetime.datetime, duration: int) -> Optional[str]:
+        rooms = self.candidate_rooms(department_id, preferred_room, start, duration)
+        return rooms[0] if rooms else None
+
+    def add(self, appointment_id: str, doctor_id: str, room_number: str, start: datetime.datetime, duration: int) -> None:
+        end = start + datetime.timedelta(minutes=duration)
+        with self._lock:
+            _add(self._doctors, self._rooms, appointment_id, doctor_id, room_number, start, end)
+            if self._changes is not None:
+                self._changes.append(("add", (appointment_id, doctor_id, room_number, start, end)))
+
+    def remove(self, appointment_id: str, doctor_id: str, room_number: str) -> None:
+        with self._lock:
+            _remove(self._doctors, self._rooms, appointment_id, doctor_id, room_number)
+            if self._changes is not None:
+                self._changes.append(("remove", (appointment_id, doctor_id, room_number)))
+
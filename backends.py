@@ -0,0 +1,310 @@
+import datetime
+import os
+import sqlite3
+import time
+from typing import Any, List, Optional, Sequence
+
+import mysql.connector
+from mysql.connector import errors
+
+from migrate import apply_migrations, split_statements
+
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database")
+SCHEMA_PATH = os.path.join(DATABASE_DIR, "schema.sql")
+SAMPLE_DATA_PATH = os.path.join(DATABASE_DIR, "sample_data.sql")
+
+
+class Backend:
+    name = "Database"
+
+    def connect(self) -> Any:
+        raise NotImplementedError
+
+    def now(self) -> str:
+        raise NotImplementedError
+
+    def today(self) -> str:
+        raise NotImplementedError
+
+    def add_minutes(self, expression: str, minutes: str) -> str:
+        raise NotImplementedError
+
+    def add_days(self, expression: str, days: str) -> str:
+        raise NotImplementedError
+
+    def concat(self, *parts: str) -> str:
+        raise NotImplementedError
+
+    def cast_integer(self, expression: str) -> str:
+        raise NotImplementedError
+
+    def replica_lag(self, connection: Any) -> Optional[float]:
+        raise NotImplementedError
+
+
+class MySQLBackend(Backend):
+    name = "MySQL"
+
+    def __init__(self, host: str, user: str, password: str, database: str, **options: Any):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.options = options
+
+    def connect(self) -> Any:
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            **self.options
+        )
+
+    def now(self) -> str:
+        return "NOW()"
+
+    def today(self) -> str:
+        return "CURDATE()"
+
+    def add_minutes(self, expression: str, minutes: str) -> str:
+        return f"DATE_ADD({expression}, INTERVAL {minutes} MINUTE)"
+
+    def add_days(self, expression: str, days: str) -> str:
+        return f"DATE_ADD({expression}, INTERVAL {days} DAY)"
+
+    def concat(self, *parts: str) -> str:
+        return f"CONCAT({', '.join(parts)})"
+
+    def cast_integer(self, expression: str) -> str:
+        return f"CAST({expression} AS UNSIGNED)"
+
+    def replica_lag(self, connection: Any) -> Optional[float]:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except errors.ProgrammingError:
+                cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+        finally:
+            cursor.close()
+
+        if status is None:
+            return None
+        lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+        # NULL means the replication threads are stopped, so the replica cannot be trusted at all.
+        return float("inf") if lag is None else float(lag)
+
+
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_converter("DATETIME", lambda value: datetime.datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATE", lambda value: datetime.date.fromisoformat(value.decode()))
+
+
+def _translate_error(error: sqlite3.Error) -> errors.Error:
+    if isinstance(error, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=str(error))
+    if isinstance(error, sqlite3.OperationalError):
+        return errors.OperationalError(msg=str(error))
+    if isinstance(error, sqlite3.ProgrammingError):
+        return errors.ProgrammingError(msg=str(error))
+    return errors.DatabaseError(msg=str(error))
+
+
+class SQLiteCursor:
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False, timeout: float = 30.0):
+        self._cursor = cursor
+        self._dictionary = dictionary
+        self._timeout = timeout
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column[0] for column in self._cursor.description or []]
+
+    def _row(self, row: Optional[tuple]) -> Any:
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def _run(self, method, operation: str, params: Any) -> None:
+        # Shared-cache connections report table locks immediately instead of waiting out the busy timeout.
+        deadline = time.monotonic() + self._timeout
+        delay = 0.001
+        while True:
+            try:
+                method(operation.replace("%s", "?"), params)
+                return
+            except sqlite3.OperationalError as e:
+                if "table is locked" not in str(e) or time.monotonic() >= deadline:
+                    raise _translate_error(e) from e
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+            except sqlite3.Error as e:
+                raise _translate_error(e) from e
+
+    def execute(self, operation: str, params: Sequence[Any] = ()) -> None:
+        self._run(self._cursor.execute, operation, tuple(params or ()))
+
+    def executemany(self, operation: str, seq_params: Sequence[Sequence[Any]]) -> None:
+        self._run(self._cursor.executemany, operation, [tuple(params) for params in seq_params])
+
+    def fetchone(self) -> Any:
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self) -> List[Any]:
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._row(row)
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, connection: sqlite3.Connection, timeout: float = 30.0):
+        self._connection = connection
+        self._timeout = timeout
+        self._closed = False
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._connection.in_transaction
+
+    def cursor(self, dictionary: bool = False, buffered: Optional[bool] = None, prepared: Optional[bool] = None) -> SQLiteCursor:
+        return SQLiteCursor(self._connection.cursor(), dictionary=dictionary, timeout=self._timeout)
+
+    def commit(self) -> None:
+        try:
+            self._connection.commit()
+        except sqlite3.Error as e:
+            raise _translate_error(e) from e
+
+    def rollback(self) -> None:
+        try:
+            self._connection.rollback()
+        except sqlite3.Error as e:
+            raise _translate_error(e) from e
+
+    def is_connected(self) -> bool:
+        return not self._closed
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0) -> None:
+        if self._closed:
+            raise errors.InterfaceError(msg="SQLite connection is closed")
+
+    def close(self) -> None:
+        self._closed = True
+        self._connection.close()
+
+
+class SQLiteBackend(Backend):
+    name = "SQLite"
+
+    def __init__(self, path: str = ":memory:", load_sample_data: bool = False, timeout: float = 30.0):
+        self.timeout = timeout
+
+        if path == ":memory:":
+            self._target = f"file:hospital_management_{id(self)}?mode=memory&cache=shared"
+        else:
+            self._target = f"file:{os.path.abspath(path)}"
+
+        self._keeper = self.connect()
+        if not self._has_schema():
+            self._load_schema(load_sample_data)
+
+    def connect(self) -> SQLiteConnection:
+        connection = sqlite3.connect(
+            self._target,
+            uri=True,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False
+        )
+        connection.execute("PRAGMA foreign_keys = ON")
+        if "mode=memory" not in self._target:
+            connection.execute("PRAGMA journal_mode = WAL")
+        return SQLiteConnection(connection, self.timeout)
+
+    def _has_schema(self) -> bool:
+        cursor = self._keeper.cursor()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'PATIENT'")
+        result = cursor.fetchone()
+        cursor.close()
+        return result[0] > 0
+
+    def execute_script(self, path: str) -> None:
+        with open(path) as script_file:
+            statements = split_statements(script_file.read())
+
+        cursor = self._keeper.cursor()
+        for statement in statements:
+            # SQLite cannot add constraints to an existing table, so DEPARTMENT.headDoctor stays unchecked.
+            if statement.upper().startswith("ALTER TABLE"):
+                continue
+            cursor.execute(statement)
+        self._keeper.commit()
+        cursor.close()
+
+    def _load_schema(self, load_sample_data: bool) -> None:
+        self.execute_script(SCHEMA_PATH)
+        apply_migrations(self._keeper, dialect="sqlite")
+        if load_sample_data:
+            self.execute_script(SAMPLE_DATA_PATH)
+
+    def now(self) -> str:
+        return "datetime('now', 'localtime')"
+
+    def today(self) -> str:
+        return "date('now', 'localtime')"
+
+    def add_minutes(self, expression: str, minutes: str) -> str:
+        return f"datetime({expression}, '+' || ({minutes}) || ' minutes')"
+
+    def add_days(self, expression: str, days: str) -> str:
+        return f"date({expression}, '+' || ({days}) || ' days')"
+
+    def concat(self, *parts: str) -> str:
+        return " || ".join(parts)
+
+    def cast_integer(self, expression: str) -> str:
+        return f"CAST({expression} AS INTEGER)"
+
+    def replica_lag(self, connection: Any) -> Optional[float]:
+        return 0.0
+
+    def replica(self) -> "SQLiteReplicaBackend":
+        return SQLiteReplicaBackend(self)
+
+
+class SQLiteReplicaBackend(SQLiteBackend):
+    name = "SQLite replica"
+
+    def __init__(self, primary: SQLiteBackend):
+        # Reads the primary's database through query_only connections, standing in for a real replica.
+        self.timeout = primary.timeout
+        self._target = primary._target
+        self._primary = primary
+
+    def connect(self) -> SQLiteConnection:
+        connection = super().connect()
+        connection._connection.execute("PRAGMA query_only = ON")
+        return connection
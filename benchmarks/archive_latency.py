@@ -0,0 +1,112 @@
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from backends import SQLiteBackend
+from benchmarks.common import add_connection_arguments, create_backend
+from benchmarks.scaling_suite import percentile
+from hospital_management import HospitalManagementSystem
+from synthetic_data import DatasetSize, SyntheticDataGenerator, doctor_id, load, patient_id
+
+
+def operations(hospital_system: HospitalManagementSystem, size: DatasetSize,
+               rng: random.Random) -> List[Tuple[str, Callable[[], Any]]]:
+    booker = hospital_system.booker
+    listings = hospital_system.listings
+
+    def random_doctor() -> str:
+        return doctor_id(rng.randrange(size.doctors))
+
+    def conflict_check():
+        start = datetime.datetime.combine(datetime.date.today() + datetime.timedelta(days=rng.randint(1, 60)), datetime.time(rng.randint(8, 16)))
+        with hospital_system.pool.connection() as connection:
+            booker.has_conflict(connection, "doctorID", random_doctor(), start, start + datetime.timedelta(minutes=30))
+
+    return [
+        ("booking_conflict_check", conflict_check),
+        ("upcoming_appointment_count", lambda: hospital_system.upcoming_appointment_count(random_doctor())),
+        ("appointments_page", lambda: listings.appointments_page(page_size=100)),
+        ("appointments_page_doctor", lambda: listings.appointments_page(doctor_id=random_doctor(), page_size=100)),
+        ("availability_refresh", hospital_system.availability.refresh),
+        ("utilization_refresh", hospital_system.utilization.refresh),
+        ("get_patient_medical_history", lambda: hospital_system.get_patient_medical_history(patient_id(rng.randrange(size.patients)))),
+    ]
+
+
+def measure(hospital_system: HospitalManagementSystem, size: DatasetSize, iterations: int,
+            seed: int) -> Dict[str, Tuple[float, float]]:
+    results = {}
+    for name, operation in operations(hospital_system, size, random.Random(seed)):
+        samples = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            operation()
+            count = iterations if not name.endswith("refresh") else max(2, iterations // 20)
+            for _ in range(count):
+                start = time.perf_counter()
+                operation()
+                samples.append((time.perf_counter() - start) * 1000)
+        results[name] = (statistics.median(samples), percentile(samples, 0.99))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time hot-path appointment queries before and after archiving closed appointments.")
+    add_connection_arguments(parser)
+    parser.add_argument("--patients", type=int, default=20000)
+    parser.add_argument("--appointments-per-patient", type=float, default=10.0)
+    parser.add_argument("--history-days", type=int, default=5 * 365, help="How far back the generated appointments go")
+    parser.add_argument("--older-than-days", type=int, default=0, help="Archive closed appointments older than this")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--load", action="store_true", help="Load synthetic data into the (empty) MySQL database first")
+    args = parser.parse_args()
+
+    size = DatasetSize.for_patients(args.patients, appointments_per_patient=args.appointments_per_patient)
+    generator = SyntheticDataGenerator(size, seed=args.seed, history_days=args.history_days)
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.backend == "sqlite":
+            backend = SQLiteBackend(os.path.join(directory, "archive.db"))
+            load(backend, generator, verbose=False)
+        else:
+            backend = create_backend(args)
+            if args.load:
+                load(backend, generator, verbose=False)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            hospital_system = HospitalManagementSystem(backend=backend)
+
+        before = measure(hospital_system, size, args.iterations, args.seed)
+        live_before, _ = hospital_system.archiver.counts()
+        result = hospital_system.archiver.archive(args.older_than_days)
+        live_after, archived = hospital_system.archiver.counts()
+        if isinstance(backend, SQLiteBackend):
+            # Fold the moved rows back into the database file so reads do not pay for a long write-ahead log.
+            connection = backend.connect()
+            cursor = connection.cursor()
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            cursor.close()
+            connection.close()
+        after = measure(hospital_system, size, args.iterations, args.seed)
+
+        print(f"\nArchived {result.moved} of {live_before} appointments in {result.batches} batches ({result.seconds:.1f}s); "
+              f"{live_after} live, {archived} archived")
+        print(f"\n{'Operation':<30} {'p50 before':>11} {'p50 after':>11} {'p99 before':>11} {'p99 after':>11}")
+        print("-" * 78)
+        for name in before:
+            print(f"{name:<30} {before[name][0]:>11.3f} {after[name][0]:>11.3f} {before[name][1]:>11.3f} {after[name][1]:>11.3f}")
+        print("\nTimes in milliseconds")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            hospital_system.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from async_service import AsyncHospitalService
+from benchmarks.common import add_connection_arguments, create_system
+from benchmarks.scaling_suite import percentile
+from models import HospitalError
+
+
+def request_mix(service: AsyncHospitalService, patient_ids: List[str], doctor_ids: List[str],
+                rng: random.Random) -> List[Tuple[str, int, Callable[[], Awaitable[Any]]]]:
+    def booking():
+        day = datetime.date.today() + datetime.timedelta(days=rng.randint(365, 3650))
+        start = datetime.datetime.combine(day, datetime.time(rng.randint(8, 16), rng.choice([0, 30])))
+        return service.schedule_appointment(rng.choice(patient_ids), rng.choice(doctor_ids), start, 30, "Load Test")
+
+    return [
+        ("is_valid_patient", 4, lambda: service.is_valid_patient(rng.choice(patient_ids))),
+        ("is_valid_doctor", 4, lambda: service.is_valid_doctor(rng.choice(doctor_ids))),
+        ("patient_history", 3, lambda: service.patient_history(rng.choice(patient_ids))),
+        ("list_appointments", 2, lambda: service.list_appointments(doctor_id=rng.choice(doctor_ids), page_size=50)),
+        ("schedule_appointment", 1, booking),
+    ]
+
+
+async def timed(name: str, request: Callable[[], Awaitable[Any]], latencies: Dict[str, List[float]],
+                failures: Dict[str, int]) -> None:
+    start = time.perf_counter()
+    try:
+        await request()
+    except HospitalError:
+        failures[name] = failures.get(name, 0) + 1
+    latencies.setdefault(name, []).append(time.perf_counter() - start)
+
+
+async def run_load(service: AsyncHospitalService, mix: List[Tuple[str, int, Callable[[], Awaitable[Any]]]],
+                   requests: int, rng: random.Random) -> Tuple[float, Dict[str, List[float]], Dict[str, int]]:
+    names = [name for name, _, _ in mix]
+    weights = [weight for _, weight, _ in mix]
+    calls = {name: call for name, _, call in mix}
+
+    latencies: Dict[str, List[float]] = {}
+    failures: Dict[str, int] = {}
+
+    chosen = rng.choices(names, weights=weights, k=requests)
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(name, calls[name], latencies, failures) for name in chosen))
+    return time.perf_counter() - start, latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fire concurrent requests at the asyncio service and report throughput.")
+    add_connection_arguments(parser)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None, help="Executor threads (default: pool size)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        hospital_system = create_system(args, pool_size=args.pool_size)
+
+    patient_ids = [row['patientID'] for row in hospital_system.listings.patients_page(page_size=1000).rows]
+    doctor_ids = list(hospital_system.reference.all("doctors"))
+
+    async def run():
+        async with AsyncHospitalService(hospital_system, max_workers=args.workers) as service:
+            return await run_load(service, request_mix(service, patient_ids, doctor_ids, rng), args.requests, rng)
+
+    elapsed, latencies, failures = asyncio.run(run())
+
+    print(f"\n{args.requests} concurrent requests in {elapsed:.3f}s ({args.requests / elapsed:.1f} req/s)")
+    print(f"\n{'Operation':<22} {'Count':<8} {'Rejected':<10} {'p50 (ms)':<10} {'p99 (ms)':<10}")
+    print("-" * 62)
+    for name, samples in sorted(latencies.items()):
+        print(f"{name:<22} {len(samples):<8} {failures.get(name, 0):<10} "
+              f"{percentile(samples, 0.5) * 1000:<10.2f} {percentile(samples, 0.99) * 1000:<10.2f}")
+
+    hospital_system.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.common import add_connection_arguments, create_system
+
+
+def operations(hospital_system, patient_id: str, doctor_id: str) -> Dict[str, Callable[[], object]]:
+    return {
+        "is_valid_patient": lambda: hospital_system.is_valid_patient(patient_id),
+        "is_valid_doctor": lambda: hospital_system.is_valid_doctor(doctor_id),
+        "is_doctor_available": lambda: hospital_system.is_doctor_available(doctor_id, "2030-01-01 09:00:00", 30),
+        "find_available_room": lambda: hospital_system.find_available_room("", "2030-01-01 09:00:00", 30, doctor_id),
+        "get_patient_medical_history": lambda: hospital_system.get_patient_medical_history(patient_id),
+        "patients_page": lambda: hospital_system.listings.patients_page(page_size=50),
+        "appointments_page": lambda: hospital_system.listings.appointments_page(page_size=50),
+    }
+
+
+def measure(operation: Callable[[], object], iterations: int) -> List[float]:
+    operation()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call latency of the same operations between storage backends.")
+    add_connection_arguments(parser)
+    parser.add_argument("--backends", default="sqlite", help="Comma-separated backends to compare, e.g. mysql,sqlite")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--patient-id", default="PAT001")
+    parser.add_argument("--doctor-id", default="DOC001")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    backends = args.backends.split(",")
+
+    for backend in backends:
+        args.backend = backend
+        hospital_system = create_system(args)
+        results[backend] = {
+            name: statistics.median(measure(operation, args.iterations))
+            for name, operation in operations(hospital_system, args.patient_id, args.doctor_id).items()
+        }
+
+    print(f"\n{'Operation (median us)':<30} " + " ".join(f"{backend:>12}" for backend in backends))
+    print("-" * (31 + 13 * len(backends)))
+    for name in results[backends[0]]:
+        print(f"{name:<30} " + " ".join(f"{results[backend][name]:>12.1f}" for backend in backends))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import contextlib
+import datetime
+import io
+import random
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from mysql.connector import Error
+
+from backends import Backend
+from benchmarks.common import add_connection_arguments, create_backend
+from hospital_management import HospitalManagementSystem
+from models import HospitalError
+
+
+def booking_requests(patient_ids: List[str], doctor_ids: List[str], base: datetime.datetime, days: int,
+                     count: int, rng: random.Random) -> List[Tuple[str, str, datetime.datetime, int]]:
+    slots = [base + datetime.timedelta(days=day, minutes=15 * quarter) for day in range(days) for quarter in range(32)]
+    return [
+        (rng.choice(patient_ids), rng.choice(doctor_ids), rng.choice(slots), rng.choice([30, 45, 60]))
+        for _ in range(count)
+    ]
+
+
+def double_bookings(backend: Backend, connection, column: str, start: datetime.datetime,
+                    end: datetime.datetime) -> int:
+    cursor = connection.cursor()
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM APPOINTMENT a
+        JOIN APPOINTMENT b ON a.{column} = b.{column} AND a.appointmentID < b.appointmentID
+        WHERE a.status = 'Scheduled' AND b.status = 'Scheduled'
+          AND a.dateTime >= %s AND a.dateTime < %s
+          AND a.dateTime < {backend.add_minutes('b.dateTime', 'b.duration')}
+          AND b.dateTime < {backend.add_minutes('a.dateTime', 'a.duration')}
+    """, (start, end))
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Book appointments from many threads and application instances at once and check for double bookings.")
+    add_connection_arguments(parser)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--instances", type=int, default=4, help="Independent application instances sharing the database")
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=2, help="Number of days the bookings compete for")
+    parser.add_argument("--unlocked", action="store_true", help="Book without the locking transaction, for comparison")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    backend = create_backend(args)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        systems = [
+            HospitalManagementSystem(backend=backend, pool_size=max(1, args.threads // args.instances) + 1,
+                                     concurrent_booking=not args.unlocked)
+            for _ in range(args.instances)
+        ]
+
+    patient_ids = [row['patientID'] for row in systems[0].listings.patients_page(page_size=1000).rows]
+    doctor_ids = list(systems[0].reference.all("doctors"))
+
+    base = datetime.datetime.combine(datetime.date.today() + datetime.timedelta(days=rng.randint(3650, 7300)), datetime.time(8))
+    requests = booking_requests(patient_ids, doctor_ids, base, args.days, args.bookings, rng)
+
+    outcomes: Dict[str, int] = {"committed": 0, "conflict": 0, "error": 0}
+    outcomes_lock = threading.Lock()
+    next_request = iter(requests)
+    next_request_lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        hospital_system = systems[index % len(systems)]
+        while True:
+            with next_request_lock:
+                request = next(next_request, None)
+            if request is None:
+                return
+
+            patient_id, doctor_id, start, duration = request
+            try:
+                hospital_system.book_appointment(patient_id, doctor_id, start, duration, "Stress Test")
+                outcome = "committed"
+            except HospitalError:
+                outcome = "conflict"
+            except Error:
+                outcome = "error"
+
+            with outcomes_lock:
+                outcomes[outcome] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    end = base + datetime.timedelta(days=args.days)
+    with systems[0].pool.connection() as connection:
+        doctor_overlaps = double_bookings(backend, connection, "doctorID", base, end)
+        room_overlaps = double_bookings(backend, connection, "roomNumber", base, end)
+
+    mode = "unlocked" if args.unlocked else "locked"
+    print(f"\nMode: {mode}, {args.threads} threads across {args.instances} instances, {args.bookings} requests in {elapsed:.2f}s")
+    print(f"Committed: {outcomes['committed']} ({outcomes['committed'] / elapsed:.1f} bookings/s)")
+    print(f"Rejected as conflicting: {outcomes['conflict']}")
+    print(f"Database errors: {outcomes['error']}")
+    print(f"Double-booked doctor pairs: {doctor_overlaps}")
+    print(f"Double-booked room pairs: {room_overlaps}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for hospital_system in systems:
+            hospital_system.pool.close()
+
+    if doctor_overlaps or room_overlaps:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+from typing import List
+
+from backends import Backend, MySQLBackend, SQLiteBackend
+from hospital_management import HospitalManagementSystem
+from replication import READ_STRATEGIES
+
+
+def add_connection_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default="mysql")
+    parser.add_argument("--sqlite-path", default=":memory:", help="SQLite database file (default: in-memory sample database)")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    parser.add_argument("--replica-hosts", default="", help="Comma-separated MySQL replica hosts to route reads to")
+    parser.add_argument("--sqlite-replicas", type=int, default=0, help="Number of read-only SQLite connections standing in for replicas")
+    parser.add_argument("--read-strategy", choices=READ_STRATEGIES, default="round_robin")
+
+
+def create_backend(args: argparse.Namespace) -> Backend:
+    if args.backend == "sqlite":
+        return SQLiteBackend(args.sqlite_path, load_sample_data=args.sqlite_path == ":memory:")
+    return MySQLBackend(args.host, args.user, args.password, args.database)
+
+
+def create_replicas(args: argparse.Namespace, backend: Backend) -> List[Backend]:
+    if isinstance(backend, SQLiteBackend):
+        return [backend.replica() for _ in range(args.sqlite_replicas)]
+    return [MySQLBackend(host, args.user, args.password, args.database)
+            for host in args.replica_hosts.split(",") if host]
+
+
+def create_system(args: argparse.Namespace, pool_size: int = 5) -> HospitalManagementSystem:
+    backend = create_backend(args)
+    return HospitalManagementSystem(pool_size=pool_size, backend=backend, replicas=create_replicas(args, backend),
+                                    read_strategy=args.read_strategy)
@@ -0,0 +1,89 @@
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, List, Tuple
+
+from backends import SQLiteBackend
+from benchmarks.common import add_connection_arguments, create_backend
+from benchmarks.scaling_suite import percentile
+from history_cache import HistoryCache
+from hospital_management import HospitalManagementSystem
+from synthetic_data import DatasetSize, SyntheticDataGenerator, load, patient_id
+
+
+def measure(operation: Callable[[str], Any], patient_ids: List[str], iterations: int, seed: int) -> Tuple[float, float]:
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(iterations):
+        chosen = rng.choice(patient_ids)
+        start = time.perf_counter()
+        operation(chosen)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), percentile(samples, 0.99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare patient history latency rebuilt from the database and served from cached snapshots.")
+    add_connection_arguments(parser)
+    parser.add_argument("--patients", type=int, default=20000)
+    parser.add_argument("--records-per-patient", type=float, default=5.0)
+    parser.add_argument("--appointments-per-patient", type=float, default=5.0)
+    parser.add_argument("--working-set", type=int, default=2000, help="Number of distinct patients whose charts are opened")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--load", action="store_true", help="Load synthetic data into the (empty) MySQL database first")
+    args = parser.parse_args()
+
+    size = DatasetSize.for_patients(args.patients, records_per_patient=args.records_per_patient,
+                                    appointments_per_patient=args.appointments_per_patient)
+    generator = SyntheticDataGenerator(size, seed=args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.backend == "sqlite":
+            backend = SQLiteBackend(os.path.join(directory, "history.db"))
+            load(backend, generator, verbose=False)
+        else:
+            backend = create_backend(args)
+            if args.load:
+                load(backend, generator, verbose=False)
+
+        store_path = os.path.join(directory, "snapshots.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            hospital_system = HospitalManagementSystem(backend=backend, history_store=store_path)
+
+        patient_ids = [patient_id(index) for index in random.Random(args.seed).sample(range(size.patients), min(args.working_set, size.patients))]
+        year_ago = (datetime.date.today() - datetime.timedelta(days=365)).isoformat()
+        cache = hospital_system.history_cache
+        builder = hospital_system.history_builder
+
+        results = [("rebuilt", measure(builder.build_one, patient_ids, args.iterations, args.seed))]
+        cache.get_many(patient_ids)
+        results.append(("cached", measure(cache.get, patient_ids, args.iterations, args.seed)))
+        results.append(("cached, last year", measure(lambda chosen: cache.get(chosen, year_ago), patient_ids, args.iterations, args.seed)))
+        results.append(("rebuilt, last year", measure(lambda chosen: builder.build_one(chosen, year_ago), patient_ids, args.iterations, args.seed)))
+        memory_bytes = cache.stats()["bytes"]
+        cache.close()
+
+        restarted = HistoryCache(hospital_system.pool, builder, store_path=store_path)
+        results.append(("warm restart", measure(restarted.get, patient_ids, args.iterations, args.seed)))
+        restarted.close()
+
+        print(f"\n{'History':<22} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+        print("-" * 44)
+        for name, (p50, p99) in results:
+            print(f"{name:<22} {p50:>10.3f} {p99:>10.3f}")
+        print(f"\n{len(patient_ids)} snapshots use {memory_bytes / 1024:.0f} KiB in memory; warm restart served "
+              f"{restarted.stats()['store_hits']} from the snapshot store")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            hospital_system.pool.close()
+
+
+if __name__ == "__main__":
+    main()
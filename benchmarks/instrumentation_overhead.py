@@ -0,0 +1,41 @@
+import argparse
+import statistics
+from typing import Dict, Optional
+
+from benchmarks.backend_latency import measure, operations
+from benchmarks.common import add_connection_arguments, create_backend
+from hospital_management import HospitalManagementSystem
+from instrumentation import QueryMetrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call latency with query instrumentation off, on and sampled.")
+    add_connection_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--patient-id", default="PAT001")
+    parser.add_argument("--doctor-id", default="DOC001")
+    args = parser.parse_args()
+
+    modes: Dict[str, Optional[QueryMetrics]] = {
+        "off": None,
+        "on": QueryMetrics(),
+        f"sampled {args.sample_rate:g}": QueryMetrics(sample_rate=args.sample_rate),
+    }
+
+    results: Dict[str, Dict[str, float]] = {}
+    for mode, metrics in modes.items():
+        hospital_system = HospitalManagementSystem(backend=create_backend(args), metrics=metrics)
+        results[mode] = {
+            name: statistics.median(measure(operation, args.iterations))
+            for name, operation in operations(hospital_system, args.patient_id, args.doctor_id).items()
+        }
+
+    print(f"\n{'Operation (median us)':<30} " + " ".join(f"{mode:>14}" for mode in modes))
+    print("-" * (31 + 15 * len(modes)))
+    for name in results["off"]:
+        print(f"{name:<30} " + " ".join(f"{results[mode][name]:>14.1f}" for mode in modes))
+
+
+if __name__ == "__main__":
+    main()
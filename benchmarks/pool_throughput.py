@@ -0,0 +1,62 @@
+import argparse
+import threading
+import time
+from typing import List
+
+from benchmarks.common import add_connection_arguments, create_system
+
+
+# Doctor and department checks are answered from in-memory caches and PATIENT_EXISTS from a prepared statement,
+# so each request runs this plain query instead to measure a connection checkout and a real round trip.
+REQUEST_QUERY = "SELECT COUNT(*) FROM APPOINTMENT WHERE patientID = %s AND doctorID = %s"
+
+
+def run_workers(hospital_system, threads: int, duration: float, patient_id: str, doctor_id: str) -> int:
+    completed: List[int] = [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def request(connection) -> int:
+        cursor = connection.cursor()
+        cursor.execute(REQUEST_QUERY, (patient_id, doctor_id))
+        count = cursor.fetchone()[0]
+        cursor.close()
+        return count
+
+    def worker(index: int) -> None:
+        count = 0
+        while time.perf_counter() < deadline:
+            hospital_system.pool.read(request)
+            count += 1
+        completed[index] = count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    return sum(completed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure request throughput as the number of worker threads grows.")
+    add_connection_arguments(parser)
+    parser.add_argument("--threads", default="1,2,4,8,16,32", help="Comma-separated thread counts")
+    parser.add_argument("--pool-size", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per thread count")
+    parser.add_argument("--patient-id", default="PAT001")
+    parser.add_argument("--doctor-id", default="DOC001")
+    args = parser.parse_args()
+
+    hospital_system = create_system(args, pool_size=args.pool_size)
+
+    print(f"\n{'Threads':<10} {'Requests':<12} {'Req/s':<12}")
+    print("-" * 34)
+
+    for threads in [int(t) for t in args.threads.split(",")]:
+        requests = run_workers(hospital_system, threads, args.duration, args.patient_id, args.doctor_id)
+        print(f"{threads:<10} {requests:<12} {requests / args.duration:<12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import datetime
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from benchmarks.common import add_connection_arguments, create_system
+from statement_cache import PATIENT_EXISTS, ROOM_STATUS, StatementCache
+
+
+def lookups(hospital_system, patient_id: str, doctor_id: str, room_number: str) -> Dict[str, Tuple[str, Sequence[Any]]]:
+    start = datetime.datetime(2030, 1, 1, 9)
+    end = start + datetime.timedelta(minutes=30)
+    return {
+        "patient_exists": (PATIENT_EXISTS, (patient_id,)),
+        "room_status": (ROOM_STATUS, (room_number,)),
+        "doctor_conflict": (hospital_system.booker._conflict_queries["doctorID"], (doctor_id, start, start, end, start)),
+        "prescriptions": ("""
+            SELECT p.recordID, p.prescriptionNumber, p.dosage, p.frequency, p.startDate, p.endDate, m.name
+            FROM PRESCRIPTION p
+            JOIN MEDICAL_RECORD r ON p.recordID = r.recordID
+            JOIN MEDICATION m ON p.medicationID = m.medicationID
+            WHERE r.patientID = %s
+        """, (patient_id,)),
+    }
+
+
+def text_protocol(connection, statement: str, params: Sequence[Any]) -> List[Any]:
+    cursor = connection.cursor()
+    cursor.execute(statement, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def measure(operation: Callable[[], object], iterations: int) -> Tuple[float, float]:
+    operation()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(100):
+        operation()
+    allocated = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename") if stat.size_diff > 0)
+    tracemalloc.stop()
+    return statistics.median(samples), allocated / 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call latency of hot lookups with and without the prepared statement cache.")
+    add_connection_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--patient-id", default="PAT001")
+    parser.add_argument("--doctor-id", default="DOC001")
+    parser.add_argument("--room-number", default="101")
+    args = parser.parse_args()
+
+    hospital_system = create_system(args, pool_size=1)
+    cache = StatementCache()
+
+    print(f"\n{'Lookup':<20} {'plain (us)':>12} {'cached (us)':>12} {'plain (B)':>12} {'cached (B)':>12}")
+    print("-" * 72)
+
+    with hospital_system.pool.connection() as connection:
+        for name, (statement, params) in lookups(hospital_system, args.patient_id, args.doctor_id, args.room_number).items():
+            plain = measure(lambda: text_protocol(connection, statement, params), args.iterations)
+            cached = measure(lambda: cache.fetchall(connection, statement, params), args.iterations)
+            print(f"{name:<20} {plain[0]:>12.1f} {cached[0]:>12.1f} {plain[1]:>12.0f} {cached[1]:>12.0f}")
+
+    print(f"\nStatements prepared: {cache.prepares}, executions reusing a prepared cursor: {cache.reuses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import contextlib
+import datetime
+import io
+import time
+
+from benchmarks.common import add_connection_arguments, create_system
+from models import HospitalError
+from recurring import RecurrenceRule, parse_weekdays
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare booking a recurring series one appointment at a time and in one pass.")
+    add_connection_arguments(parser)
+    parser.add_argument("--patient-id", default="PAT001")
+    parser.add_argument("--doctor-id", default="DOC001")
+    parser.add_argument("--weekdays", default="mon,wed,fri")
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--duration", type=int, default=45)
+    parser.add_argument("--start-date", help="First date, YYYY-MM-DD (default: a year from today)")
+    args = parser.parse_args()
+
+    start_date = (datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date
+                  else datetime.date.today() + datetime.timedelta(days=365))
+    weekdays = parse_weekdays(args.weekdays)
+    one_by_one = RecurrenceRule(start_date, datetime.time(9), args.duration, args.weeks, weekdays)
+    series = RecurrenceRule(start_date, datetime.time(13), args.duration, args.weeks, weekdays)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        hospital_system = create_system(args)
+
+    booked = 0
+    start = time.perf_counter()
+    for occurrence in one_by_one.occurrences():
+        try:
+            hospital_system.schedule_appointment(args.patient_id, args.doctor_id, occurrence, args.duration, "Follow-up")
+            booked += 1
+        except HospitalError:
+            pass
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = hospital_system.schedule_appointment_series(args.patient_id, args.doctor_id, series, "Follow-up")
+    series_seconds = time.perf_counter() - start
+
+    print(f"\n{'Method':<28} {'Booked':>8} {'Total (ms)':>12} {'Per date (ms)':>14}")
+    print("-" * 66)
+    for name, count, seconds, total in [("one appointment at a time", booked, single_seconds, len(one_by_one.occurrences())),
+                                        ("series in one pass", len(report.booked), series_seconds, len(report.occurrences))]:
+        print(f"{name:<28} {count:>8} {seconds * 1000:>12.1f} {seconds * 1000 / max(total, 1):>14.2f}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        hospital_system.pool.close()
+
+
+if __name__ == "__main__":
+    main()
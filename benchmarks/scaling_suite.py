@@ -0,0 +1,157 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from backends import SQLiteBackend
+from benchmarks.common import add_connection_arguments, create_backend
+from bulk_import import parse_booking
+from hospital_management import HospitalManagementSystem
+from synthetic_data import (FIRST_NAMES, LAST_NAMES, SCALES, DatasetSize, SyntheticDataGenerator, department_id,
+                            doctor_id, load, patient_id)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def operations(hospital_system: HospitalManagementSystem, size: DatasetSize,
+               rng: random.Random) -> List[Tuple[str, int, Callable[[], Any]]]:
+    def random_patient() -> str:
+        return patient_id(rng.randrange(size.patients))
+
+    def random_doctor() -> str:
+        return doctor_id(rng.randrange(size.doctors))
+
+    def random_slot() -> str:
+        day = datetime.date.today() + datetime.timedelta(days=rng.randint(1, 60))
+        return f"{day} {rng.randint(8, 16):02d}:{rng.choice(['00', '30'])}:00"
+
+    def bulk_schedule():
+        day = datetime.date.today() + datetime.timedelta(days=rng.randint(100, 3000))
+        bookings = [
+            parse_booking(row, {
+                "patientID": random_patient(), "doctorID": random_doctor(), "date": str(day),
+                "time": f"{rng.randint(8, 16):02d}:00", "duration": 30, "type": "Benchmark"
+            })
+            for row in range(1, 51)
+        ]
+        hospital_system.bulk_schedule_appointments(bookings)
+
+    def find_slots():
+        start_date = datetime.date.today() + datetime.timedelta(days=1)
+        hospital_system.find_available_slots(30, start_date, start_date + datetime.timedelta(days=13),
+                                             department_id=department_id(rng.randrange(size.departments)))
+
+    def search_misspelled():
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        typo = rng.randrange(1, len(name))
+        hospital_system.search_patients(name[:typo] + name[typo + 1:])
+
+    listings = hospital_system.listings
+
+    return [
+        ("is_valid_patient", 1, lambda: hospital_system.is_valid_patient(random_patient())),
+        ("is_valid_doctor", 1, lambda: hospital_system.is_valid_doctor(random_doctor())),
+        ("is_valid_department", 1, lambda: hospital_system.is_valid_department("DEPT000001")),
+        ("is_doctor_available", 1, lambda: hospital_system.is_doctor_available(random_doctor(), random_slot(), 30)),
+        ("find_available_room", 1, lambda: hospital_system.find_available_room("", random_slot(), 30, random_doctor())),
+        ("find_available_slots_2_weeks", 1, find_slots),
+        ("generate_unique_id", 1, lambda: hospital_system.generate_unique_id("APPOINTMENT", "appointmentID", "APP")),
+        ("get_patient_medical_history", 1, lambda: hospital_system.get_patient_medical_history(random_patient())),
+        ("get_patient_medical_histories_100", 10, lambda: hospital_system.get_patient_medical_histories([random_patient() for _ in range(100)])),
+        ("search_patients_misspelled", 1, search_misspelled),
+        ("patients_page", 1, lambda: listings.patients_page(page_size=100)),
+        ("doctors_page", 1, lambda: listings.doctors_page(page_size=100)),
+        ("rooms_page", 1, lambda: listings.rooms_page(page_size=100)),
+        ("appointments_page", 1, lambda: listings.appointments_page(page_size=100)),
+        ("appointments_page_doctor", 1, lambda: listings.appointments_page(doctor_id=random_doctor(), page_size=100)),
+        ("bulk_schedule_appointments_50", 10, bulk_schedule),
+        ("list_departments", 10, hospital_system.list_departments),
+        ("list_rooms", 10, hospital_system.list_rooms),
+        ("list_doctors", 10, hospital_system.list_doctors),
+    ]
+
+
+def run_scale(hospital_system: HospitalManagementSystem, size: DatasetSize, iterations: int, seed: int) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(seed)
+    results = {}
+
+    for name, divisor, operation in operations(hospital_system, size, rng):
+        count = max(2, iterations // divisor)
+        samples = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            operation()
+            for _ in range(count):
+                start = time.perf_counter()
+                operation()
+                samples.append((time.perf_counter() - start) * 1000)
+
+        results[name] = {
+            "iterations": count,
+            "p50_ms": round(statistics.median(samples), 4),
+            "p99_ms": round(percentile(samples, 0.99), 4),
+        }
+        print(f"{name:<36} {results[name]['p50_ms']:>10.3f} {results[name]['p99_ms']:>10.3f}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every public operation at one or more dataset scales and write p50/p99 latencies as JSON.")
+    add_connection_arguments(parser)
+    parser.add_argument("--scales", default="10k", help=f"Comma-separated scales from {', '.join(SCALES)}")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--load", action="store_true", help="Load synthetic data into the (empty) MySQL database before timing")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {}
+    if os.path.exists(args.output):
+        with open(args.output) as output_file:
+            report = json.load(output_file)
+
+    for scale in args.scales.split(","):
+        size = DatasetSize.for_patients(SCALES[scale])
+        generator = SyntheticDataGenerator(size, seed=args.seed)
+
+        with tempfile.TemporaryDirectory() as directory:
+            if args.backend == "sqlite":
+                backend = SQLiteBackend(os.path.join(directory, f"{scale}.db"))
+                load(backend, generator, verbose=False)
+            else:
+                backend = create_backend(args)
+                if args.load:
+                    load(backend, generator, verbose=False)
+
+            hospital_system = HospitalManagementSystem(backend=backend)
+
+            print(f"\n{args.backend} / {scale}")
+            print(f"{'Operation':<36} {'p50 ms':>10} {'p99 ms':>10}")
+            print("-" * 58)
+
+            report[f"{args.backend}/{scale}"] = {
+                "backend": args.backend,
+                "scale": scale,
+                "patients": size.patients,
+                "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "results": run_scale(hospital_system, size, args.iterations, args.seed),
+            }
+            hospital_system.pool.close()
+
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2, sort_keys=True)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
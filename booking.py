@@ -0,0 +1,181 @@
+import datetime
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from mysql.connector.errors import DatabaseError, IntegrityError, OperationalError
+
+from backends import Backend
+from models import AppointmentConfirmation, ConflictError, NotFoundError
+from statement_cache import APPOINTMENT_INSERT, LOCK_BUMP, LOCK_INSERT, ROOM_STATUS
+
+RETRYABLE_ERRNOS = {1205, 1213}
+
+T = TypeVar("T")
+
+
+def lock_days(start: datetime.datetime, duration: int) -> List[datetime.date]:
+    end = start + datetime.timedelta(minutes=max(duration, 1) - 1)
+    return [start.date() + datetime.timedelta(days=offset) for offset in range((end.date() - start.date()).days + 1)]
+
+
+def is_retryable(error: DatabaseError) -> bool:
+    return error.errno in RETRYABLE_ERRNOS or (isinstance(error, OperationalError) and "locked" in str(error))
+
+
+class ConcurrentBooker:
+    def __init__(self, hospital_system, max_attempts: int = 8, base_delay: float = 0.005, max_delay: float = 0.2):
+        self.hospital_system = hospital_system
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._conflict_queries = {
+            column: f"SELECT COUNT(*) FROM APPOINTMENT WHERE {column} = %s AND {self._overlap_condition()}"
+            for column in ("doctorID", "roomNumber")
+        }
+
+    @property
+    def statements(self):
+        return self.hospital_system.statements
+
+    @property
+    def backend(self) -> Backend:
+        return self.hospital_system.backend
+
+    def _overlap_condition(self) -> str:
+        return f"""
+            status = 'Scheduled' AND
+            ((dateTime <= %s AND {self.backend.add_minutes('dateTime', 'duration')} > %s) OR
+            (dateTime < %s AND dateTime >= %s))
+        """
+
+    def lock(self, connection, resources: List[Tuple[str, datetime.date]]) -> None:
+        for resource, day in sorted(set(resources)):
+            if self.statements.rowcount(connection, LOCK_BUMP, (resource, day)) == 0:
+                try:
+                    self.statements.execute(connection, LOCK_INSERT, (resource, day))
+                except IntegrityError:
+                    self.statements.execute(connection, LOCK_BUMP, (resource, day))
+
+    def has_conflict(self, connection, column: str, value: str, start: datetime.datetime, end: datetime.datetime) -> bool:
+        row = self.statements.fetchone(connection, self._conflict_queries[column], (value, start, start, end, start))
+        return row[0] > 0
+
+    def conflicts(self, connection, bookings: List[Tuple[Any, str, str, datetime.datetime, datetime.datetime]]) -> Dict[Any, str]:
+        # One statement checks a whole batch of (key, doctor, room, start, end) rows. A key maps to "doctor" when the
+        # doctor is busy, otherwise to "room" when the room is busy or not available.
+        if not bookings:
+            return {}
+
+        rows = " UNION ALL ".join(
+            ["SELECT %s AS bookingKey, %s AS doctorID, %s AS roomNumber, %s AS startTime, %s AS endTime"] +
+            ["SELECT %s, %s, %s, %s, %s"] * (len(bookings) - 1)
+        )
+        overlap = f"""
+            a.status = 'Scheduled' AND
+            ((a.dateTime <= c.startTime AND {self.backend.add_minutes('a.dateTime', 'a.duration')} > c.startTime) OR
+            (a.dateTime < c.endTime AND a.dateTime >= c.startTime))
+        """
+        params = [value for booking in bookings for value in booking]
+
+        cursor = connection.cursor()
+        cursor.execute(f"""
+            SELECT c.bookingKey, 'doctor' FROM ({rows}) c
+            WHERE EXISTS (SELECT 1 FROM APPOINTMENT a WHERE a.doctorID = c.doctorID AND {overlap})
+            UNION ALL
+            SELECT c.bookingKey, 'room' FROM ({rows}) c
+            WHERE NOT EXISTS (SELECT 1 FROM ROOM r WHERE r.roomNumber = c.roomNumber AND r.status = 'Available')
+               OR EXISTS (SELECT 1 FROM APPOINTMENT a WHERE a.roomNumber = c.roomNumber AND {overlap})
+        """, params + params)
+
+        found: Dict[Any, str] = {}
+        for key, kind in cursor.fetchall():
+            if kind == "doctor" or key not in found:
+                found[key] = kind
+        cursor.close()
+        return found
+
+    def room_is_available(self, connection, room_number: str) -> bool:
+        row = self.statements.fetchone(connection, ROOM_STATUS, (room_number,))
+        return row is not None and row[0] == 'Available'
+
+    def _attempt(self, appointment_id: str, patient_id: str, doctor_id: str, department_id: str,
+                 start: datetime.datetime, duration: int, appointment_type: str, preferred_room: str,
+                 notes: str) -> Optional[str]:
+        availability = self.hospital_system.availability
+        end = start + datetime.timedelta(minutes=duration)
+        days = lock_days(start, duration)
+        rejected_rooms = set()
+
+        with self.hospital_system.pool.connection() as connection:
+            while True:
+                rooms = [room for room in availability.candidate_rooms(department_id, preferred_room, start, duration)
+                         if room not in rejected_rooms]
+                if not rooms:
+                    return None
+                room_number = rooms[0]
+
+                self.lock(connection, [(f"doctor:{doctor_id}", day) for day in days] +
+                                      [(f"room:{room_number}", day) for day in days])
+
+                if self.has_conflict(connection, "doctorID", doctor_id, start, end):
+                    connection.rollback()
+                    availability.refresh()
+                    raise ConflictError("Doctor is not available at the requested time.")
+
+                if not self.room_is_available(connection, room_number) or \
+                        self.has_conflict(connection, "roomNumber", room_number, start, end):
+                    connection.rollback()
+                    rejected_rooms.add(room_number)
+                    continue
+
+                self.statements.execute(connection, APPOINTMENT_INSERT, (
+                    appointment_id, start, duration, "Scheduled", appointment_type, notes, patient_id, doctor_id, room_number
+                ))
+                connection.commit()
+                return room_number
+
+    def with_retries(self, attempt: Callable[[], T]) -> T:
+        for attempt_number in range(self.max_attempts):
+            try:
+                return attempt()
+            except DatabaseError as e:
+                if not is_retryable(e) or attempt_number == self.max_attempts - 1:
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt_number)
+                time.sleep(random.uniform(0, delay))
+
+    def prune_locks(self, before: datetime.date) -> int:
+        with self.hospital_system.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM BOOKING_LOCK WHERE day < %s", (before,))
+            connection.commit()
+            deleted = cursor.rowcount
+            cursor.close()
+        return deleted
+
+    def book(self, patient_id: str, doctor_id: str, start: datetime.datetime, duration: int,
+             appointment_type: str, preferred_room: str = "", notes: str = "") -> AppointmentConfirmation:
+        hospital_system = self.hospital_system
+
+        if not hospital_system.availability.is_doctor_available(doctor_id, start, duration):
+            raise ConflictError("Doctor is not available at the requested time.")
+
+        doctor = hospital_system.reference.get("doctors", doctor_id)
+        if not doctor:
+            raise NotFoundError("Invalid doctor ID. Please check and try again.")
+
+        appointment_id = hospital_system.generate_unique_id("APPOINTMENT", "appointmentID", "APP")
+
+        room_number = self.with_retries(lambda: self._attempt(
+            appointment_id, patient_id, doctor_id, doctor['departmentID'], start, duration, appointment_type,
+            preferred_room, notes
+        ))
+
+        if room_number is None:
+            raise ConflictError("No suitable room available at the requested time.")
+
+        hospital_system.availability.add(appointment_id, doctor_id, room_number, start, duration)
+        hospital_system.utilization.record_appointment(room_number, start, duration)
+
+        return AppointmentConfirmation(appointment_id, room_number, start, duration)
@@ -0,0 +1,272 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from mysql.connector import Error
+
+from booking import ConcurrentBooker, lock_days
+from statement_cache import APPOINTMENT_INSERT
+
+BOOKING_FIELDS = ["patientID", "doctorID", "date", "time", "duration", "type", "preferredRoom", "notes"]
+REPORT_FIELDS = ["row", "status", "appointmentID", "roomNumber", "reason"]
+CONFLICT_REASONS = {
+    "doctor": "Doctor is not available at the requested time",
+    "room": "Room was booked by another user; import the row again",
+}
+
+
+@dataclass
+class BookingRequest:
+    row: int
+    patient_id: str
+    doctor_id: str
+    date_time: Optional[datetime.datetime]
+    duration: int
+    appointment_type: str
+    preferred_room: str = ""
+    notes: str = ""
+    error: Optional[str] = None
+
+
+@dataclass
+class BookingResult:
+    row: int
+    accepted: bool
+    appointment_id: Optional[str] = None
+    room_number: Optional[str] = None
+    reason: str = ""
+
+
+@dataclass
+class BulkScheduleReport:
+    results: List[BookingResult] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> int:
+        return sum(1 for result in self.results if result.accepted)
+
+    @property
+    def rejected(self) -> int:
+        return len(self.results) - self.accepted
+
+    def write_csv(self, path: str) -> None:
+        with open(path, "w", newline="") as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(REPORT_FIELDS)
+            for result in self.results:
+                writer.writerow([
+                    result.row,
+                    "accepted" if result.accepted else "rejected",
+                    result.appointment_id or "",
+                    result.room_number or "",
+                    result.reason
+                ])
+
+
+def parse_booking(row: int, data: Dict[str, Any]) -> BookingRequest:
+    booking = BookingRequest(
+        row=row,
+        patient_id=str(data.get("patientID") or "").strip(),
+        doctor_id=str(data.get("doctorID") or "").strip(),
+        date_time=None,
+        duration=0,
+        appointment_type=str(data.get("type") or "").strip(),
+        preferred_room=str(data.get("preferredRoom") or "").strip(),
+        notes=str(data.get("notes") or "")
+    )
+
+    try:
+        booking.date_time = datetime.datetime.strptime(f"{data.get('date')} {data.get('time')}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        booking.error = "Invalid date or time"
+        return booking
+
+    try:
+        booking.duration = int(data.get("duration"))
+    except (TypeError, ValueError):
+        booking.error = "Invalid duration"
+        return booking
+
+    if booking.duration <= 0:
+        booking.error = "Invalid duration"
+    elif not booking.patient_id or not booking.doctor_id or not booking.appointment_type:
+        booking.error = "Missing patient ID, doctor ID or appointment type"
+
+    return booking
+
+
+def read_bookings(path: str) -> List[BookingRequest]:
+    bookings = []
+
+    with open(path, newline="") as booking_file:
+        if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson"):
+            for row, line in enumerate(booking_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    bookings.append(parse_booking(row, json.loads(line)))
+                except json.JSONDecodeError:
+                    bookings.append(BookingRequest(row, "", "", None, 0, "", error="Invalid JSON"))
+        else:
+            for row, data in enumerate(csv.DictReader(booking_file), start=1):
+                bookings.append(parse_booking(row, data))
+
+    return bookings
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _existing_ids(cursor, query: str, ids: Set[str], chunk_size: int) -> Dict[str, Any]:
+    found = {}
+    for chunk in _chunks(sorted(ids), chunk_size):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(query.format(placeholders=placeholders), chunk)
+        for row in cursor.fetchall():
+            found[row[0]] = row[1] if len(row) > 1 else True
+    return found
+
+
+def _insert_chunk(hospital_system, booker: ConcurrentBooker, chunk: List[Tuple[int, BookingRequest]],
+                  results: Dict[int, BookingResult]) -> Dict[int, str]:
+    # Same protocol as a single booking: lock rows in sorted order, re-check in SQL, then insert. The re-check is one
+    # statement for the whole chunk.
+    with hospital_system.pool.connection() as connection:
+        booker.lock(connection, [
+            (resource, day)
+            for position, booking in chunk
+            for resource in (f"doctor:{booking.doctor_id}", f"room:{results[position].room_number}")
+            for day in lock_days(booking.date_time, booking.duration)
+        ])
+
+        conflicts = booker.conflicts(connection, [
+            (position, booking.doctor_id, results[position].room_number, booking.date_time,
+             booking.date_time + datetime.timedelta(minutes=booking.duration))
+            for position, booking in chunk
+        ])
+        rejected = {position: CONFLICT_REASONS[kind] for position, kind in conflicts.items()}
+        inserted = [(position, booking) for position, booking in chunk if position not in rejected]
+
+        if inserted:
+            cursor = connection.cursor()
+            cursor.executemany(APPOINTMENT_INSERT, [
+                (results[position].appointment_id, booking.date_time, booking.duration, "Scheduled",
+                 booking.appointment_type, booking.notes, booking.patient_id, booking.doctor_id,
+                 results[position].room_number)
+                for position, booking in inserted
+            ])
+            cursor.close()
+        connection.commit()
+
+    return rejected
+
+
+def bulk_schedule_appointments(hospital_system, bookings: List[BookingRequest], chunk_size: int = 500) -> BulkScheduleReport:
+    report = BulkScheduleReport()
+    results: Dict[int, BookingResult] = {}
+    candidates = [(position, booking) for position, booking in enumerate(bookings) if booking.error is None]
+
+    for position, booking in enumerate(bookings):
+        if booking.error is not None:
+            results[position] = BookingResult(booking.row, False, reason=booking.error)
+
+    with hospital_system.pool.connection() as connection:
+        cursor = connection.cursor()
+        patients = _existing_ids(
+            cursor,
+            "SELECT patientID FROM PATIENT WHERE patientID IN ({placeholders})",
+            {booking.patient_id for _, booking in candidates},
+            chunk_size
+        )
+        doctor_departments = _existing_ids(
+            cursor,
+            "SELECT doctorID, departmentID FROM DOCTOR WHERE doctorID IN ({placeholders})",
+            {booking.doctor_id for _, booking in candidates},
+            chunk_size
+        )
+        cursor.close()
+
+    # The index only plans the rooms; every booking is checked again in SQL when its chunk is inserted.
+    availability = hospital_system.availability
+    availability.refresh()
+    booker = hospital_system.booker or ConcurrentBooker(hospital_system)
+    accepted: List[Tuple[int, BookingRequest]] = []
+
+    for position, booking in sorted(candidates, key=lambda candidate: (candidate[1].date_time, candidate[0])):
+        if booking.patient_id not in patients:
+            results[position] = BookingResult(booking.row, False, reason="Invalid patient ID")
+            continue
+
+        if booking.doctor_id not in doctor_departments:
+            results[position] = BookingResult(booking.row, False, reason="Invalid doctor ID")
+            continue
+
+        if not availability.is_doctor_available(booking.doctor_id, booking.date_time, booking.duration):
+            results[position] = BookingResult(booking.row, False, reason="Doctor is not available at the requested time")
+            continue
+
+        room_number = availability.find_room(doctor_departments[booking.doctor_id], booking.preferred_room, booking.date_time, booking.duration)
+        if not room_number:
+            results[position] = BookingResult(booking.row, False, reason="No suitable room available at the requested time")
+            continue
+
+        appointment_id = hospital_system.generate_unique_id("APPOINTMENT", "appointmentID", "APP")
+
+        results[position] = BookingResult(booking.row, True, appointment_id, room_number)
+        availability.add(appointment_id, booking.doctor_id, room_number, booking.date_time, booking.duration)
+        accepted.append((position, booking))
+
+    for chunk in _chunks(accepted, chunk_size):
+        try:
+            rejected = booker.with_retries(lambda: _insert_chunk(hospital_system, booker, chunk, results))
+        except Error as e:
+            rejected = {position: f"Database error: {e}" for position, _ in chunk}
+
+        for position, booking in chunk:
+            result = results[position]
+            if position in rejected:
+                availability.remove(result.appointment_id, booking.doctor_id, result.room_number)
+                results[position] = BookingResult(booking.row, False, reason=rejected[position])
+            else:
+                hospital_system.utilization.record_appointment(result.room_number, booking.date_time, booking.duration)
+
+    report.results = [results[position] for position in range(len(bookings))]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule appointments in bulk from a CSV or JSONL file.")
+    parser.add_argument("bookings", help=f"CSV or JSONL file with the fields {', '.join(BOOKING_FIELDS)}")
+    parser.add_argument("--report", help="Write the per-row accept/reject report to this CSV file")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    from hospital_management import HospitalManagementSystem
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database)
+    report = hospital_system.bulk_schedule_appointments(read_bookings(args.bookings), chunk_size=args.chunk_size)
+
+    print(f"Accepted: {report.accepted}")
+    print(f"Rejected: {report.rejected}")
+
+    if args.report:
+        report.write_csv(args.report)
+        print(f"Report written to {args.report}")
+    else:
+        for result in report.results:
+            if not result.accepted:
+                print(f"Row {result.row}: {result.reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import argparse
+import csv
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mysql.connector import Error
+
+ASSIGNMENT_FIELDS = ["doctorID", "departmentID"]
+REPORT_FIELDS = ["doctorID", "status", "fromDepartment", "toDepartment", "reason"]
+
+
+@dataclass
+class ReassignmentResult:
+    doctor_id: str
+    department_id: str
+    accepted: bool
+    doctor_name: Optional[str] = None
+    previous_department_id: Optional[str] = None
+    reason: str = ""
+
+
+@dataclass
+class BulkReassignmentReport:
+    results: List[ReassignmentResult] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> int:
+        return sum(1 for result in self.results if result.accepted)
+
+    @property
+    def rejected(self) -> int:
+        return len(self.results) - self.accepted
+
+    def write_csv(self, path: str) -> None:
+        with open(path, "w", newline="") as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(REPORT_FIELDS)
+            for result in self.results:
+                writer.writerow([
+                    result.doctor_id,
+                    "accepted" if result.accepted else "rejected",
+                    result.previous_department_id or "",
+                    result.department_id,
+                    result.reason
+                ])
+
+
+def read_assignments(path: str) -> Dict[str, str]:
+    with open(path, newline="") as assignment_file:
+        return {
+            str(row.get("doctorID") or "").strip(): str(row.get("departmentID") or "").strip()
+            for row in csv.DictReader(assignment_file)
+        }
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _upcoming_condition(hospital_system, doctor_column: str) -> str:
+    return f"""
+        SELECT 1 FROM APPOINTMENT a
+        WHERE a.doctorID = {doctor_column} AND a.status = 'Scheduled' AND a.dateTime > {hospital_system.backend.now()}
+    """
+
+
+def _load_guards(hospital_system, cursor, doctor_ids: List[str]) -> Dict[str, Tuple[str, str, int]]:
+    placeholders = ", ".join(["%s"] * len(doctor_ids))
+    cursor.execute(f"""
+        SELECT d.doctorID, d.name, d.departmentID, COALESCE(u.upcoming, 0)
+        FROM DOCTOR d
+        LEFT JOIN (
+            SELECT doctorID, COUNT(*) AS upcoming FROM APPOINTMENT
+            WHERE doctorID IN ({placeholders}) AND status = 'Scheduled' AND dateTime > {hospital_system.backend.now()}
+            GROUP BY doctorID
+        ) u ON u.doctorID = d.doctorID
+        WHERE d.doctorID IN ({placeholders})
+    """, doctor_ids + doctor_ids)
+    return {doctor_id: (name, department_id, int(upcoming)) for doctor_id, name, department_id, upcoming in cursor.fetchall()}
+
+
+def _load_heads(cursor, department_ids: List[str]) -> Dict[str, Optional[str]]:
+    cursor.execute(
+        f"SELECT deptID, headDoctor FROM DEPARTMENT WHERE deptID IN ({', '.join(['%s'] * len(department_ids))})",
+        department_ids
+    )
+    return dict(cursor.fetchall())
+
+
+def _check(result: ReassignmentResult, guard: Tuple[str, str, int], heads: Dict[str, Optional[str]]) -> bool:
+    name, current_department_id, upcoming = guard
+    result.doctor_name = name
+    result.previous_department_id = current_department_id
+
+    if current_department_id == result.department_id:
+        result.accepted = True
+        result.reason = "Already in department"
+        return False
+    # Same rule as reassign_doctor: a doctor cannot be moved into a department they are the head of.
+    if heads[result.department_id] == result.doctor_id:
+        result.reason = "Cannot reassign department head"
+        return False
+    if upcoming > 0:
+        result.reason = f"Doctor has {upcoming} upcoming appointments"
+        return False
+    result.accepted = True
+    return True
+
+
+def _apply(hospital_system, cursor, moves: List[ReassignmentResult]) -> int:
+    # The guards are checked again inside the UPDATE, so a head assignment or booking committed after they were
+    # read still stops the move.
+    cases = " ".join(["WHEN %s THEN %s"] * len(moves))
+    case_params = [value for move in moves for value in (move.doctor_id, move.department_id)]
+    placeholders = ", ".join(["%s"] * len(moves))
+    cursor.execute(f"""
+        UPDATE DOCTOR SET departmentID = CASE doctorID {cases} END
+        WHERE doctorID IN ({placeholders})
+          AND NOT EXISTS (
+              SELECT 1 FROM DEPARTMENT h
+              WHERE h.headDoctor = DOCTOR.doctorID AND h.deptID = CASE DOCTOR.doctorID {cases} END
+          )
+          AND NOT EXISTS ({_upcoming_condition(hospital_system, "DOCTOR.doctorID")})
+    """, case_params + [move.doctor_id for move in moves] + case_params)
+    return cursor.rowcount
+
+
+def bulk_reassign_doctors(hospital_system, assignments: Dict[str, str], chunk_size: int = 500,
+                          dry_run: bool = False) -> BulkReassignmentReport:
+    report = BulkReassignmentReport()
+    results: Dict[str, ReassignmentResult] = {}
+    doctor_ids = sorted(doctor_id for doctor_id in assignments if doctor_id)
+    moves: List[ReassignmentResult] = []
+
+    for doctor_id, department_id in assignments.items():
+        results[doctor_id] = ReassignmentResult(doctor_id, department_id, False)
+        if not doctor_id:
+            results[doctor_id].reason = "Missing doctor ID"
+
+    department_ids = sorted({results[doctor_id].department_id for doctor_id in doctor_ids})
+
+    with hospital_system.pool.connection() as connection:
+        cursor = connection.cursor()
+        try:
+            heads: Dict[str, Optional[str]] = {}
+            for chunk in _chunks(department_ids, chunk_size):
+                heads.update(_load_heads(cursor, chunk))
+
+            guards: Dict[str, Tuple[str, str, int]] = {}
+            for chunk in _chunks(doctor_ids, chunk_size):
+                guards.update(_load_guards(hospital_system, cursor, chunk))
+
+            for doctor_id in doctor_ids:
+                result = results[doctor_id]
+                if result.department_id not in heads:
+                    result.reason = "Invalid department ID"
+                elif doctor_id not in guards:
+                    result.reason = "Invalid doctor ID"
+                elif _check(result, guards[doctor_id], heads):
+                    moves.append(result)
+
+            if moves and not dry_run:
+                for chunk in _chunks(moves, chunk_size):
+                    if _apply(hospital_system, cursor, chunk) == len(chunk):
+                        continue
+                    # Something changed since the guards were read. Report the current reason for each doctor left behind.
+                    heads.update(_load_heads(cursor, sorted({move.department_id for move in chunk})))
+                    current = _load_guards(hospital_system, cursor, [move.doctor_id for move in chunk])
+                    for move in chunk:
+                        guard = current.get(move.doctor_id)
+                        if guard is None or guard[1] != move.department_id:
+                            if guard is None or _check(move, guard, heads):
+                                move.reason = "Doctor changed during reassignment; try again"
+                            move.accepted = False
+                moves = [move for move in moves if move.accepted]
+                connection.commit()
+        finally:
+            cursor.close()
+
+    if moves and not dry_run:
+        hospital_system.reference.invalidate("doctors")
+        for move in moves:
+            hospital_system.utilization.move_doctor(move.previous_department_id, move.department_id)
+
+    report.results = [results[doctor_id] for doctor_id in assignments]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move many doctors to new departments in one transaction.")
+    parser.add_argument("assignments", help=f"CSV file with the fields {', '.join(ASSIGNMENT_FIELDS)}")
+    parser.add_argument("--report", help="Write the per-doctor report to this CSV file")
+    parser.add_argument("--dry-run", action="store_true", help="Check every move without applying any")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    from hospital_management import HospitalManagementSystem
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database)
+    try:
+        report = hospital_system.bulk_reassign_doctors(read_assignments(args.assignments), dry_run=args.dry_run)
+    except Error as e:
+        print(f"Error reassigning doctors: {e}")
+        raise SystemExit(1)
+
+    print(f"{'Valid' if args.dry_run else 'Reassigned'}: {report.accepted}")
+    print(f"Rejected: {report.rejected}")
+
+    if args.report:
+        report.write_csv(args.report)
+        print(f"Report written to {args.report}")
+    else:
+        for result in report.results:
+            if not result.accepted:
+                print(f"{result.doctor_id}: {result.reason}")
+
+
+if __name__ == "__main__":
+    main()
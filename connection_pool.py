@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, TypeVar
+
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+T = TypeVar("T")
+
+
+class ConnectionPool:
+    def __init__(self, connect: Callable[[], Any], size: int = 5, timeout: float = 30.0,
+                 health_check_interval: float = 30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._last_used: Dict[int, float] = {}
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> int:
+        return self._created
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize()
+
+    def _open(self) -> Any:
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, connection: Any) -> None:
+        self._last_used.pop(id(connection), None)
+        with self._lock:
+            self._created -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection: Any) -> bool:
+        idle_for = time.monotonic() - self._last_used.get(id(connection), 0.0)
+        if idle_for < self.health_check_interval:
+            return True
+
+        try:
+            connection.ping(reconnect=True, attempts=2, delay=0)
+            return True
+        except Error:
+            return False
+
+    def acquire(self) -> Any:
+        if self._closed:
+            raise PoolError("Connection pool is closed")
+
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._open()
+                if connection is not None:
+                    return connection
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError(f"No connection available after {self.timeout} seconds")
+                try:
+                    connection = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    raise PoolError(f"No connection available after {self.timeout} seconds") from None
+
+            if self._is_healthy(connection):
+                return connection
+
+            self._discard(connection)
+
+    def release(self, connection: Any, failed: bool = False) -> None:
+        try:
+            if failed or connection.in_transaction:
+                connection.rollback()
+        except Error:
+            self._discard(connection)
+            return
+
+        if self._closed:
+            self._discard(connection)
+            return
+
+        self._last_used[id(connection)] = time.monotonic()
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self, write: bool = True) -> Iterator[Any]:
+        connection = self.acquire()
+        try:
+            yield connection
+        except Exception:
+            self.release(connection, failed=True)
+            raise
+        else:
+            self.release(connection)
+
+    def read_connection(self) -> Iterator[Any]:
+        return self.connection(write=False)
+
+    def read(self, operation: Callable[[Any], T], primary: bool = False) -> T:
+        with self.read_connection() as connection:
+            return operation(connection)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
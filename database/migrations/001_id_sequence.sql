@@ -0,0 +1,4 @@
+CREATE TABLE ID_SEQUENCE (
+    name VARCHAR(64) PRIMARY KEY,
+    next_value BIGINT NOT NULL
+);
@@ -0,0 +1,14 @@
+-- Availability checks and upcoming appointment listings.
+CREATE INDEX idx_appointment_doctor_status_time ON APPOINTMENT (doctorID, status, dateTime);
+CREATE INDEX idx_appointment_room_status_time ON APPOINTMENT (roomNumber, status, dateTime);
+CREATE INDEX idx_appointment_patient_status_time ON APPOINTMENT (patientID, status, dateTime);
+CREATE INDEX idx_appointment_status_time ON APPOINTMENT (status, dateTime);
+
+-- Medical history, newest record first.
+CREATE INDEX idx_medical_record_patient_date ON MEDICAL_RECORD (patientID, date DESC);
+
+-- Prescription lookups by recordID are already served by the (recordID, prescriptionNumber) primary key.
+
+-- Keyset-paginated listings ordered by name.
+CREATE INDEX idx_patient_name ON PATIENT (name, patientID);
+CREATE INDEX idx_doctor_name ON DOCTOR (name, doctorID);
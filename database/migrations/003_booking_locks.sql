@@ -0,0 +1,8 @@
+-- One row per doctor or room and day, updated at the start of a booking transaction to serialize
+-- competing bookings for the same resource without locking anything else.
+CREATE TABLE BOOKING_LOCK (
+    resource VARCHAR(32) NOT NULL,
+    day DATE NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (resource, day)
+);
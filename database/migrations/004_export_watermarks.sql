@@ -0,0 +1,3 @@
+-- Incremental exports filter on these columns alone.
+CREATE INDEX idx_appointment_time ON APPOINTMENT (dateTime);
+CREATE INDEX idx_medical_record_date ON MEDICAL_RECORD (date);
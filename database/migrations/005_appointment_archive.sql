@@ -0,0 +1,20 @@
+-- Closed appointments moved out of APPOINTMENT by archive.py. Same columns, plus when each row was moved.
+CREATE TABLE APPOINTMENT_ARCHIVE (
+    appointmentID VARCHAR(10) PRIMARY KEY,
+    dateTime DATETIME NOT NULL,
+    duration INT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    notes TEXT,
+    patientID VARCHAR(10) NOT NULL,
+    doctorID VARCHAR(10) NOT NULL,
+    roomNumber VARCHAR(10) NOT NULL,
+    archivedAt DATETIME NOT NULL,
+    FOREIGN KEY (patientID) REFERENCES PATIENT(patientID),
+    FOREIGN KEY (doctorID) REFERENCES DOCTOR(doctorID),
+    FOREIGN KEY (roomNumber) REFERENCES ROOM(roomNumber)
+);
+
+CREATE INDEX idx_appointment_archive_patient_time ON APPOINTMENT_ARCHIVE (patientID, dateTime);
+CREATE INDEX idx_appointment_archive_doctor_time ON APPOINTMENT_ARCHIVE (doctorID, dateTime);
+CREATE INDEX idx_appointment_archive_time ON APPOINTMENT_ARCHIVE (dateTime);
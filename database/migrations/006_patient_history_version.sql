@@ -0,0 +1,7 @@
+-- One row per patient, bumped in every transaction that changes what the patient's medical history shows,
+-- so cached history snapshots can be checked with a single primary key lookup.
+CREATE TABLE PATIENT_HISTORY_VERSION (
+    patientID VARCHAR(10) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    FOREIGN KEY (patientID) REFERENCES PATIENT(patientID)
+);
@@ -0,0 +1,7 @@
+-- When each appointment was last inserted or changed, so incremental exports pick up status changes.
+-- Existing rows get the time of the migration and are exported once more by the next incremental run.
+ALTER TABLE APPOINTMENT ADD COLUMN updatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
+ALTER TABLE APPOINTMENT_ARCHIVE ADD COLUMN updatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE INDEX idx_appointment_updated ON APPOINTMENT (updatedAt);
+CREATE INDEX idx_appointment_archive_updated ON APPOINTMENT_ARCHIVE (updatedAt);
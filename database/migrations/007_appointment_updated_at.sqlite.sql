@@ -0,0 +1,23 @@
+-- When each appointment was last inserted or changed, so incremental exports pick up status changes.
+-- SQLite cannot add a column defaulting to the current time, so triggers keep it up to date instead.
+ALTER TABLE APPOINTMENT ADD COLUMN updatedAt DATETIME;
+ALTER TABLE APPOINTMENT_ARCHIVE ADD COLUMN updatedAt DATETIME;
+UPDATE APPOINTMENT SET updatedAt = datetime('now', 'localtime');
+UPDATE APPOINTMENT_ARCHIVE SET updatedAt = datetime('now', 'localtime');
+
+CREATE INDEX idx_appointment_updated ON APPOINTMENT (updatedAt);
+CREATE INDEX idx_appointment_archive_updated ON APPOINTMENT_ARCHIVE (updatedAt);
+
+DELIMITER //
+CREATE TRIGGER appointment_insert_updated_at AFTER INSERT ON APPOINTMENT
+WHEN NEW.updatedAt IS NULL
+BEGIN
+    UPDATE APPOINTMENT SET updatedAt = datetime('now', 'localtime') WHERE appointmentID = NEW.appointmentID;
+END//
+
+CREATE TRIGGER appointment_update_updated_at AFTER UPDATE ON APPOINTMENT
+WHEN NEW.updatedAt IS OLD.updatedAt
+BEGIN
+    UPDATE APPOINTMENT SET updatedAt = datetime('now', 'localtime') WHERE appointmentID = NEW.appointmentID;
+END//
+DELIMITER ;
@@ -0,0 +1,59 @@
+-- Bump PATIENT_HISTORY_VERSION from triggers, so a change made by any application invalidates cached histories.
+-- New version rows start at the current time in microseconds rather than 0, so a snapshot stored for a deleted
+-- patient, or one cached before this migration, never matches the new row. With binary logging enabled, creating
+-- triggers needs SUPER or log_bin_trust_function_creators = 1.
+INSERT INTO PATIENT_HISTORY_VERSION (patientID, version)
+SELECT p.patientID, CAST(UNIX_TIMESTAMP(NOW(6)) * 1000000 AS UNSIGNED) FROM PATIENT p
+WHERE NOT EXISTS (SELECT 1 FROM PATIENT_HISTORY_VERSION v WHERE v.patientID = p.patientID);
+
+DELIMITER //
+CREATE TRIGGER patient_history_patient_insert AFTER INSERT ON PATIENT FOR EACH ROW
+    INSERT INTO PATIENT_HISTORY_VERSION (patientID, version)
+    VALUES (NEW.patientID, CAST(UNIX_TIMESTAMP(NOW(6)) * 1000000 AS UNSIGNED))//
+
+CREATE TRIGGER patient_history_patient_update AFTER UPDATE ON PATIENT FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID//
+
+-- The version row references the patient, so it has to go first.
+CREATE TRIGGER patient_history_patient_delete BEFORE DELETE ON PATIENT FOR EACH ROW
+    DELETE FROM PATIENT_HISTORY_VERSION WHERE patientID = OLD.patientID//
+
+CREATE TRIGGER patient_history_phone_insert AFTER INSERT ON PATIENT_PHONE_NUMBERS FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID//
+
+CREATE TRIGGER patient_history_phone_update AFTER UPDATE ON PATIENT_PHONE_NUMBERS FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID IN (OLD.patientID, NEW.patientID)//
+
+CREATE TRIGGER patient_history_phone_delete AFTER DELETE ON PATIENT_PHONE_NUMBERS FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = OLD.patientID//
+
+CREATE TRIGGER patient_history_record_insert AFTER INSERT ON MEDICAL_RECORD FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID//
+
+CREATE TRIGGER patient_history_record_update AFTER UPDATE ON MEDICAL_RECORD FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID IN (OLD.patientID, NEW.patientID)//
+
+CREATE TRIGGER patient_history_record_delete AFTER DELETE ON MEDICAL_RECORD FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = OLD.patientID//
+
+CREATE TRIGGER patient_history_prescription_insert AFTER INSERT ON PRESCRIPTION FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (SELECT patientID FROM MEDICAL_RECORD WHERE recordID = NEW.recordID)//
+
+CREATE TRIGGER patient_history_prescription_update AFTER UPDATE ON PRESCRIPTION FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (SELECT patientID FROM MEDICAL_RECORD WHERE recordID IN (OLD.recordID, NEW.recordID))//
+
+CREATE TRIGGER patient_history_prescription_delete AFTER DELETE ON PRESCRIPTION FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (SELECT patientID FROM MEDICAL_RECORD WHERE recordID = OLD.recordID)//
+
+CREATE TRIGGER patient_history_appointment_insert AFTER INSERT ON APPOINTMENT FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID//
+
+CREATE TRIGGER patient_history_appointment_update AFTER UPDATE ON APPOINTMENT FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID IN (OLD.patientID, NEW.patientID)//
+
+CREATE TRIGGER patient_history_appointment_delete AFTER DELETE ON APPOINTMENT FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = OLD.patientID//
+DELIMITER ;
@@ -0,0 +1,88 @@
+-- Bump PATIENT_HISTORY_VERSION from triggers, so a change made by any application invalidates cached histories.
+-- New version rows start at the current time in microseconds rather than 0, so a snapshot stored for a deleted
+-- patient, or one cached before this migration, never matches the new row.
+INSERT INTO PATIENT_HISTORY_VERSION (patientID, version)
+SELECT p.patientID, CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER) * 1000 FROM PATIENT p
+WHERE NOT EXISTS (SELECT 1 FROM PATIENT_HISTORY_VERSION v WHERE v.patientID = p.patientID);
+
+DELIMITER //
+CREATE TRIGGER patient_history_patient_insert AFTER INSERT ON PATIENT
+BEGIN
+    INSERT INTO PATIENT_HISTORY_VERSION (patientID, version)
+    VALUES (NEW.patientID, CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER) * 1000);
+END//
+
+CREATE TRIGGER patient_history_patient_update AFTER UPDATE ON PATIENT
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID;
+END//
+
+-- The version row references the patient, so it has to go first.
+CREATE TRIGGER patient_history_patient_delete BEFORE DELETE ON PATIENT
+BEGIN
+    DELETE FROM PATIENT_HISTORY_VERSION WHERE patientID = OLD.patientID;
+END//
+
+CREATE TRIGGER patient_history_phone_insert AFTER INSERT ON PATIENT_PHONE_NUMBERS
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID;
+END//
+
+CREATE TRIGGER patient_history_phone_update AFTER UPDATE ON PATIENT_PHONE_NUMBERS
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID IN (OLD.patientID, NEW.patientID);
+END//
+
+CREATE TRIGGER patient_history_phone_delete AFTER DELETE ON PATIENT_PHONE_NUMBERS
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = OLD.patientID;
+END//
+
+CREATE TRIGGER patient_history_record_insert AFTER INSERT ON MEDICAL_RECORD
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID;
+END//
+
+CREATE TRIGGER patient_history_record_update AFTER UPDATE ON MEDICAL_RECORD
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID IN (OLD.patientID, NEW.patientID);
+END//
+
+CREATE TRIGGER patient_history_record_delete AFTER DELETE ON MEDICAL_RECORD
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = OLD.patientID;
+END//
+
+CREATE TRIGGER patient_history_prescription_insert AFTER INSERT ON PRESCRIPTION
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (SELECT patientID FROM MEDICAL_RECORD WHERE recordID = NEW.recordID);
+END//
+
+CREATE TRIGGER patient_history_prescription_update AFTER UPDATE ON PRESCRIPTION
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (SELECT patientID FROM MEDICAL_RECORD WHERE recordID IN (OLD.recordID, NEW.recordID));
+END//
+
+CREATE TRIGGER patient_history_prescription_delete AFTER DELETE ON PRESCRIPTION
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (SELECT patientID FROM MEDICAL_RECORD WHERE recordID = OLD.recordID);
+END//
+
+CREATE TRIGGER patient_history_appointment_insert AFTER INSERT ON APPOINTMENT
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = NEW.patientID;
+END//
+
+CREATE TRIGGER patient_history_appointment_update AFTER UPDATE ON APPOINTMENT
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID IN (OLD.patientID, NEW.patientID);
+END//
+
+CREATE TRIGGER patient_history_appointment_delete AFTER DELETE ON APPOINTMENT
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1 WHERE patientID = OLD.patientID;
+END//
+DELIMITER ;
@@ -0,0 +1,18 @@
+-- Histories show the doctor's name on each appointment and the medication's name, type and unit on each
+-- prescription, so changing those bumps the version of every patient whose history shows them. Stock level changes
+-- do not.
+DELIMITER //
+CREATE TRIGGER patient_history_doctor_update AFTER UPDATE ON DOCTOR FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE NEW.name <> OLD.name AND patientID IN (
+        SELECT patientID FROM APPOINTMENT WHERE doctorID = OLD.doctorID
+        UNION SELECT patientID FROM APPOINTMENT_ARCHIVE WHERE doctorID = OLD.doctorID
+    )//
+
+CREATE TRIGGER patient_history_medication_update AFTER UPDATE ON MEDICATION FOR EACH ROW
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE (NEW.name <> OLD.name OR NEW.type <> OLD.type OR NEW.unit <> OLD.unit) AND patientID IN (
+        SELECT r.patientID FROM PRESCRIPTION p JOIN MEDICAL_RECORD r ON p.recordID = r.recordID
+        WHERE p.medicationID = OLD.medicationID
+    )//
+DELIMITER ;
@@ -0,0 +1,24 @@
+-- Histories show the doctor's name on each appointment and the medication's name, type and unit on each
+-- prescription, so changing those bumps the version of every patient whose history shows them. Stock level changes
+-- do not.
+DELIMITER //
+CREATE TRIGGER patient_history_doctor_update AFTER UPDATE OF name ON DOCTOR
+WHEN NEW.name <> OLD.name
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (
+        SELECT patientID FROM APPOINTMENT WHERE doctorID = OLD.doctorID
+        UNION SELECT patientID FROM APPOINTMENT_ARCHIVE WHERE doctorID = OLD.doctorID
+    );
+END//
+
+CREATE TRIGGER patient_history_medication_update AFTER UPDATE OF name, type, unit ON MEDICATION
+WHEN NEW.name <> OLD.name OR NEW.type <> OLD.type OR NEW.unit <> OLD.unit
+BEGIN
+    UPDATE PATIENT_HISTORY_VERSION SET version = version + 1
+    WHERE patientID IN (
+        SELECT r.patientID FROM PRESCRIPTION p JOIN MEDICAL_RECORD r ON p.recordID = r.recordID
+        WHERE p.medicationID = OLD.medicationID
+    );
+END//
+DELIMITER ;
@@ -18,7 +18,7 @@ INSERT INTO DOCTOR (doctorID, name, specialization, office_phone, mobile_phone,
 ('DOC002', 'Emily Johnson', 'Neurologist', '555-1002', '555-2002', 'ejohnson@hospital.org', '555-3002', 'Michael Johnson 555-4002', 'DEPT002'),
 ('DOC003', 'Robert Chen', 'Pediatrician', '555-1003', '555-2003', 'rchen@hospital.org', '555-3003', 'Lisa Chen 555-4003', 'DEPT003'),
 ('DOC004', 'Sarah Williams', 'Oncologist', '555-1004', '555-2004', 'swilliams@hospital.org', '555-3004', 'David Williams 555-4004', 'DEPT004'),
-('DOC005', 'James Brown', 'Emergency Medicine', '555-1005', '555-2005', 'jbrown@hospital.org', '555-3005', 'Mary Brown 555-4005', 'DEPT005');
+('DOC005', 'James Brown', 'Emergency Medicine', '555-1005', '555-2005', 'jbrown@hospital.org', '555-3005', 'Mary Brown 555-4005', 'DEPT005'),
 ('DOC006', 'Michelle Lee', 'Dermatologist', '555-1006', '555-2006', 'mlee@hospital.org', '555-3006', 'Richard Lee 555-4006', 'DEPT004');
 
 UPDATE DEPARTMENT SET headDoctor = 'DOC001' WHERE deptID = 'DEPT001';
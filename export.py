@@ -0,0 +1,229 @@
+import argparse
+import csv
+import datetime
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from archive import all_appointments
+from backends import Backend
+from connection_pool import ConnectionPool
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Each run exports rows with the watermark column in [previous cutoff, this run's cutoff), and the cutoff becomes
+# the next watermark. Appointments use their modification time, so status changes are exported again.
+EXPORT_TABLES = {
+    "appointments": (
+        "SELECT a.appointmentID, a.dateTime, a.duration, a.status, a.type, a.notes, a.patientID, a.doctorID, a.roomNumber, "
+        "a.updatedAt FROM {appointments} a",
+        "a.updatedAt", "datetime"
+    ),
+    "medical_records": (
+        "SELECT r.recordID, r.date, r.diagnosis, r.treatment, r.note, r.patientID FROM MEDICAL_RECORD r",
+        "r.date", "date"
+    ),
+    "prescriptions": (
+        "SELECT p.recordID, p.prescriptionNumber, p.dosage, p.frequency, p.startDate, p.endDate, p.medicationID, "
+        "r.date AS recordDate FROM PRESCRIPTION p JOIN MEDICAL_RECORD r ON p.recordID = r.recordID",
+        "r.date", "date"
+    ),
+    "medications": (
+        "SELECT m.medicationID, m.name, m.type, m.stockLevel, m.unit FROM MEDICATION m",
+        None, None
+    ),
+}
+
+FORMATS = ["csv", "parquet"] if pyarrow else ["csv"]
+
+
+@dataclass
+class ExportResult:
+    table: str
+    path: str
+    rows: int
+    watermark: Optional[str]
+
+
+def watermark_key(table: str) -> Optional[str]:
+    watermark_column = EXPORT_TABLES[table][1]
+    return f"{table}.{watermark_column.split('.')[-1]}" if watermark_column else None
+
+
+def _watermark_value(value: Any) -> str:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat(" ") if isinstance(value, datetime.datetime) else value.isoformat()
+    return str(value)
+
+
+class CsvWriter:
+    extension = "csv.gz"
+
+    def __init__(self, path: str, columns: List[str]):
+        self._file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: List[Tuple[Any, ...]]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    extension = "parquet"
+
+    def __init__(self, path: str, columns: List[str]):
+        self._path = path
+        self._columns = columns
+        self._writer = None
+
+    def write(self, rows: List[Tuple[Any, ...]]) -> None:
+        data = {column: [row[index] for row in rows] for index, column in enumerate(self._columns)}
+        if self._writer is None:
+            table = pyarrow.Table.from_pydict(data)
+            self._writer = pyarrow.parquet.ParquetWriter(self._path, table.schema, compression="zstd")
+        else:
+            table = pyarrow.Table.from_pydict(data, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is None:
+            pyarrow.parquet.write_table(pyarrow.table({column: [] for column in self._columns}), self._path)
+        else:
+            self._writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "parquet": ParquetWriter}
+
+
+def load_watermarks(path: Optional[str]) -> Dict[str, str]:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as state_file:
+        return json.load(state_file)
+
+
+def save_watermarks(path: str, watermarks: Dict[str, str]) -> None:
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as state_file:
+        json.dump(watermarks, state_file, indent=2, sort_keys=True)
+    os.replace(temporary, path)
+
+
+class Exporter:
+    def __init__(self, pool: ConnectionPool, backend: Backend, chunk_size: int = 50000, settle_seconds: int = 300):
+        self.pool = pool
+        self.backend = backend
+        self.chunk_size = chunk_size
+        # Rows stamped this recently may belong to transactions that have not committed or replicated yet.
+        self.settle_seconds = settle_seconds
+
+    def _cutoff(self, connection, watermark_type: str) -> str:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {self.backend.now() if watermark_type == 'datetime' else self.backend.today()}")
+        value = cursor.fetchone()[0]
+        cursor.close()
+
+        if watermark_type == "date":
+            return _watermark_value(value if isinstance(value, datetime.date) else datetime.date.fromisoformat(value))
+        now = value if isinstance(value, datetime.datetime) else datetime.datetime.fromisoformat(value)
+        return _watermark_value(now - datetime.timedelta(seconds=self.settle_seconds))
+
+    def export(self, table: str, output_dir: str, file_format: str = "csv",
+               since: Optional[str] = None) -> ExportResult:
+        if file_format == "parquet" and pyarrow is None:
+            raise RuntimeError("Parquet export requires pyarrow. Install it or use --format csv.")
+        writer_class = WRITERS[file_format]
+
+        query, watermark_column, watermark_type = EXPORT_TABLES[table]
+        stamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+        path = os.path.join(output_dir, f"{table}_{stamp}.{writer_class.extension}")
+        # A retry on the primary after a replica failure starts the file again.
+        def write(connection) -> Tuple[int, Optional[str]]:
+            statement = query
+            params: List[Any] = []
+            cutoff = None
+            if watermark_column:
+                cutoff = self._cutoff(connection, watermark_type)
+                if since:
+                    statement += f" WHERE {watermark_column} >= %s AND {watermark_column} < %s"
+                    params = [since, cutoff]
+                else:
+                    statement += f" WHERE {watermark_column} < %s"
+                    params = [cutoff]
+            if "{appointments}" in statement:
+                statement, params = all_appointments(statement, params)
+
+            cursor = connection.cursor(buffered=False)
+            cursor.execute(statement, params)
+            columns = list(cursor.column_names)
+            rows_written = 0
+
+            writer = writer_class(path, columns)
+            try:
+                while True:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+
+                    writer.write(rows)
+                    rows_written += len(rows)
+            finally:
+                writer.close()
+                cursor.close()
+            return rows_written, cutoff
+
+        rows_written, cutoff = self.pool.read(write)
+        return ExportResult(table, path, rows_written, cutoff)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream appointments, medical records, prescriptions and medications to compressed files.")
+    parser.add_argument("--tables", default=",".join(EXPORT_TABLES), help="Comma-separated tables to export")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--output-dir", default="exports")
+    parser.add_argument("--state", help="JSON file holding the watermark of each table; only newer rows are exported")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--settle-seconds", type=int, default=300,
+                        help="Leave appointments changed this recently for the next run")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    from hospital_management import HospitalManagementSystem
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database, pool_size=1)
+    exporter = Exporter(hospital_system.pool, hospital_system.backend, chunk_size=args.chunk_size,
+                        settle_seconds=args.settle_seconds)
+    watermarks = load_watermarks(args.state)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    for table in args.tables.split(","):
+        try:
+            result = exporter.export(table, args.output_dir, args.format, since=watermarks.get(watermark_key(table)))
+        except Error as e:
+            print(f"Error exporting {table}: {e}")
+            continue
+
+        print(f"{table}: {result.rows} rows written to {result.path}")
+        if result.watermark:
+            watermarks[watermark_key(table)] = result.watermark
+
+    if args.state:
+        save_watermarks(args.state, watermarks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+import argparse
+import dataclasses
+import datetime
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from connection_pool import ConnectionPool
+from medical_history import (AppointmentEntry, MedicalHistoryBuilder, MedicalRecordEntry, PatientHistory, PrescriptionEntry,
+                             age_on, slice_history)
+from statement_cache import HISTORY_VERSION, StatementCache
+
+
+# Stored with every snapshot. Bump it whenever the PatientHistory fields or their encoding change, so snapshots
+# written by an older version are rebuilt instead of misread.
+SNAPSHOT_FORMAT = 1
+
+
+def _encode(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot store {type(value).__name__} in a history snapshot")
+
+
+def _date(value: Optional[str]) -> Optional[datetime.date]:
+    return datetime.date.fromisoformat(value) if value else None
+
+
+def serialize(history: PatientHistory) -> bytes:
+    return zlib.compress(json.dumps(dataclasses.asdict(history), default=_encode, separators=(",", ":")).encode(), 1)
+
+
+def deserialize(snapshot: bytes) -> PatientHistory:
+    data = json.loads(zlib.decompress(snapshot))
+    records = []
+    for record in data.pop("records"):
+        prescriptions = [
+            PrescriptionEntry(**dict(prescription, start_date=_date(prescription["start_date"]),
+                                     end_date=_date(prescription["end_date"])))
+            for prescription in record.pop("prescriptions")
+        ]
+        records.append(MedicalRecordEntry(**dict(record, date=_date(record["date"]), prescriptions=prescriptions)))
+    appointments = [
+        AppointmentEntry(**dict(appointment, date_time=datetime.datetime.fromisoformat(appointment["date_time"])))
+        for appointment in data.pop("appointments")
+    ]
+    return PatientHistory(**dict(data, date_of_birth=_date(data["date_of_birth"]), records=records,
+                                 appointments=appointments))
+
+
+class SnapshotStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(snapshot)")]
+        if columns and "format" not in columns:
+            # Stores from before SNAPSHOT_FORMAT hold pickled snapshots, which are never loaded.
+            self._connection.execute("DROP TABLE snapshot")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS snapshot (
+                patientID TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                format INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )
+        """)
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def get(self, patient_id: str, version: int) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM snapshot WHERE patientID = ? AND version = ? AND format = ?",
+                (patient_id, version, SNAPSHOT_FORMAT)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, patient_id: str, version: int, snapshot: bytes) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshot (patientID, version, format, data) VALUES (?, ?, ?, ?)",
+                (patient_id, version, SNAPSHOT_FORMAT, snapshot)
+            )
+            self._connection.commit()
+
+    def delete(self, patient_id: Optional[str] = None) -> None:
+        with self._lock:
+            if patient_id is None:
+                self._connection.execute("DELETE FROM snapshot")
+            else:
+                self._connection.execute("DELETE FROM snapshot WHERE patientID = ?", (patient_id,))
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM snapshot").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class HistoryCache:
+    def __init__(self, pool: ConnectionPool, builder: MedicalHistoryBuilder, statements: Optional[StatementCache] = None,
+                 max_bytes: int = 64 * 1024 * 1024, store_path: Optional[str] = None):
+        self.pool = pool
+        self.builder = builder
+        self.statements = statements or builder.statements
+        self.max_bytes = max_bytes
+        self.store = SnapshotStore(store_path) if store_path else None
+
+        self._snapshots: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _versions(self, patient_ids: List[str]) -> Dict[str, int]:
+        def fetch(connection):
+            if len(patient_ids) == 1:
+                row = self.statements.fetchone(connection, HISTORY_VERSION, patient_ids)
+                return {patient_ids[0]: row[0]} if row else {}
+
+            versions = {}
+            cursor = connection.cursor()
+            for start in range(0, len(patient_ids), self.builder.chunk_size):
+                chunk = patient_ids[start:start + self.builder.chunk_size]
+                cursor.execute(
+                    f"SELECT patientID, version FROM PATIENT_HISTORY_VERSION WHERE patientID IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+                versions.update(cursor.fetchall())
+            cursor.close()
+            return versions
+
+        return self.pool.read(fetch, primary=True)
+
+    def _remember(self, patient_id: str, version: int, snapshot: bytes) -> None:
+        with self._lock:
+            previous = self._snapshots.pop(patient_id, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            if len(snapshot) > self.max_bytes:
+                return
+
+            self._snapshots[patient_id] = (version, snapshot)
+            self._bytes += len(snapshot)
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._snapshots.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def _lookup(self, patient_id: str, version: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._snapshots.get(patient_id)
+            if entry is not None and entry[0] == version:
+                self._snapshots.move_to_end(patient_id)
+                self.hits += 1
+                return entry[1]
+
+        snapshot = self.store.get(patient_id, version) if self.store is not None else None
+        if snapshot is not None:
+            self._remember(patient_id, version, snapshot)
+            with self._lock:
+                self.store_hits += 1
+        return snapshot
+
+    def get(self, patient_id: str, start_date: Optional[str] = None,
+            end_date: Optional[str] = None) -> Optional[PatientHistory]:
+        return self.get_many([patient_id], start_date, end_date).get(patient_id)
+
+    def get_many(self, patient_ids: Iterable[str], start_date: Optional[str] = None,
+                 end_date: Optional[str] = None) -> Dict[str, PatientHistory]:
+        patient_ids = list(dict.fromkeys(patient_ids))
+        if not patient_ids:
+            return {}
+
+        # Read versions before building, so a change made during the build leaves the snapshot already stale.
+        versions = self._versions(patient_ids)
+        histories: Dict[str, PatientHistory] = {}
+        missing = []
+
+        for patient_id in patient_ids:
+            # Triggers give every patient a version row, so a missing row means the patient does not exist.
+            snapshot = self._lookup(patient_id, versions[patient_id]) if patient_id in versions else None
+            if snapshot is None:
+                missing.append(patient_id)
+            else:
+                histories[patient_id] = deserialize(snapshot)
+
+        if missing:
+            with self._lock:
+                self.misses += len(missing)
+            for patient_id, history in self.builder.build(missing, primary=True).items():
+                histories[patient_id] = history
+                if patient_id not in versions:
+                    continue
+                snapshot = serialize(history)
+                self._remember(patient_id, versions[patient_id], snapshot)
+                if self.store is not None:
+                    self.store.put(patient_id, versions[patient_id], snapshot)
+
+        today = datetime.date.today()
+        results = {}
+        for patient_id in patient_ids:
+            history = histories.get(patient_id)
+            if history is None:
+                continue
+            history.age = age_on(history.date_of_birth, today) if history.date_of_birth else 0
+            results[patient_id] = slice_history(history, start_date, end_date)
+        return results
+
+    def invalidate(self, patient_id: Optional[str] = None) -> None:
+        with self._lock:
+            if patient_id is None:
+                self._snapshots.clear()
+                self._bytes = 0
+            else:
+                entry = self._snapshots.pop(patient_id, None)
+                if entry is not None:
+                    self._bytes -= len(entry[1])
+        if self.store is not None:
+            self.store.delete(patient_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "snapshots": len(self._snapshots),
+                "bytes": self._bytes,
+            }
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show a patient's medical history through the snapshot cache.")
+    parser.add_argument("patient_id")
+    parser.add_argument("--start-date")
+    parser.add_argument("--end-date")
+    parser.add_argument("--store", help="On-disk snapshot store, kept between runs")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    from hospital_management import HospitalManagementSystem
+    from medical_history import render_medical_history
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database, history_store=args.store)
+
+    start = time.perf_counter()
+    history = hospital_system.get_patient_medical_history(args.patient_id, args.start_date, args.end_date)
+    elapsed = time.perf_counter() - start
+    if history is None:
+        print("Invalid patient ID. Please check and try again.")
+        raise SystemExit(1)
+
+    render_medical_history(history)
+    source = "snapshot store" if hospital_system.history_cache.stats()["store_hits"] else "database"
+    print(f"\nLoaded from {source} in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,79 @@
-import mysql.connector
 from mysql.connector import Error
 import datetime
+import itertools
 import sys
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+from archive import AppointmentArchiver
+from availability_index import AvailabilityIndex
+from backends import Backend, MySQLBackend, SQLiteBackend
+from booking import ConcurrentBooker
+from bulk_import import BookingRequest, BulkScheduleReport, bulk_schedule_appointments
+from bulk_reassign import BulkReassignmentReport, bulk_reassign_doctors
+from connection_pool import ConnectionPool
+from history_cache import HistoryCache
+from instrumentation import QueryMetrics
+from listings import ListingService
+from medical_history import MedicalHistoryBuilder, age_on, PatientHistory, render_medical_history
+from models import (AppointmentConfirmation, AppointmentSummary, ConflictError, DepartmentAssignment,
+                    HospitalError, NotFoundError, PatientMatch, SlotOption)
+from patient_analytics import PatientAnalytics
+from patient_search import PatientSearch
+from recurring import RecurrenceRule, SeriesReport, schedule_appointment_series
+from reference_cache import ReferenceCache
+from replication import Replica, RoutingPool
+from sequence_allocator import SequenceAllocator
+from slot_finder import WORKING_DAYS, SlotFinder
+from statement_cache import APPOINTMENT_INSERT, PATIENT_EXISTS, StatementCache
+from utilization import UtilizationSummary
 
 class HospitalManagementSystem:
-    def __init__(self, host: str, user: str, password: str, database: str):
+    def __init__(self, host: str = "localhost", user: str = "root", password: str = "",
+                 database: str = "hospital_management", pool_size: int = 5,
+                 backend: Optional[Backend] = None, metrics: Optional[QueryMetrics] = None,
+                 concurrent_booking: bool = True, replicas: Optional[List[Backend]] = None,
+                 read_strategy: str = "round_robin", max_replica_lag: float = 5.0,
+                 history_cache_bytes: int = 64 * 1024 * 1024, history_store: Optional[str] = None):
+        self.backend = backend or MySQLBackend(host, user, password, database)
+        self.metrics = metrics
+
+        connect = metrics.wrap(self.backend.connect) if metrics else self.backend.connect
+        self.pool = ConnectionPool(connect, size=pool_size)
+        if replicas:
+            self.pool = RoutingPool(self.pool, [
+                Replica(f"{replica.name} {index + 1}",
+                        ConnectionPool(metrics.wrap(replica.connect) if metrics else replica.connect, size=pool_size),
+                        replica)
+                for index, replica in enumerate(replicas)
+            ], strategy=read_strategy, max_lag=max_replica_lag)
+        self.statements = StatementCache()
+        self.availability = AvailabilityIndex(self.pool)
+        self.sequences = SequenceAllocator(self.pool, self.backend)
+        self.archiver = AppointmentArchiver(self.pool, self.sequences)
+        self.history_builder = MedicalHistoryBuilder(self.pool, self.statements)
+        self.history_cache = HistoryCache(self.pool, self.history_builder, max_bytes=history_cache_bytes,
+                                          store_path=history_store)
+        self.listings = ListingService(self.pool, self.backend)
+        self.reference = ReferenceCache(self.pool)
+        self.analytics = PatientAnalytics(self.pool)
+        self.patient_search = PatientSearch(self.pool)
+        self.utilization = UtilizationSummary(self.pool)
+        self.booker = ConcurrentBooker(self) if concurrent_booking else None
+        self.slot_finder = SlotFinder(self.availability, self.reference)
+
         try:
-            self.connection = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database
-            )
-            print("MySQL connection established successfully!")
+            with self.pool.connection(write=False):
+                pass
+            print(f"{self.backend.name} connection established successfully!")
+            self.utilization.refresh()
         except Error as e:
-            print(f"Error connecting to MySQL: {e}")
+            print(f"Error connecting to {self.backend.name}: {e}")
             sys.exit(1)
 
     def __del__(self):
-        if hasattr(self, 'connection') and self.connection.is_connected():
-            self.connection.close()
-            print("MySQL connection closed.")
+        if hasattr(self, 'pool'):
+            self.pool.close()
+            print(f"{self.backend.name} connection pool closed.")
 
     def calculate_age(self, date_of_birth: str) -> int:
         if not date_of_birth:
@@ -43,11 +95,7 @@ class HospitalManagementSystem:
 
     def is_valid_patient(self, patient_id: str) -> bool:
         try:
-            cursor = self.connection.cursor()
-            query = "SELECT COUNT(*) FROM PATIENT WHERE patientID = %s"
-            cursor.execute(query, (patient_id,))
-            result = cursor.fetchone()
-            cursor.close()
+            result = self.pool.read(lambda connection: self.statements.fetchone(connection, PATIENT_EXISTS, (patient_id,)))
             return result[0] > 0
         except Error as e:
             print(f"Error checking patient: {e}")
@@ -55,115 +103,95 @@ class HospitalManagementSystem:
 
     def is_valid_doctor(self, doctor_id: str) -> bool:
         try:
-            cursor = self.connection.cursor()
-            query = "SELECT COUNT(*) FROM DOCTOR WHERE doctorID = %s"
-            cursor.execute(query, (doctor_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            return result[0] > 0
+            return self.reference.contains("doctors", doctor_id)
         except Error as e:
             print(f"Error checking doctor: {e}")
             return False
 
     def is_valid_department(self, department_id: str) -> bool:
         try:
-            cursor = self.connection.cursor()
-            query = "SELECT COUNT(*) FROM DEPARTMENT WHERE deptID = %s"
-            cursor.execute(query, (department_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            return result[0] > 0
+            return self.reference.contains("departments", department_id)
         except Error as e:
             print(f"Error checking department: {e}")
             return False
 
     def is_doctor_available(self, doctor_id: str, date_time: str, duration: int) -> bool:
         try:
-            cursor = self.connection.cursor()
-            query = """
-                SELECT COUNT(*) FROM APPOINTMENT
-                WHERE doctorID = %s AND status = 'Scheduled' AND
-                ((dateTime <= %s AND DATE_ADD(dateTime, INTERVAL duration MINUTE) > %s) OR
-                (dateTime < DATE_ADD(%s, INTERVAL %s MINUTE) AND dateTime >= %s))
-            """
-            cursor.execute(query, (doctor_id, date_time, date_time, date_time, duration, date_time))
-            result = cursor.fetchone()
-            cursor.close()
-            return result[0] == 0
+            start = datetime.datetime.strptime(date_time, "%Y-%m-%d %H:%M:%S")
+            return self.availability.is_doctor_available(doctor_id, start, duration)
+        except ValueError:
+            print(f"Invalid date/time: {date_time}")
+            return False
         except Error as e:
             print(f"Error checking doctor availability: {e}")
             return False
 
     def find_available_room(self, preferred_room: str, date_time: str, duration: int, doctor_id: str) -> Optional[str]:
         try:
-            cursor = self.connection.cursor()
-
-            dept_query = "SELECT departmentID FROM DOCTOR WHERE doctorID = %s"
-            cursor.execute(dept_query, (doctor_id,))
-            dept_result = cursor.fetchone()
+            start = datetime.datetime.strptime(date_time, "%Y-%m-%d %H:%M:%S")
 
-            if not dept_result:
-                cursor.close()
+            doctor = self.reference.get("doctors", doctor_id)
+            if not doctor:
                 return None
 
-            department_id = dept_result[0]
-
-            if preferred_room:
-                preferred_query = """
-                    SELECT r.roomNumber FROM ROOM r
-                    LEFT JOIN APPOINTMENT a ON r.roomNumber = a.roomNumber AND
-                    a.status = 'Scheduled' AND
-                    ((a.dateTime <= %s AND DATE_ADD(a.dateTime, INTERVAL a.duration MINUTE) > %s) OR
-                    (a.dateTime < DATE_ADD(%s, INTERVAL %s MINUTE) AND a.dateTime >= %s))
-                    WHERE r.roomNumber = %s AND r.status = 'Available' AND r.departmentID = %s
-                    GROUP BY r.roomNumber
-                    HAVING COUNT(a.appointmentID) = 0
-                """
-                cursor.execute(preferred_query, (date_time, date_time, date_time, duration, date_time, preferred_room, department_id))
-                preferred_result = cursor.fetchone()
-
-                if preferred_result:
-                    room_number = preferred_result[0]
-                    cursor.close()
-                    return room_number
-
-            any_room_query = """
-                SELECT r.roomNumber FROM ROOM r
-                LEFT JOIN APPOINTMENT a ON r.roomNumber = a.roomNumber AND
-                a.status = 'Scheduled' AND
-                ((a.dateTime <= %s AND DATE_ADD(a.dateTime, INTERVAL a.duration MINUTE) > %s) OR
-                (a.dateTime < DATE_ADD(%s, INTERVAL %s MINUTE) AND a.dateTime >= %s))
-                WHERE r.status = 'Available' AND r.departmentID = %s
-                GROUP BY r.roomNumber
-                HAVING COUNT(a.appointmentID) = 0
-                LIMIT 1
-            """
-            cursor.execute(any_room_query, (date_time, date_time, date_time, duration, date_time, department_id))
-            any_room_result = cursor.fetchone()
-
-            cursor.close()
-            return any_room_result[0] if any_room_result else None
+            return self.availability.find_room(doctor['departmentID'], preferred_room, start, duration)
 
+        except ValueError:
+            print(f"Invalid date/time: {date_time}")
+            return None
         except Error as e:
             print(f"Error finding available room: {e}")
             return None
 
+    def find_available_slots(self, duration: int, start_date: datetime.date, end_date: datetime.date,
+                             doctor_id: Optional[str] = None, specialization: Optional[str] = None,
+                             department_id: Optional[str] = None, limit: int = 10, preferred_room: str = "",
+                             day_start: datetime.time = datetime.time(8), day_end: datetime.time = datetime.time(17),
+                             step: int = 15, working_days: Tuple[int, ...] = WORKING_DAYS) -> List[SlotOption]:
+        return self.slot_finder.find(duration, start_date, end_date, doctor_id, specialization, department_id,
+                                     limit, preferred_room, day_start, day_end, step, working_days)
+
     def generate_unique_id(self, table: str, id_field: str, prefix: str) -> str:
-        try:
-            cursor = self.connection.cursor()
-            query = f"SELECT MAX(CAST(SUBSTRING({id_field}, {len(prefix) + 1}) AS UNSIGNED)) FROM {table}"
-            cursor.execute(query)
-            result = cursor.fetchone()
-            cursor.close()
+        return self.sequences.next_id(table, id_field, prefix)
 
-            max_id = 0
-            if result[0] is not None:
-                max_id = result[0]
+    def book_appointment(self, patient_id: str, doctor_id: str, date_time: datetime.datetime, duration: int,
+                         appointment_type: str, preferred_room: str = "", notes: str = "") -> AppointmentConfirmation:
+        if self.booker:
+            return self.booker.book(patient_id, doctor_id, date_time, duration, appointment_type, preferred_room, notes)
 
-            return f"{prefix}{max_id + 1:03d}"
-        except Error as e:
-            print(f"Error generating unique ID: {e}")
-            return f"{prefix}001"
+        if not self.availability.is_doctor_available(doctor_id, date_time, duration):
+            raise ConflictError("Doctor is not available at the requested time.")
+
+        doctor = self.reference.get("doctors", doctor_id)
+        if not doctor:
+            raise NotFoundError("Invalid doctor ID. Please check and try again.")
+
+        room_number = self.availability.find_room(doctor['departmentID'], preferred_room, date_time, duration)
+        if not room_number:
+            raise ConflictError("No suitable room available at the requested time.")
+
+        appointment_id = self.generate_unique_id("APPOINTMENT", "appointmentID", "APP")
+
+        with self.pool.connection() as connection:
+            self.statements.execute(connection, APPOINTMENT_INSERT, (
+                appointment_id, date_time, duration, "Scheduled", appointment_type, notes, patient_id, doctor_id, room_number
+            ))
+            connection.commit()
+
+        self.availability.add(appointment_id, doctor_id, room_number, date_time, duration)
+        self.utilization.record_appointment(room_number, date_time, duration)
+
+        return AppointmentConfirmation(appointment_id, room_number, date_time, duration)
+
+    def schedule_appointment(self, patient_id: str, doctor_id: str, date_time: datetime.datetime, duration: int,
+                             appointment_type: str, preferred_room: str = "", notes: str = "") -> AppointmentConfirmation:
+        if not self.is_valid_patient(patient_id):
+            raise NotFoundError("Invalid patient ID. Please check and try again.")
+
+        if not self.is_valid_doctor(doctor_id):
+            raise NotFoundError("Invalid doctor ID. Please check and try again.")
+
+        return self.book_appointment(patient_id, doctor_id, date_time, duration, appointment_type, preferred_room, notes)
 
     def schedule_patient_appointment(self) -> None:
         try:
@@ -175,215 +203,118 @@ class HospitalManagementSystem:
             appointment_type = input("Enter Appointment Type: ")
             preferred_room = input("Enter Preferred Room Number (or leave blank): ")
 
-            if not self.is_valid_patient(patient_id):
-                print("Invalid patient ID. Please check and try again.")
-                return
-
-            if not self.is_valid_doctor(doctor_id):
-                print("Invalid doctor ID. Please check and try again.")
-                return
-
-            date_time = f"{date_str} {time_str}:00"
-
-            if not self.is_doctor_available(doctor_id, date_time, duration):
-                print("Doctor is not available at the requested time.")
-                return
-
-            room_number = self.find_available_room(preferred_room, date_time, duration, doctor_id)
-            if not room_number:
-                print("No suitable room available at the requested time.")
-                return
-
-            appointment_id = self.generate_unique_id("APPOINTMENT", "appointmentID", "APP")
-
-            cursor = self.connection.cursor()
-            status = "Scheduled"
-            notes = ""
-
-            insert_query = """
-                INSERT INTO APPOINTMENT (appointmentID, dateTime, duration, status, type, notes, patientID, doctorID, roomNumber)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(insert_query, (appointment_id, date_time, duration, status, appointment_type, notes, patient_id, doctor_id, room_number))
-            self.connection.commit()
+            date_time = datetime.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+            confirmation = self.schedule_appointment(patient_id, doctor_id, date_time, duration, appointment_type, preferred_room)
 
             print("\nAppointment scheduled successfully!")
-            print(f"Appointment ID: {appointment_id}")
-            print(f"Room Number: {room_number}")
-            print(f"Date/Time: {date_time}")
-
-            cursor.close()
+            print(f"Appointment ID: {confirmation.appointment_id}")
+            print(f"Room Number: {confirmation.room_number}")
+            print(f"Date/Time: {confirmation.date_time}")
 
+        except HospitalError as e:
+            print(e)
         except Error as e:
             print(f"Error scheduling appointment: {e}")
         except Exception as e:
             print(f"Error: {e}")
 
+    def schedule_appointment_series(self, patient_id: str, doctor_id: str, rule: RecurrenceRule, appointment_type: str,
+                                    preferred_room: str = "", notes: str = "", all_or_nothing: bool = False) -> SeriesReport:
+        return schedule_appointment_series(self, patient_id, doctor_id, rule, appointment_type, preferred_room, notes,
+                                           all_or_nothing)
+
+    def bulk_schedule_appointments(self, bookings: List[BookingRequest], chunk_size: int = 500) -> BulkScheduleReport:
+        return bulk_schedule_appointments(self, bookings, chunk_size=chunk_size)
+
+    def get_patient_medical_history(self, patient_id: str, start_date: Optional[str] = None,
+                                    end_date: Optional[str] = None) -> Optional[PatientHistory]:
+        return self.history_cache.get(patient_id, start_date, end_date)
+
+    def get_patient_medical_histories(self, patient_ids: List[str], start_date: Optional[str] = None,
+                                      end_date: Optional[str] = None) -> Dict[str, PatientHistory]:
+        return self.history_cache.get_many(patient_ids, start_date, end_date)
+
     def generate_patient_medical_history(self) -> None:
         try:
             patient_id = input("Enter Patient ID: ")
             start_date = input("Enter Start Date (YYYY-MM-DD) or leave blank for all: ")
             end_date = input("Enter End Date (YYYY-MM-DD) or leave blank for all: ")
 
-            if not self.is_valid_patient(patient_id):
+            history = self.get_patient_medical_history(patient_id, start_date, end_date)
+            if history is None:
                 print("Invalid patient ID. Please check and try again.")
                 return
 
-            cursor = self.connection.cursor(dictionary=True)
-
-            patient_query = "SELECT * FROM PATIENT WHERE patientID = %s"
-            cursor.execute(patient_query, (patient_id,))
-            patient_info = cursor.fetchone()
-
-            print("\n===== PATIENT INFORMATION =====")
-            print(f"Patient ID: {patient_info['patientID']}")
-            print(f"Name: {patient_info['name']}")
-            print(f"Date of Birth: {patient_info['dateOfBirth']}")
-
-            age = self.calculate_age(str(patient_info['dateOfBirth']))
-            print(f"Age: {age}")
-
-            address_parts = []
-            if patient_info['street_number']:
-                address_parts.append(patient_info['street_number'])
-            if patient_info['street_name']:
-                address_parts.append(patient_info['street_name'])
-            if patient_info['apt_number']:
-                address_parts.append(f"Apt {patient_info['apt_number']}")
-            if patient_info['city']:
-                address_parts.append(patient_info['city'])
-            if patient_info['state']:
-                address_parts.append(patient_info['state'])
-            if patient_info['zip_code']:
-                address_parts.append(patient_info['zip_code'])
-            if patient_info['country']:
-                address_parts.append(patient_info['country'])
-
-            address = ", ".join(address_parts)
-            print(f"Address: {address}")
-            print(f"Insurance: {patient_info['insuranceInfo']}")
-
-            phone_query = "SELECT patientPhoneNumber FROM PATIENT_PHONE_NUMBERS WHERE patientID = %s"
-            cursor.execute(phone_query, (patient_id,))
-            phone_numbers = cursor.fetchall()
-
-            print("\n===== PATIENT PHONE NUMBERS =====")
-            for phone in phone_numbers:
-                print(f"Phone: {phone['patientPhoneNumber']}")
-
-            record_query = "SELECT * FROM MEDICAL_RECORD WHERE patientID = %s"
-            params = [patient_id]
-
-            if start_date and end_date:
-                record_query += " AND date BETWEEN %s AND %s"
-                params.extend([start_date, end_date])
-            elif start_date:
-                record_query += " AND date >= %s"
-                params.append(start_date)
-            elif end_date:
-                record_query += " AND date <= %s"
-                params.append(end_date)
-
-            record_query += " ORDER BY date DESC"
-            cursor.execute(record_query, params)
-            medical_records = cursor.fetchall()
-
-            print("\n===== MEDICAL RECORDS =====")
-
-            for record in medical_records:
-                record_id = record['recordID']
-                print(f"\nRecord ID: {record_id}")
-                print(f"Date: {record['date']}")
-                print(f"Diagnosis: {record['diagnosis']}")
-                print(f"Treatment: {record['treatment']}")
-                print(f"Notes: {record['note']}")
-
-                prescription_query = """
-                    SELECT p.prescriptionNumber, p.dosage, p.frequency, p.startDate, p.endDate,
-                           m.medicationID, m.name, m.type, m.unit
-                    FROM PRESCRIPTION p
-                    JOIN MEDICATION m ON p.medicationID = m.medicationID
-                    WHERE p.recordID = %s
-                """
-                cursor.execute(prescription_query, (record_id,))
-                prescriptions = cursor.fetchall()
-
-                print("  --- Prescriptions ---")
-                for prescription in prescriptions:
-                    print(f"  Prescription #: {prescription['prescriptionNumber']}")
-                    print(f"  Medication: {prescription['name']} ({prescription['type']})")
-                    print(f"  Dosage: {prescription['dosage']} {prescription['unit']}")
-                    print(f"  Frequency: {prescription['frequency']}")
-                    print(f"  Duration: {prescription['startDate']} to {prescription['endDate']}")
-                    print()
-
-            cursor.close()
+            render_medical_history(history)
 
         except Error as e:
             print(f"Error generating patient medical history: {e}")
         except Exception as e:
             print(f"Error: {e}")
 
-    def manage_department_staff_assignment(self) -> None:
-        try:
-            department_id = input("Enter Department ID: ")
-            doctor_id = input("Enter Doctor ID: ")
-
-            if not self.is_valid_department(department_id):
-                print("Invalid department ID. Please check and try again.")
-                return
-
-            if not self.is_valid_doctor(doctor_id):
-                print("Invalid doctor ID. Please check and try again.")
-                return
-
-            cursor = self.connection.cursor(dictionary=True)
-
-            head_check_query = "SELECT headDoctor FROM DEPARTMENT WHERE deptID = %s"
-            cursor.execute(head_check_query, (department_id,))
-            head_check_result = cursor.fetchone()
-
-            if head_check_result and doctor_id == head_check_result['headDoctor']:
-                print("Cannot reassign department head. Please choose another doctor.")
-                cursor.close()
-                return
-
-            appointment_check_query = """
+    def upcoming_appointment_count(self, doctor_id: str) -> int:
+        with self.pool.connection(write=False) as connection:
+            cursor = connection.cursor(dictionary=True)
+            appointment_check_query = f"""
                 SELECT COUNT(*) AS count FROM APPOINTMENT
-                WHERE doctorID = %s AND dateTime > NOW() AND status = 'Scheduled'
+                WHERE doctorID = %s AND dateTime > {self.backend.now()} AND status = 'Scheduled'
             """
             cursor.execute(appointment_check_query, (doctor_id,))
             appointment_check_result = cursor.fetchone()
+            cursor.close()
 
-            if appointment_check_result and appointment_check_result['count'] > 0:
-                count = appointment_check_result['count']
-                print(f"Doctor has {count} upcoming appointments. Cannot reassign department.")
-                print("Please reschedule or cancel these appointments first.")
-                cursor.close()
-                return
+        return appointment_check_result['count'] if appointment_check_result else 0
 
+    def reassign_doctor(self, doctor_id: str, department_id: str) -> DepartmentAssignment:
+        if not self.is_valid_department(department_id):
+            raise NotFoundError("Invalid department ID. Please check and try again.")
+
+        doctor = self.reference.get("doctors", doctor_id)
+        if not doctor:
+            raise NotFoundError("Invalid doctor ID. Please check and try again.")
+
+        department = self.reference.get("departments", department_id)
+        if doctor_id == department['headDoctor']:
+            raise ConflictError("Cannot reassign department head. Please choose another doctor.")
+
+        count = self.upcoming_appointment_count(doctor_id)
+        if count > 0:
+            raise ConflictError(f"Doctor has {count} upcoming appointments. Cannot reassign department.\n"
+                                "Please reschedule or cancel these appointments first.")
+
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
             update_query = "UPDATE DOCTOR SET departmentID = %s WHERE doctorID = %s"
             cursor.execute(update_query, (department_id, doctor_id))
-            self.connection.commit()
+            connection.commit()
+            updated = cursor.rowcount > 0
+            cursor.close()
 
-            if cursor.rowcount > 0:
-                print("Doctor successfully assigned to the new department!")
+        self.reference.invalidate("doctors", doctor_id)
 
-                confirm_query = """
-                    SELECT d.name AS doctor_name, dept.name AS dept_name
-                    FROM DOCTOR d JOIN DEPARTMENT dept ON d.departmentID = dept.deptID
-                    WHERE d.doctorID = %s
-                """
-                cursor.execute(confirm_query, (doctor_id,))
-                confirm_result = cursor.fetchone()
+        if not updated:
+            raise HospitalError("Assignment failed. Please try again.")
 
-                if confirm_result:
-                    print(f"Dr. {confirm_result['doctor_name']} now assigned to {confirm_result['dept_name']} department.")
-            else:
-                print("Assignment failed. Please try again.")
+        self.utilization.move_doctor(doctor['departmentID'], department_id)
+        doctor = self.reference.get("doctors", doctor_id)
+        return DepartmentAssignment(doctor_id, doctor['name'], department_id, department['name'])
 
-            cursor.close()
+    def bulk_reassign_doctors(self, assignments: Dict[str, str], chunk_size: int = 500,
+                              dry_run: bool = False) -> BulkReassignmentReport:
+        return bulk_reassign_doctors(self, assignments, chunk_size=chunk_size, dry_run=dry_run)
 
+    def manage_department_staff_assignment(self) -> None:
+        try:
+            department_id = input("Enter Department ID: ")
+            doctor_id = input("Enter Doctor ID: ")
+
+            assignment = self.reassign_doctor(doctor_id, department_id)
+
+            print("Doctor successfully assigned to the new department!")
+            print(f"Dr. {assignment.doctor_name} now assigned to {assignment.department_name} department.")
+
+        except HospitalError as e:
+            print(e)
         except Error as e:
             print(f"Error managing department assignment: {e}")
         except Exception as e:
@@ -391,12 +322,10 @@ class HospitalManagementSystem:
 
     def list_patients(self) -> None:
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            query = "SELECT patientID, name, dateOfBirth, CONCAT(city, ', ', state) AS location FROM PATIENT ORDER BY name"
-            cursor.execute(query)
-            patients = cursor.fetchall()
+            patients = self.listings.iter_patients()
+            first = next(patients, None)
 
-            if not patients:
+            if first is None:
                 print("No patients found in the database.")
                 return
 
@@ -404,29 +333,48 @@ class HospitalManagementSystem:
             print(f"{'ID':<10} {'Name':<30} {'Date of Birth':<15} {'Age':<5} {'Location':<30}")
             print("-" * 90)
 
-            for patient in patients:
-                age = self.calculate_age(str(patient['dateOfBirth']))
+            today = datetime.date.today()
+            total = 0
+            for patient in itertools.chain([first], patients):
+                age = age_on(patient['dateOfBirth'], today) if patient['dateOfBirth'] else 0
                 print(f"{patient['patientID']:<10} {patient['name']:<30} {patient['dateOfBirth']!s:<15} {age:<5} {patient['location']:<30}")
+                total += 1
 
-            print(f"\nTotal patients: {len(patients)}")
-            cursor.close()
+            print(f"\nTotal patients: {total}")
 
         except Error as e:
             print(f"Error listing patients: {e}")
 
+    def search_patients(self, query: str, limit: int = 10) -> List[PatientMatch]:
+        return self.patient_search.search(query, limit)
+
+    def find_patient(self) -> None:
+        try:
+            query = input("Enter part of the patient's name or city: ").strip()
+            if not query:
+                print("Please enter something to search for.")
+                return
+
+            matches = self.search_patients(query)
+            if not matches:
+                print("No matching patients found.")
+                return
+
+            print("\n===== MATCHING PATIENTS =====")
+            print(f"{'ID':<10} {'Name':<30} {'City':<20} {'Match':<6}")
+            print("-" * 70)
+            for match in matches:
+                print(f"{match.patient_id:<10} {match.name:<30} {match.city:<20} {match.score:<6.0%}")
+
+        except Error as e:
+            print(f"Error searching patients: {e}")
+
     def list_doctors(self) -> None:
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            query = """
-                SELECT d.doctorID, d.name, d.specialization, dept.name AS department
-                FROM DOCTOR d
-                JOIN DEPARTMENT dept ON d.departmentID = dept.deptID
-                ORDER BY d.name
-            """
-            cursor.execute(query)
-            doctors = cursor.fetchall()
+            doctors = self.listings.iter_doctors()
+            first = next(doctors, None)
 
-            if not doctors:
+            if first is None:
                 print("No doctors found in the database.")
                 return
 
@@ -434,32 +382,19 @@ class HospitalManagementSystem:
             print(f"{'ID':<10} {'Name':<30} {'Specialization':<25} {'Department':<20}")
             print("-" * 85)
 
-            for doctor in doctors:
+            total = 0
+            for doctor in itertools.chain([first], doctors):
                 print(f"{doctor['doctorID']:<10} {doctor['name']:<30} {doctor['specialization']:<25} {doctor['department']:<20}")
+                total += 1
 
-            print(f"\nTotal doctors: {len(doctors)}")
-            cursor.close()
+            print(f"\nTotal doctors: {total}")
 
         except Error as e:
             print(f"Error listing doctors: {e}")
 
     def list_departments(self) -> None:
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            query = """
-                SELECT d.deptID, d.name, d.location,
-                       doc.name AS head_doctor,
-                       COUNT(r.roomNumber) AS room_count,
-                       COUNT(doc2.doctorID) AS doctor_count
-                FROM DEPARTMENT d
-                LEFT JOIN DOCTOR doc ON d.headDoctor = doc.doctorID
-                LEFT JOIN ROOM r ON d.deptID = r.departmentID
-                LEFT JOIN DOCTOR doc2 ON d.deptID = doc2.departmentID
-                GROUP BY d.deptID
-                ORDER BY d.name
-            """
-            cursor.execute(query)
-            departments = cursor.fetchall()
+            departments = self.utilization.departments()
 
             if not departments:
                 print("No departments found in the database.")
@@ -470,27 +405,19 @@ class HospitalManagementSystem:
             print("-" * 99)
 
             for dept in departments:
-                print(f"{dept['deptID']:<10} {dept['name']:<25} {dept['location']:<25} {dept['head_doctor'] or 'None':<25} {dept['room_count']:<7} {dept['doctor_count']:<7}")
+                print(f"{dept.dept_id:<10} {dept.name:<25} {dept.location:<25} {dept.head_doctor or 'None':<25} {dept.room_count:<7} {dept.doctor_count:<7}")
 
             print(f"\nTotal departments: {len(departments)}")
-            cursor.close()
 
         except Error as e:
             print(f"Error listing departments: {e}")
 
     def list_rooms(self) -> None:
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            query = """
-                SELECT r.roomNumber, r.type, r.capacity, r.status, d.name AS department
-                FROM ROOM r
-                JOIN DEPARTMENT d ON r.departmentID = d.deptID
-                ORDER BY r.roomNumber
-            """
-            cursor.execute(query)
-            rooms = cursor.fetchall()
+            rooms = self.listings.iter_rooms()
+            first = next(rooms, None)
 
-            if not rooms:
+            if first is None:
                 print("No rooms found in the database.")
                 return
 
@@ -498,7 +425,8 @@ class HospitalManagementSystem:
             print(f"{'Room #':<10} {'Type':<20} {'Capacity':<10} {'Status':<15} {'Department':<25}")
             print("-" * 80)
 
-            for room in rooms:
+            total = 0
+            for room in itertools.chain([first], rooms):
                 status_display = room['status']
                 if status_display == 'Available':
                     status_display = 'Available'
@@ -508,25 +436,33 @@ class HospitalManagementSystem:
                     status_display = 'Maintenance'
 
                 print(f"{room['roomNumber']:<10} {room['type']:<20} {room['capacity']:<10} {status_display:<15} {room['department']:<25}")
+                total += 1
 
-            print(f"\nTotal rooms: {len(rooms)}")
-
-            cursor.execute("SELECT status, COUNT(*) as count FROM ROOM GROUP BY status")
-            status_summary = cursor.fetchall()
+            print(f"\nTotal rooms: {total}")
 
             print("\nRoom Status Summary:")
-            for status in status_summary:
-                print(f"  {status['status']}: {status['count']}")
-
-            cursor.close()
+            for status, count in sorted(self.utilization.room_status_totals().items()):
+                print(f"  {status}: {count}")
 
         except Error as e:
             print(f"Error listing rooms: {e}")
 
+    def upcoming_appointments(self, doctor_id: Optional[str] = None, patient_id: Optional[str] = None,
+                              today_only: bool = False) -> Iterator[AppointmentSummary]:
+        for appt in self.listings.iter_appointments(doctor_id=doctor_id, patient_id=patient_id, today_only=today_only):
+            yield AppointmentSummary(
+                appointment_id=appt['appointmentID'],
+                date_time=appt['dateTime'],
+                duration=appt['duration'],
+                status=appt['status'],
+                appointment_type=appt['type'],
+                patient_name=appt['patient_name'],
+                doctor_name=appt['doctor_name'],
+                room_number=appt['roomNumber']
+            )
+
     def list_appointments(self) -> None:
         try:
-            cursor = self.connection.cursor(dictionary=True)
-
             print("\n===== APPOINTMENTS =====")
             print("Filter by:")
             print("1. All upcoming appointments")
@@ -537,54 +473,37 @@ class HospitalManagementSystem:
 
             choice = int(input("Enter your choice: "))
 
-            query = """
-                SELECT a.appointmentID, a.dateTime, a.duration, a.status, a.type,
-                       p.name AS patient_name, d.name AS doctor_name, a.roomNumber
-                FROM APPOINTMENT a
-                JOIN PATIENT p ON a.patientID = p.patientID
-                JOIN DOCTOR d ON a.doctorID = d.doctorID
-                WHERE
-            """
+            doctor_id = None
+            patient_id = None
 
-            params = []
-
-            if choice == 1:
-                query += "a.dateTime >= NOW() AND a.status = 'Scheduled'"
-            elif choice == 2:
-                query += "DATE(a.dateTime) = CURDATE() AND a.status = 'Scheduled'"
-            elif choice == 3:
+            if choice == 3:
                 doctor_id = input("Enter Doctor ID: ")
-                query += "a.doctorID = %s AND a.dateTime >= NOW() AND a.status = 'Scheduled'"
-                params.append(doctor_id)
             elif choice == 4:
                 patient_id = input("Enter Patient ID: ")
-                query += "a.patientID = %s AND a.dateTime >= NOW() AND a.status = 'Scheduled'"
-                params.append(patient_id)
             elif choice == 5:
                 return
-            else:
+            elif choice not in (1, 2):
                 print("Invalid choice. Returning to main menu.")
                 return
 
-            query += " ORDER BY a.dateTime"
-
-            cursor.execute(query, params)
-            appointments = cursor.fetchall()
+            appointments = self.upcoming_appointments(doctor_id=doctor_id, patient_id=patient_id, today_only=choice == 2)
+            first = next(appointments, None)
 
-            if not appointments:
+            if first is None:
                 print("No appointments found matching the criteria.")
                 return
 
             print(f"\n{'ID':<10} {'Date/Time':<20} {'Duration':<10} {'Status':<12} {'Type':<15} {'Patient':<25} {'Doctor':<25} {'Room':<10}")
             print("-" * 127)
 
-            for appt in appointments:
-                formatted_date = appt['dateTime'].strftime('%Y-%m-%d %H:%M')
-                duration_str = f"{appt['duration']} min"
-                print(f"{appt['appointmentID']:<10} {formatted_date:<20} {duration_str:<10} {appt['status']:<12} {appt['type']:<15} {appt['patient_name']:<25} {appt['doctor_name']:<25} {appt['roomNumber']:<10}")
+            total = 0
+            for appt in itertools.chain([first], appointments):
+                formatted_date = appt.date_time.strftime('%Y-%m-%d %H:%M')
+                duration_str = f"{appt.duration} min"
+                print(f"{appt.appointment_id:<10} {formatted_date:<20} {duration_str:<10} {appt.status:<12} {appt.appointment_type:<15} {appt.patient_name:<25} {appt.doctor_name:<25} {appt.room_number:<10}")
+                total += 1
 
-            print(f"\nTotal appointments: {len(appointments)}")
-            cursor.close()
+            print(f"\nTotal appointments: {total}")
 
         except Error as e:
             print(f"Error listing appointments: {e}")
@@ -598,16 +517,17 @@ class HospitalManagementSystem:
             print("1. Schedule Patient Appointment")
             print("2. Generate Patient Medical History")
             print("3. List Patients")
+            print("4. Find Patient")
             print("\n=== Staff Management ===")
-            print("4. Manage Department Staff Assignment")
-            print("5. List Doctors")
+            print("5. Manage Department Staff Assignment")
+            print("6. List Doctors")
             print("\n=== Resource Management ===")
-            print("6. List Departments")
-            print("7. List Rooms")
+            print("7. List Departments")
+            print("8. List Rooms")
             print("\n=== Appointments ===")
-            print("8. List Appointments")
+            print("9. List Appointments")
             print("\n=== System ===")
-            print("9. Exit")
+            print("10. Exit")
             print("\n")
 
             try:
@@ -620,16 +540,18 @@ class HospitalManagementSystem:
                 elif choice == 3:
                     self.list_patients()
                 elif choice == 4:
-                    self.manage_department_staff_assignment()
+                    self.find_patient()
                 elif choice == 5:
-                    self.list_doctors()
+                    self.manage_department_staff_assignment()
                 elif choice == 6:
-                    self.list_departments()
+                    self.list_doctors()
                 elif choice == 7:
-                    self.list_rooms()
+                    self.list_departments()
                 elif choice == 8:
-                    self.list_appointments()
+                    self.list_rooms()
                 elif choice == 9:
+                    self.list_appointments()
+                elif choice == 10:
                     print("Exiting application. Goodbye!")
                     break
                 else:
@@ -643,12 +565,27 @@ def main():
     print("Hospital Management System")
     print("=========================")
 
-    host = input("Enter database host (default: localhost): ") or "localhost"
-    user = input("Enter database user (default: root): ") or "root"
-    password = input("Enter database password: ")
-    database = input("Enter database name (default: hospital_management): ") or "hospital_management"
-
-    hospital_system = HospitalManagementSystem(host, user, password, database)
+    backend_name = input("Enter database backend, mysql or sqlite (default: mysql): ").strip().lower() or "mysql"
+
+    if backend_name == "sqlite":
+        path = input("Enter SQLite database file (default: in-memory sample database): ")
+        backend = SQLiteBackend(path or ":memory:", load_sample_data=not path)
+        replica_count = input("Enter number of read-only replica connections (default: 0): ")
+        replicas = [backend.replica() for _ in range(int(replica_count or 0))]
+    else:
+        host = input("Enter database host (default: localhost): ") or "localhost"
+        user = input("Enter database user (default: root): ") or "root"
+        password = input("Enter database password: ")
+        database = input("Enter database name (default: hospital_management): ") or "hospital_management"
+        backend = MySQLBackend(host, user, password, database)
+        replica_hosts = input("Enter replica hosts as host[:port], comma-separated (default: none): ")
+        replicas = []
+        for replica_host in filter(None, (entry.strip() for entry in replica_hosts.split(","))):
+            replica_name, _, port = replica_host.partition(":")
+            options = {"port": int(port)} if port else {}
+            replicas.append(MySQLBackend(replica_name, user, password, database, **options))
+
+    hospital_system = HospitalManagementSystem(backend=backend, replicas=replicas)
     hospital_system.run()
 
 
@@ -0,0 +1,316 @@
+import bisect
+import datetime
+import functools
+import hashlib
+import inspect
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Frames that only run a query or callback on someone else's behalf are skipped when naming the calling method.
+HELPER_MODULES = frozenset({"instrumentation", "statement_cache", "connection_pool", "replication", "contextlib"})
+HELPER_FUNCTIONS = frozenset({"booking.with_retries"})
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_PLACEHOLDER_ROWS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = normalized.replace("%s", "?")
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _PLACEHOLDER_LIST.sub("(?+)", normalized)
+    return _PLACEHOLDER_ROWS.sub("(?+)", normalized)
+
+
+@functools.lru_cache(maxsize=1024)
+def statement_id(fingerprint_text: str) -> str:
+    return hashlib.md5(fingerprint_text.encode()).hexdigest()[:12]
+
+
+def _is_helper(frame) -> bool:
+    module = frame.f_globals.get("__name__")
+    code = frame.f_code
+    if module in HELPER_MODULES or f"{module}.{code.co_name}" in HELPER_FUNCTIONS:
+        return True
+    # Query blocks passed to pool.read are nested functions; the method that defines them is the caller.
+    if code.co_flags & inspect.CO_NESTED:
+        return True
+    return code.co_name.startswith("_") and not code.co_name.startswith("__")
+
+
+def _caller() -> str:
+    frame = sys._getframe(2)
+    while frame.f_back is not None and _is_helper(frame):
+        frame = frame.f_back
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+@dataclass
+class StatementStats:
+    fingerprint: str
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    slow: int = 0
+
+
+@dataclass
+class MethodStats:
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    calls: int = 0
+    seconds: float = 0.0
+    slow: int = 0
+
+
+class QueryMetrics:
+    def __init__(self, slow_threshold: float = 0.5, sample_rate: float = 1.0,
+                 slow_log_path: Optional[str] = None):
+        self.slow_threshold = slow_threshold
+        self.sample_rate = sample_rate
+        self.slow_log_path = slow_log_path
+
+        self._statements: Dict[Tuple[str, str], StatementStats] = {}
+        self._methods: Dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+        self._slow_log_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(self, statement: str, caller: str, seconds: float, rows: int) -> None:
+        text = fingerprint(statement)
+        slow = seconds >= self.slow_threshold
+
+        with self._lock:
+            stats = self._statements.get((caller, text))
+            if stats is None:
+                stats = self._statements[(caller, text)] = StatementStats(text)
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+
+            method = self._methods.get(caller)
+            if method is None:
+                method = self._methods[caller] = MethodStats()
+            method.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            method.calls += 1
+            method.seconds += seconds
+
+            if slow:
+                stats.slow += 1
+                method.slow += 1
+
+        if slow and self.slow_log_path:
+            self._log_slow(text, caller, seconds, rows)
+
+    def _log_slow(self, text: str, caller: str, seconds: float, rows: int) -> None:
+        line = f"{datetime.datetime.now().isoformat(' ', 'seconds')}\t{seconds * 1000:.1f} ms\t{caller}\t{rows} rows\t{statement_id(text)}\t{text}\n"
+        with self._slow_log_lock:
+            with open(self.slow_log_path, "a") as slow_log:
+                slow_log.write(line)
+
+    def statements(self) -> List[Tuple[str, StatementStats]]:
+        with self._lock:
+            entries = [(caller, StatementStats(**vars(stats))) for (caller, _), stats in self._statements.items()]
+        return sorted(entries, key=lambda entry: entry[1].seconds, reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._methods.clear()
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            methods = {caller: MethodStats(list(stats.buckets), stats.calls, stats.seconds, stats.slow)
+                       for caller, stats in self._methods.items()}
+            statements = [(caller, StatementStats(**vars(stats))) for (caller, _), stats in self._statements.items()]
+
+        lines = [
+            "# HELP hospital_query_duration_seconds Statement latency by calling method.",
+            "# TYPE hospital_query_duration_seconds histogram",
+        ]
+        for caller, stats in sorted(methods.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'hospital_query_duration_seconds_bucket{{method="{caller}",le="{bound}"}} {cumulative}')
+            lines.append(f'hospital_query_duration_seconds_bucket{{method="{caller}",le="+Inf"}} {stats.calls}')
+            lines.append(f'hospital_query_duration_seconds_sum{{method="{caller}"}} {stats.seconds:.6f}')
+            lines.append(f'hospital_query_duration_seconds_count{{method="{caller}"}} {stats.calls}')
+
+        lines += [
+            "# HELP hospital_query_slow_total Statements slower than the slow-query threshold.",
+            "# TYPE hospital_query_slow_total counter",
+        ]
+        for caller, stats in sorted(methods.items()):
+            lines.append(f'hospital_query_slow_total{{method="{caller}"}} {stats.slow}')
+
+        lines += [
+            "# HELP hospital_statement_calls_total Executions per statement fingerprint.",
+            "# TYPE hospital_statement_calls_total counter",
+        ]
+        for caller, stats in statements:
+            lines.append(f'hospital_statement_calls_total{{method="{caller}",statement="{statement_id(stats.fingerprint)}"}} {stats.calls}')
+
+        lines += [
+            "# HELP hospital_statement_seconds_total Time spent per statement fingerprint.",
+            "# TYPE hospital_statement_seconds_total counter",
+        ]
+        for caller, stats in statements:
+            lines.append(f'hospital_statement_seconds_total{{method="{caller}",statement="{statement_id(stats.fingerprint)}"}} {stats.seconds:.6f}')
+
+        lines += [
+            "# HELP hospital_statement_rows_total Rows returned or affected per statement fingerprint.",
+            "# TYPE hospital_statement_rows_total counter",
+        ]
+        for caller, stats in statements:
+            lines.append(f'hospital_statement_rows_total{{method="{caller}",statement="{statement_id(stats.fingerprint)}"}} {stats.rows}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, "w") as metrics_file:
+            metrics_file.write(self.render_prometheus())
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def wrap(self, connect: Callable[[], Any]) -> Callable[[], "InstrumentedConnection"]:
+        def instrumented_connect() -> InstrumentedConnection:
+            return InstrumentedConnection(connect(), self)
+        return instrumented_connect
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, metrics: QueryMetrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._pending: Optional[List[Any]] = None
+
+    def _flush(self) -> None:
+        if self._pending is not None:
+            statement, caller, seconds, rows = self._pending
+            self._pending = None
+            self._metrics.record(statement, caller, seconds, rows)
+
+    def _track(self, statement: str, caller: str, seconds: float) -> None:
+        if self._cursor.description is None:
+            self._metrics.record(statement, caller, seconds, max(self._cursor.rowcount, 0))
+        else:
+            self._pending = [statement, caller, seconds, 0]
+
+    def execute(self, operation: str, params: Any = None):
+        self._flush()
+        if not self._metrics.sampled():
+            return self._cursor.execute(operation, params)
+
+        start = time.perf_counter()
+        result = self._cursor.execute(operation, params)
+        self._track(operation, _caller(), time.perf_counter() - start)
+        return result
+
+    def executemany(self, operation: str, seq_params: Sequence[Any]):
+        self._flush()
+        if not self._metrics.sampled():
+            return self._cursor.executemany(operation, seq_params)
+
+        start = time.perf_counter()
+        result = self._cursor.executemany(operation, seq_params)
+        self._track(operation, _caller(), time.perf_counter() - start)
+        return result
+
+    def _fetched(self, start: float, rows: int) -> None:
+        if self._pending is not None:
+            self._pending[2] += time.perf_counter() - start
+            self._pending[3] += rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        if row is None:
+            self._flush()
+        return row
+
+    def fetchmany(self, size: int = 1):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._fetched(start, len(rows))
+        if len(rows) < size:
+            self._flush()
+        return rows
+
+    def fetchall(self):
+        # Cached prepared cursors stay open between calls, so a drained result is recorded here, not on close.
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, len(rows))
+        self._flush()
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._flush()
+        return self._cursor.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, connection, metrics: QueryMetrics):
+        self._connection = connection
+        self._metrics = metrics
+
+    def cursor(self, *args, **kwargs) -> InstrumentedCursor:
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._metrics)
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
@@ -0,0 +1,151 @@
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from backends import Backend
+from connection_pool import ConnectionPool
+
+
+@dataclass
+class Page:
+    rows: List[Dict[str, Any]]
+    next_token: Optional[str]
+
+
+def encode_token(values: Sequence[Any]) -> str:
+    payload = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_token(token: str, size: int) -> List[str]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid resume token") from None
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid resume token")
+    return values
+
+
+class ListingService:
+    def __init__(self, pool: ConnectionPool, backend: Backend, page_size: int = 500):
+        self.pool = pool
+        self.backend = backend
+        self.page_size = page_size
+
+    def _page(self, select: str, conditions: List[str], params: List[Any], key_columns: List[str],
+              key_fields: List[str], page_size: Optional[int], resume_token: Optional[str]) -> Page:
+        page_size = page_size or self.page_size
+        conditions = list(conditions)
+        params = list(params)
+
+        if resume_token:
+            columns = ", ".join(key_columns)
+            placeholders = ", ".join(["%s"] * len(key_columns))
+            conditions.append(f"({columns}) > ({placeholders})")
+            params.extend(decode_token(resume_token, len(key_columns)))
+
+        query = select
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {', '.join(key_columns)} LIMIT %s"
+        params.append(page_size)
+
+        def fetch(connection):
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            cursor.execute(query, params)
+            rows = [row for row in cursor]
+            cursor.close()
+            return rows
+
+        rows = self.pool.read(fetch)
+
+        next_token = None
+        if len(rows) == page_size:
+            next_token = encode_token([rows[-1][key_field] for key_field in key_fields])
+
+        return Page(rows, next_token)
+
+    def _iterate(self, fetch_page, page_size: Optional[int], resume_token: Optional[str]) -> Iterator[Dict[str, Any]]:
+        while True:
+            page = fetch_page(page_size=page_size, resume_token=resume_token)
+            yield from page.rows
+            if page.next_token is None:
+                return
+            resume_token = page.next_token
+
+    def patients_page(self, page_size: Optional[int] = None, resume_token: Optional[str] = None) -> Page:
+        location = self.backend.concat("city", "', '", "state")
+        return self._page(
+            f"SELECT patientID, name, dateOfBirth, {location} AS location FROM PATIENT",
+            [], [], ["name", "patientID"], ["name", "patientID"], page_size, resume_token
+        )
+
+    def iter_patients(self, page_size: Optional[int] = None, resume_token: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return self._iterate(self.patients_page, page_size, resume_token)
+
+    def doctors_page(self, page_size: Optional[int] = None, resume_token: Optional[str] = None) -> Page:
+        return self._page(
+            """
+                SELECT d.doctorID, d.name, d.specialization, dept.name AS department
+                FROM DOCTOR d
+                JOIN DEPARTMENT dept ON d.departmentID = dept.deptID
+            """,
+            [], [], ["d.name", "d.doctorID"], ["name", "doctorID"], page_size, resume_token
+        )
+
+    def iter_doctors(self, page_size: Optional[int] = None, resume_token: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return self._iterate(self.doctors_page, page_size, resume_token)
+
+    def rooms_page(self, page_size: Optional[int] = None, resume_token: Optional[str] = None) -> Page:
+        return self._page(
+            """
+                SELECT r.roomNumber, r.type, r.capacity, r.status, d.name AS department
+                FROM ROOM r
+                JOIN DEPARTMENT d ON r.departmentID = d.deptID
+            """,
+            [], [], ["r.roomNumber"], ["roomNumber"], page_size, resume_token
+        )
+
+    def iter_rooms(self, page_size: Optional[int] = None, resume_token: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return self._iterate(self.rooms_page, page_size, resume_token)
+
+    def appointments_page(self, doctor_id: Optional[str] = None, patient_id: Optional[str] = None,
+                          today_only: bool = False, page_size: Optional[int] = None,
+                          resume_token: Optional[str] = None) -> Page:
+        conditions = ["a.status = 'Scheduled'"]
+        params = []
+
+        if today_only:
+            today = self.backend.today()
+            conditions.append(f"a.dateTime >= {today} AND a.dateTime < {self.backend.add_days(today, '1')}")
+        else:
+            conditions.append(f"a.dateTime >= {self.backend.now()}")
+
+        if doctor_id:
+            conditions.append("a.doctorID = %s")
+            params.append(doctor_id)
+
+        if patient_id:
+            conditions.append("a.patientID = %s")
+            params.append(patient_id)
+
+        return self._page(
+            """
+                SELECT a.appointmentID, a.dateTime, a.duration, a.status, a.type,
+                       p.name AS patient_name, d.name AS doctor_name, a.roomNumber
+                FROM APPOINTMENT a
+                JOIN PATIENT p ON a.patientID = p.patientID
+                JOIN DOCTOR d ON a.doctorID = d.doctorID
+            """,
+            conditions, params, ["a.dateTime", "a.appointmentID"], ["dateTime", "appointmentID"], page_size, resume_token
+        )
+
+    def iter_appointments(self, doctor_id: Optional[str] = None, patient_id: Optional[str] = None,
+                          today_only: bool = False, page_size: Optional[int] = None,
+                          resume_token: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        def fetch_page(page_size, resume_token):
+            return self.appointments_page(doctor_id, patient_id, today_only, page_size, resume_token)
+
+        return self._iterate(fetch_page, page_size, resume_token)
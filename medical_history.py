@@ -0,0 +1,280 @@
+import dataclasses
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from archive import all_appointments
+from connection_pool import ConnectionPool
+from statement_cache import StatementCache
+
+ADDRESS_FIELDS = ["street_number", "street_name", "apt_number", "city", "state", "zip_code", "country"]
+
+
+@dataclass
+class PrescriptionEntry:
+    prescription_number: str
+    medication_id: str
+    medication_name: str
+    medication_type: str
+    dosage: str
+    unit: str
+    frequency: str
+    start_date: datetime.date
+    end_date: datetime.date
+
+
+@dataclass
+class MedicalRecordEntry:
+    record_id: str
+    date: datetime.date
+    diagnosis: str
+    treatment: Optional[str]
+    note: Optional[str]
+    prescriptions: List[PrescriptionEntry] = field(default_factory=list)
+
+
+@dataclass
+class AppointmentEntry:
+    appointment_id: str
+    date_time: datetime.datetime
+    duration: int
+    status: str
+    appointment_type: str
+    doctor_name: str
+    room_number: str
+
+
+@dataclass
+class PatientHistory:
+    patient_id: str
+    name: str
+    date_of_birth: datetime.date
+    age: int
+    address: str
+    insurance: Optional[str]
+    phone_numbers: List[str] = field(default_factory=list)
+    records: List[MedicalRecordEntry] = field(default_factory=list)
+    appointments: List[AppointmentEntry] = field(default_factory=list)
+
+
+def age_on(date_of_birth: datetime.date, today: datetime.date) -> int:
+    age = today.year - date_of_birth.year
+    if (today.month, today.day) < (date_of_birth.month, date_of_birth.day):
+        age -= 1
+    return age
+
+
+def format_address(patient: Dict[str, Any]) -> str:
+    address_parts = []
+    for address_field in ADDRESS_FIELDS:
+        if patient[address_field]:
+            if address_field == "apt_number":
+                address_parts.append(f"Apt {patient[address_field]}")
+            else:
+                address_parts.append(patient[address_field])
+    return ", ".join(address_parts)
+
+
+def _date_filter(column: str, start_date: Optional[str], end_date: Optional[str]) -> Tuple[str, List[str]]:
+    if start_date and end_date:
+        return f" AND {column} BETWEEN %s AND %s", [start_date, end_date]
+    if start_date:
+        return f" AND {column} >= %s", [start_date]
+    if end_date:
+        return f" AND {column} <= %s", [end_date]
+    return "", []
+
+
+def _datetime_filter(column: str, start_date: Optional[str], end_date: Optional[str]) -> Tuple[str, List[datetime.datetime]]:
+    # A range on the column itself, rather than DATE(column), so the dateTime index can be used.
+    clause, params = "", []
+    if start_date:
+        clause += f" AND {column} >= %s"
+        params.append(datetime.datetime.combine(datetime.date.fromisoformat(start_date), datetime.time()))
+    if end_date:
+        clause += f" AND {column} < %s"
+        params.append(datetime.datetime.combine(datetime.date.fromisoformat(end_date) + datetime.timedelta(days=1), datetime.time()))
+    return clause, params
+
+
+def slice_history(history: PatientHistory, start_date: Optional[str] = None,
+                  end_date: Optional[str] = None) -> PatientHistory:
+    if not start_date and not end_date:
+        return history
+
+    start = datetime.date.fromisoformat(start_date) if start_date else datetime.date.min
+    end = datetime.date.fromisoformat(end_date) if end_date else datetime.date.max
+    return dataclasses.replace(
+        history,
+        records=[record for record in history.records if start <= record.date <= end],
+        appointments=[appointment for appointment in history.appointments if start <= appointment.date_time.date() <= end]
+    )
+
+
+class MedicalHistoryBuilder:
+    def __init__(self, pool: ConnectionPool, statements: Optional[StatementCache] = None, chunk_size: int = 1000):
+        self.pool = pool
+        self.statements = statements or StatementCache()
+        self.chunk_size = chunk_size
+
+    def build(self, patient_ids: Iterable[str], start_date: Optional[str] = None,
+              end_date: Optional[str] = None, primary: bool = False) -> Dict[str, PatientHistory]:
+        patient_ids = list(dict.fromkeys(patient_ids))
+        histories: Dict[str, PatientHistory] = {}
+
+        for start in range(0, len(patient_ids), self.chunk_size):
+            histories.update(self._build_chunk(patient_ids[start:start + self.chunk_size], start_date, end_date, primary))
+
+        return histories
+
+    def build_one(self, patient_id: str, start_date: Optional[str] = None,
+                  end_date: Optional[str] = None) -> Optional[PatientHistory]:
+        return self.build([patient_id], start_date, end_date).get(patient_id)
+
+    def _fetchall(self, connection, query: str, params: List[Any], prepared: bool) -> List[Dict[str, Any]]:
+        if prepared:
+            return self.statements.fetchall(connection, query, params, dictionary=True)
+
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def _build_chunk(self, patient_ids: List[str], start_date: Optional[str],
+                     end_date: Optional[str], primary: bool) -> Dict[str, PatientHistory]:
+        placeholders = ", ".join(["%s"] * len(patient_ids))
+        date_clause, date_params = _date_filter("r.date", start_date, end_date)
+        today = datetime.date.today()
+        # Only the single-patient statements are prepared. Preparing one per chunk length would push the
+        # fixed hot-path statements out of the per-connection statement cache.
+        prepared = len(patient_ids) == 1
+
+        def fetch(connection):
+            patients = self._fetchall(
+                connection, f"SELECT * FROM PATIENT WHERE patientID IN ({placeholders})", patient_ids, prepared
+            )
+
+            phone_numbers = self._fetchall(connection, f"""
+                SELECT patientID, patientPhoneNumber FROM PATIENT_PHONE_NUMBERS
+                WHERE patientID IN ({placeholders})
+            """, patient_ids, prepared)
+
+            records = self._fetchall(connection, f"""
+                SELECT r.recordID, r.date, r.diagnosis, r.treatment, r.note, r.patientID
+                FROM MEDICAL_RECORD r
+                WHERE r.patientID IN ({placeholders}){date_clause}
+                ORDER BY r.patientID, r.date DESC
+            """, patient_ids + date_params, prepared)
+
+            prescriptions = self._fetchall(connection, f"""
+                SELECT p.recordID, p.prescriptionNumber, p.dosage, p.frequency, p.startDate, p.endDate,
+                       m.medicationID, m.name, m.type, m.unit
+                FROM PRESCRIPTION p
+                JOIN MEDICAL_RECORD r ON p.recordID = r.recordID
+                JOIN MEDICATION m ON p.medicationID = m.medicationID
+                WHERE r.patientID IN ({placeholders}){date_clause}
+            """, patient_ids + date_params, prepared)
+
+            appointment_clause, appointment_params = _datetime_filter("a.dateTime", start_date, end_date)
+            appointment_query, appointment_params = all_appointments(f"""
+                SELECT a.appointmentID, a.dateTime, a.duration, a.status, a.type, a.patientID, a.roomNumber,
+                       d.name AS doctor_name
+                FROM {{appointments}} a
+                JOIN DOCTOR d ON a.doctorID = d.doctorID
+                WHERE a.patientID IN ({placeholders}){appointment_clause}
+            """, patient_ids + appointment_params)
+            appointments = self._fetchall(connection, appointment_query + "ORDER BY patientID, dateTime DESC",
+                                          appointment_params, prepared)
+            return patients, phone_numbers, records, prescriptions, appointments
+
+        patients, phone_numbers, records, prescriptions, appointments = self.pool.read(fetch, primary=primary)
+
+        histories: Dict[str, PatientHistory] = {}
+        for patient in patients:
+            histories[patient['patientID']] = PatientHistory(
+                patient_id=patient['patientID'],
+                name=patient['name'],
+                date_of_birth=patient['dateOfBirth'],
+                age=age_on(patient['dateOfBirth'], today) if patient['dateOfBirth'] else 0,
+                address=format_address(patient),
+                insurance=patient['insuranceInfo']
+            )
+
+        for phone in phone_numbers:
+            histories[phone['patientID']].phone_numbers.append(phone['patientPhoneNumber'])
+
+        records_by_id: Dict[str, MedicalRecordEntry] = {}
+        for record in records:
+            entry = MedicalRecordEntry(
+                record_id=record['recordID'],
+                date=record['date'],
+                diagnosis=record['diagnosis'],
+                treatment=record['treatment'],
+                note=record['note']
+            )
+            records_by_id[entry.record_id] = entry
+            histories[record['patientID']].records.append(entry)
+
+        for prescription in prescriptions:
+            records_by_id[prescription['recordID']].prescriptions.append(PrescriptionEntry(
+                prescription_number=prescription['prescriptionNumber'],
+                medication_id=prescription['medicationID'],
+                medication_name=prescription['name'],
+                medication_type=prescription['type'],
+                dosage=prescription['dosage'],
+                unit=prescription['unit'],
+                frequency=prescription['frequency'],
+                start_date=prescription['startDate'],
+                end_date=prescription['endDate']
+            ))
+
+        for appointment in appointments:
+            histories[appointment['patientID']].appointments.append(AppointmentEntry(
+                appointment_id=appointment['appointmentID'],
+                date_time=appointment['dateTime'],
+                duration=appointment['duration'],
+                status=appointment['status'],
+                appointment_type=appointment['type'],
+                doctor_name=appointment['doctor_name'],
+                room_number=appointment['roomNumber']
+            ))
+
+        return histories
+
+
+def render_medical_history(history: PatientHistory) -> None:
+    print("\n===== PATIENT INFORMATION =====")
+    print(f"Patient ID: {history.patient_id}")
+    print(f"Name: {history.name}")
+    print(f"Date of Birth: {history.date_of_birth}")
+    print(f"Age: {history.age}")
+    print(f"Address: {history.address}")
+    print(f"Insurance: {history.insurance}")
+
+    print("\n===== PATIENT PHONE NUMBERS =====")
+    for phone in history.phone_numbers:
+        print(f"Phone: {phone}")
+
+    print("\n===== MEDICAL RECORDS =====")
+
+    for record in history.records:
+        print(f"\nRecord ID: {record.record_id}")
+        print(f"Date: {record.date}")
+        print(f"Diagnosis: {record.diagnosis}")
+        print(f"Treatment: {record.treatment}")
+        print(f"Notes: {record.note}")
+
+        print("  --- Prescriptions ---")
+        for prescription in record.prescriptions:
+            print(f"  Prescription #: {prescription.prescription_number}")
+            print(f"  Medication: {prescription.medication_name} ({prescription.medication_type})")
+            print(f"  Dosage: {prescription.dosage} {prescription.unit}")
+            print(f"  Frequency: {prescription.frequency}")
+            print(f"  Duration: {prescription.start_date} to {prescription.end_date}")
+            print()
+
+    print("\n===== APPOINTMENTS =====")
+    for appointment in history.appointments:
+        print(f"{appointment.date_time:%Y-%m-%d %H:%M}  {appointment.appointment_type:<15} {appointment.status:<10} "
+              f"Dr. {appointment.doctor_name}, room {appointment.room_number} ({appointment.duration} min)")
@@ -0,0 +1,110 @@
+import argparse
+import datetime
+import os
+from typing import Dict, List
+
+import mysql.connector
+from mysql.connector import Error
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database", "migrations")
+
+
+DIALECTS = ("mysql", "sqlite")
+
+
+def split_statements(sql: str) -> List[str]:
+    # "DELIMITER //" switches the separator, as in the mysql client, so trigger bodies can contain ";".
+    statements = []
+    delimiter = ";"
+    current: List[str] = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("--"):
+            continue
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split()[1]
+            continue
+        current.append(line)
+        if stripped.endswith(delimiter):
+            parts = "\n".join(current).split(delimiter)
+            statements.extend(part.strip() for part in parts if part.strip())
+            current = []
+    statements.extend(part.strip() for part in "\n".join(current).split(delimiter) if part.strip())
+    return statements
+
+
+def migration_files(directory: str = MIGRATIONS_DIR, dialect: str = "mysql") -> Dict[str, str]:
+    # A version is either one NNN_name.sql for every database, or NNN_name.mysql.sql plus NNN_name.sqlite.sql.
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".sql"):
+            continue
+        base, _, suffix = name[:-len(".sql")].rpartition(".")
+        if base and suffix in DIALECTS:
+            if suffix == dialect:
+                files[f"{base}.sql"] = name
+        else:
+            files[name] = name
+    return files
+
+
+def pending_migrations(connection, directory: str = MIGRATIONS_DIR, dialect: str = "mysql") -> List[str]:
+    cursor = connection.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SCHEMA_MIGRATIONS (
+            version VARCHAR(100) PRIMARY KEY,
+            appliedAt DATETIME NOT NULL
+        )
+    """)
+    cursor.execute("SELECT version FROM SCHEMA_MIGRATIONS")
+    applied = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+
+    return [version for version in sorted(migration_files(directory, dialect)) if version not in applied]
+
+
+def apply_migrations(connection, directory: str = MIGRATIONS_DIR, dialect: str = "mysql") -> List[str]:
+    applied = []
+    files = migration_files(directory, dialect)
+
+    for name in pending_migrations(connection, directory, dialect):
+        with open(os.path.join(directory, files[name])) as migration_file:
+            statements = split_statements(migration_file.read())
+
+        cursor = connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute("INSERT INTO SCHEMA_MIGRATIONS (version, appliedAt) VALUES (%s, %s)", (name, datetime.datetime.now()))
+        connection.commit()
+        cursor.close()
+
+        applied.append(name)
+
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending migrations from database/migrations in order.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    try:
+        connection = mysql.connector.connect(host=args.host, user=args.user, password=args.password, database=args.database)
+        applied = apply_migrations(connection)
+        connection.close()
+    except Error as e:
+        print(f"Error applying migrations: {e}")
+        raise SystemExit(1)
+
+    if applied:
+        for name in applied:
+            print(f"Applied {name}")
+    else:
+        print("Database is up to date.")
+
+
+if __name__ == "__main__":
+    main()
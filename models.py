@@ -0,0 +1,59 @@
+import datetime
+from dataclasses import dataclass
+
+
+class HospitalError(Exception):
+    pass
+
+
+class NotFoundError(HospitalError):
+    pass
+
+
+class ConflictError(HospitalError):
+    pass
+
+
+@dataclass
+class AppointmentConfirmation:
+    appointment_id: str
+    room_number: str
+    date_time: datetime.datetime
+    duration: int
+
+
+@dataclass
+class DepartmentAssignment:
+    doctor_id: str
+    doctor_name: str
+    department_id: str
+    department_name: str
+
+
+@dataclass
+class AppointmentSummary:
+    appointment_id: str
+    date_time: datetime.datetime
+    duration: int
+    status: str
+    appointment_type: str
+    patient_name: str
+    doctor_name: str
+    room_number: str
+
+
+@dataclass
+class SlotOption:
+    doctor_id: str
+    doctor_name: str
+    room_number: str
+    start: datetime.datetime
+    end: datetime.datetime
+
+
+@dataclass
+class PatientMatch:
+    patient_id: str
+    name: str
+    city: str
+    score: float
@@ -0,0 +1,209 @@
+import argparse
+import datetime
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from connection_pool import ConnectionPool
+
+AGE_BANDS = (0, 18, 30, 45, 65, 80)
+
+
+@dataclass
+class PatientColumns:
+    patient_ids: np.ndarray
+    birth_dates: np.ndarray
+    states: np.ndarray
+    state_codes: np.ndarray
+    cities: np.ndarray
+    city_codes: np.ndarray
+    insurers: np.ndarray
+    insurer_codes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.patient_ids)
+
+
+@dataclass
+class PopulationReport:
+    total: int
+    mean_age: float
+    median_age: float
+    age_bands: Dict[str, int]
+    by_state: Dict[str, int]
+    by_insurer: Dict[str, int]
+
+
+def _encode(values: List[Optional[str]], missing: str) -> Tuple[np.ndarray, np.ndarray]:
+    labels, codes = np.unique(np.array([value or missing for value in values], dtype=object), return_inverse=True)
+    return labels, codes.astype(np.int32)
+
+
+def insurer_name(insurance_info: Optional[str]) -> Optional[str]:
+    if not insurance_info:
+        return None
+    return insurance_info.split("#", 1)[0].strip() or None
+
+
+def ages_on(birth_dates: np.ndarray, today: datetime.date) -> np.ndarray:
+    known = ~np.isnat(birth_dates)
+    dates = np.where(known, birth_dates, np.datetime64(today, "D"))
+
+    years = dates.astype("datetime64[Y]").astype(np.int64)
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    days = (dates - dates.astype("datetime64[M]")).astype(np.int64)
+    month_day = (months - years * 12) * 100 + days
+
+    today_month_day = (today.month - 1) * 100 + today.day - 1
+    ages = (today.year - 1970) - years - (today_month_day < month_day)
+    return np.where(known, ages, 0)
+
+
+def band_labels(bands: Sequence[int]) -> List[str]:
+    labels = [f"{low}-{high - 1}" for low, high in zip(bands, bands[1:])]
+    labels.append(f"{bands[-1]}+")
+    return labels
+
+
+def band_counts(ages: np.ndarray, bands: Sequence[int]) -> Dict[str, int]:
+    indexes = np.searchsorted(np.asarray(bands), ages, side="right") - 1
+    counts = np.bincount(np.clip(indexes, 0, None), minlength=len(bands))
+    return dict(zip(band_labels(bands), (int(count) for count in counts)))
+
+
+def _counts(labels: np.ndarray, codes: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(codes, minlength=len(labels))
+    order = np.argsort(-counts, kind="stable")
+    return {str(labels[i]): int(counts[i]) for i in order if counts[i]}
+
+
+class PatientAnalytics:
+    def __init__(self, pool: ConnectionPool, ttl: float = 300.0, chunk_size: int = 10000):
+        self.pool = pool
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+
+        self._columns: Optional[PatientColumns] = None
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> PatientColumns:
+        def fetch(connection):
+            patient_ids, birth_dates, cities, states, insurers = [], [], [], [], []
+            cursor = connection.cursor(buffered=False)
+            cursor.execute("SELECT patientID, dateOfBirth, city, state, insuranceInfo FROM PATIENT")
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                for patient_id, date_of_birth, city, state, insurer in rows:
+                    patient_ids.append(patient_id)
+                    birth_dates.append(date_of_birth)
+                    cities.append(city)
+                    states.append(state)
+                    insurers.append(insurer_name(insurer))
+            cursor.close()
+            return patient_ids, birth_dates, cities, states, insurers
+
+        patient_ids, birth_dates, cities, states, insurers = self.pool.read(fetch)
+
+        state_labels, state_codes = _encode(states, "Unknown")
+        city_labels, city_codes = _encode(cities, "Unknown")
+        insurer_labels, insurer_codes = _encode(insurers, "Uninsured")
+
+        return PatientColumns(
+            patient_ids=np.array(patient_ids, dtype=object),
+            birth_dates=np.array(birth_dates, dtype="datetime64[D]"),
+            states=state_labels,
+            state_codes=state_codes,
+            cities=city_labels,
+            city_codes=city_codes,
+            insurers=insurer_labels,
+            insurer_codes=insurer_codes
+        )
+
+    def columns(self) -> PatientColumns:
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._columns = self._load()
+                self._loaded_at = time.monotonic()
+            return self._columns
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def ages(self, today: Optional[datetime.date] = None) -> np.ndarray:
+        return ages_on(self.columns().birth_dates, today or datetime.date.today())
+
+    def age_histogram(self, bands: Sequence[int] = AGE_BANDS, today: Optional[datetime.date] = None) -> Dict[str, int]:
+        return band_counts(self.ages(today), bands)
+
+    def counts_by_state(self) -> Dict[str, int]:
+        columns = self.columns()
+        return _counts(columns.states, columns.state_codes)
+
+    def counts_by_city(self) -> Dict[str, int]:
+        columns = self.columns()
+        return _counts(columns.cities, columns.city_codes)
+
+    def counts_by_insurer(self) -> Dict[str, int]:
+        columns = self.columns()
+        return _counts(columns.insurers, columns.insurer_codes)
+
+    def population_report(self, bands: Sequence[int] = AGE_BANDS, today: Optional[datetime.date] = None) -> PopulationReport:
+        ages = self.ages(today)
+        return PopulationReport(
+            total=len(ages),
+            mean_age=float(ages.mean()) if len(ages) else 0.0,
+            median_age=float(np.median(ages)) if len(ages) else 0.0,
+            age_bands=band_counts(ages, bands),
+            by_state=self.counts_by_state(),
+            by_insurer=self.counts_by_insurer()
+        )
+
+
+def render_population_report(report: PopulationReport) -> None:
+    print("\n===== PATIENT POPULATION =====")
+    print(f"Total patients: {report.total}")
+    print(f"Mean age: {report.mean_age:.1f}")
+    print(f"Median age: {report.median_age:.1f}")
+
+    print("\n===== AGE BANDS =====")
+    for band, count in report.age_bands.items():
+        print(f"{band:<10} {count}")
+
+    print("\n===== PATIENTS BY STATE =====")
+    for state, count in report.by_state.items():
+        print(f"{state:<25} {count}")
+
+    print("\n===== PATIENTS BY INSURER =====")
+    for insurer, count in report.by_insurer.items():
+        print(f"{insurer:<25} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print age bands and per-state and per-insurer patient counts.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    from hospital_management import HospitalManagementSystem
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database)
+
+    start = time.perf_counter()
+    report = hospital_system.analytics.population_report()
+    elapsed = time.perf_counter() - start
+
+    render_population_report(report)
+    print(f"\nReport built in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+import argparse
+import math
+import re
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from mysql.connector import Error
+
+from connection_pool import ConnectionPool
+from models import PatientMatch
+
+SEARCH_FIELDS = ("name", "city", "phone")
+
+_SEPARATORS = re.compile(r"[^0-9a-z]+")
+_NON_DIGITS = re.compile(r"\D+")
+
+PatientRow = Tuple[str, str, str, Tuple[str, ...]]
+
+
+def _word_trigrams(words: Iterable[str]) -> Set[str]:
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    return _word_trigrams(_SEPARATORS.sub(" ", (text or "").lower()).split())
+
+
+def digit_trigrams(values: Iterable[str]) -> Set[str]:
+    return _word_trigrams(digits for digits in (_NON_DIGITS.sub("", value or "") for value in values) if digits)
+
+
+def field_trigrams(field: str, name: str, city: str, phones: Sequence[str]) -> Set[str]:
+    if field == "name":
+        return trigrams(name)
+    if field == "city":
+        return trigrams(city)
+    return digit_trigrams(phones)
+
+
+class TrigramField:
+    def __init__(self):
+        self.postings: Dict[str, array] = {}
+        self.sizes = array("H")
+
+    def add(self, doc: int, grams: Set[str]) -> None:
+        self.sizes.append(min(len(grams), 0xFFFF))
+        for gram in grams:
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = array("i")
+            postings.append(doc)
+
+    def scores(self, grams: Set[str], count: int, min_similarity: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        lists = [np.frombuffer(self.postings[gram], dtype=np.int32) for gram in grams if gram in self.postings]
+        if not lists:
+            return None
+
+        # Similarity is at most shared / len(grams), so documents sharing fewer trigrams can never qualify.
+        shared = np.bincount(np.concatenate(lists), minlength=count)
+        docs = np.flatnonzero(shared >= max(1, math.ceil(min_similarity * len(grams))))
+        matched = shared[docs]
+        sizes = np.frombuffer(self.sizes, dtype=np.uint16)[docs]
+        return docs, matched / (len(grams) + sizes - matched)
+
+
+class TrigramIndex:
+    def __init__(self, fields: Sequence[str] = ("name", "city")):
+        self.fields = {field: TrigramField() for field in fields}
+        self.rows: List[Optional[PatientRow]] = []
+        self.docs: Dict[str, int] = {}
+        self.alive = bytearray()
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, patient_id: str, name: str, city: str, phones: Sequence[str] = ()) -> None:
+        self.remove(patient_id)
+
+        doc = len(self.rows)
+        self.rows.append((patient_id, name, city, tuple(phones)))
+        self.docs[patient_id] = doc
+        self.alive.append(1)
+        for field, index in self.fields.items():
+            index.add(doc, field_trigrams(field, name, city, phones))
+
+    def remove(self, patient_id: str) -> bool:
+        # Postings are append-only, so a removed patient stays in them until the index is compacted.
+        doc = self.docs.pop(patient_id, None)
+        if doc is None:
+            return False
+        self.rows[doc] = None
+        self.alive[doc] = 0
+        self.dead += 1
+        return True
+
+    def compacted(self) -> "TrigramIndex":
+        index = TrigramIndex(tuple(self.fields))
+        for row in self.rows:
+            if row is not None:
+                index.add(*row)
+        return index
+
+    def search(self, query: str, limit: int = 10, min_similarity: float = 0.2) -> List[PatientMatch]:
+        count = len(self.rows)
+        best = np.zeros(count, dtype=np.float64)
+
+        for field, index in self.fields.items():
+            grams = digit_trigrams([query]) if field == "phone" else trigrams(query)
+            scored = index.scores(grams, count, min_similarity) if grams else None
+            if scored is not None:
+                docs, scores = scored
+                best[docs] = np.maximum(best[docs], scores)
+
+        candidates = np.flatnonzero(best >= min_similarity)
+        candidates = candidates[np.frombuffer(self.alive, dtype=np.uint8)[candidates] == 1]
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-best[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-best[candidates], kind="stable")]
+
+        matches = []
+        for doc in candidates:
+            patient_id, name, city, _ = self.rows[doc]
+            matches.append(PatientMatch(patient_id, name, city, round(float(best[doc]), 4)))
+        return matches
+
+
+class PatientSearch:
+    def __init__(self, pool: ConnectionPool, fields: Sequence[str] = ("name", "city"), ttl: float = 300.0,
+                 chunk_size: int = 10000, compact_ratio: float = 0.25):
+        unknown = set(fields) - set(SEARCH_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown search fields: {', '.join(sorted(unknown))}")
+
+        self.pool = pool
+        self.fields = tuple(fields)
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self.compact_ratio = compact_ratio
+
+        self._index: Optional[TrigramIndex] = None
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._rebuilding = False
+        self._changes: Optional[List[Tuple[str, tuple]]] = None
+
+    def _phones(self, connection, patient_ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        phones: Dict[str, List[str]] = {}
+        if "phone" not in self.fields:
+            return phones
+
+        query = "SELECT patientID, patientPhoneNumber FROM PATIENT_PHONE_NUMBERS"
+        if patient_ids is not None:
+            query += f" WHERE patientID IN ({', '.join(['%s'] * len(patient_ids))})"
+
+        cursor = connection.cursor(buffered=False)
+        cursor.execute(query, patient_ids or ())
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            for patient_id, phone_number in rows:
+                phones.setdefault(patient_id, []).append(phone_number)
+        cursor.close()
+        return phones
+
+    def _load(self) -> TrigramIndex:
+        def fetch(connection):
+            index = TrigramIndex(self.fields)
+            phones = self._phones(connection)
+
+            cursor = connection.cursor(buffered=False)
+            cursor.execute("SELECT patientID, name, city FROM PATIENT")
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                for patient_id, name, city in rows:
+                    index.add(patient_id, name, city, phones.get(patient_id, ()))
+            cursor.close()
+            return index
+
+        return self.pool.read(fetch)
+
+    def _rebuild(self) -> None:
+        # The index is read without holding _lock so searches keep using the old one; edits made meanwhile are
+        # logged and replayed onto the new index before it is swapped in.
+        with self._lock:
+            self._changes = []
+        try:
+            index = self._load()
+        except Exception:
+            with self._lock:
+                self._changes = None
+            raise
+
+        with self._lock:
+            for change, args in self._changes:
+                if change == "add":
+                    index.add(*args)
+                else:
+                    index.remove(*args)
+            self._changes = None
+            self._index = index
+            self._loaded_at = time.monotonic()
+            self._compact_if_needed()
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            with self._build_lock:
+                self._rebuild()
+        except Error as e:
+            print(f"Error rebuilding patient search index: {e}")
+            with self._lock:
+                # Keep serving the old index and retry after another ttl instead of on every search.
+                self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._index is not None:
+                if time.monotonic() - self._loaded_at > self.ttl and not self._rebuilding:
+                    self._rebuilding = True
+                    threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+                return
+
+        with self._build_lock:
+            if self._index is None:
+                self._rebuild()
+
+    def _compact_if_needed(self) -> None:
+        index = self._index
+        if index.dead > 1000 and index.dead > self.compact_ratio * len(index.rows):
+            self._index = index.compacted()
+
+    def _add(self, patient_id: str, name: str, city: str, phones: Sequence[str]) -> None:
+        if self._changes is not None:
+            self._changes.append(("add", (patient_id, name, city, tuple(phones))))
+        if self._index is not None:
+            self._index.add(patient_id, name, city, phones)
+
+    def _remove(self, patient_id: str) -> bool:
+        if self._changes is not None:
+            self._changes.append(("remove", (patient_id,)))
+        return self._index is not None and self._index.remove(patient_id)
+
+    def search(self, query: str, limit: int = 10, min_similarity: float = 0.2) -> List[PatientMatch]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._index.search(query, limit, min_similarity)
+
+    def upsert(self, patient_id: str, name: str, city: str, phones: Sequence[str] = ()) -> None:
+        with self._lock:
+            if self._index is None and self._changes is None:
+                return
+            self._add(patient_id, name, city, phones)
+            if self._index is not None:
+                self._compact_if_needed()
+
+    def remove(self, patient_id: str) -> None:
+        with self._lock:
+            if self._remove(patient_id):
+                self._compact_if_needed()
+
+    def reload(self, patient_ids: List[str]) -> None:
+        patient_ids = list(dict.fromkeys(patient_ids))
+        if not patient_ids:
+            return
+
+        with self._lock:
+            if self._index is None and self._changes is None:
+                return
+
+        placeholders = ", ".join(["%s"] * len(patient_ids))
+        def fetch(connection):
+            phones = self._phones(connection, patient_ids)
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT patientID, name, city FROM PATIENT WHERE patientID IN ({placeholders})", patient_ids)
+            rows = cursor.fetchall()
+            cursor.close()
+            return phones, rows
+
+        phones, rows = self.pool.read(fetch)
+
+        with self._lock:
+            found = set()
+            for patient_id, name, city in rows:
+                self._add(patient_id, name, city, phones.get(patient_id, ()))
+                found.add(patient_id)
+            for patient_id in patient_ids:
+                if patient_id not in found:
+                    self._remove(patient_id)
+            if self._index is not None:
+                self._compact_if_needed()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+            self._index = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            if self._index is None:
+                return {"patients": 0, "removed": 0, "trigrams": 0}
+            return {
+                "patients": len(self._index),
+                "removed": self._index.dead,
+                "trigrams": sum(len(field.postings) for field in self._index.fields.values()),
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find patients by partial or misspelled name, city or phone number.")
+    parser.add_argument("query")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--fields", default="name,city", help=f"Comma-separated fields to index from {', '.join(SEARCH_FIELDS)}")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    from hospital_management import HospitalManagementSystem
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database)
+    search = PatientSearch(hospital_system.pool, fields=args.fields.split(","))
+
+    start = time.perf_counter()
+    search.search(args.query, args.limit)
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches = search.search(args.query, args.limit)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'ID':<12} {'Name':<30} {'City':<20} {'Score':<6}")
+    print("-" * 70)
+    for match in matches:
+        print(f"{match.patient_id:<12} {match.name:<30} {match.city:<20} {match.score:<6.2f}")
+    print(f"\nIndex built in {loaded:.2f}s, search took {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import argparse
+import contextlib
+import datetime
+import io
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mysql.connector import Error
+
+import statement_cache
+from backends import MySQLBackend
+from bulk_import import BookingRequest
+from export import EXPORT_TABLES, Exporter
+from hospital_management import HospitalManagementSystem
+from models import HospitalError
+from recurring import RecurrenceRule
+from reference_cache import REFERENCE_TABLES
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+class RecordingCursor:
+    def __init__(self, cursor, log: List[Tuple[str, Any]]):
+        self._cursor = cursor
+        self._log = log
+
+    def execute(self, operation: str, params: Any = None):
+        self._log.append((operation, params))
+        return self._cursor.execute(operation, params)
+
+    def executemany(self, operation: str, seq_params: List[Any]):
+        if seq_params:
+            self._log.append((operation, seq_params[0]))
+        return self._cursor.executemany(operation, seq_params)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
+class RecordingBackend(MySQLBackend):
+    def __init__(self, host: str, user: str, password: str, database: str, log: List[Tuple[str, Any]]):
+        super().__init__(host, user, password, database)
+        self.log = log
+        self.discard_writes = False
+
+    def connect(self) -> "RecordingConnection":
+        return RecordingConnection(super().connect(), self.log, self)
+
+
+class RecordingConnection:
+    def __init__(self, connection, log: List[Tuple[str, Any]], backend: Optional[RecordingBackend] = None):
+        self._connection = connection
+        self._log = log
+        self._backend = backend
+
+    def cursor(self, *args, **kwargs) -> RecordingCursor:
+        return RecordingCursor(self._connection.cursor(*args, **kwargs), self._log)
+
+    def commit(self) -> None:
+        # The pool rolls back a connection that is returned mid-transaction, so a skipped commit undoes the writes.
+        if self._backend is None or not self._backend.discard_writes:
+            self._connection.commit()
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
+
+
+def sample_ids(connection) -> Dict[str, Optional[str]]:
+    cursor = connection.cursor()
+    samples = {}
+    for keys, query in [
+        (("patient",), "SELECT patientID FROM PATIENT ORDER BY patientID LIMIT 1"),
+        (("other_patient",), "SELECT patientID FROM PATIENT ORDER BY patientID DESC LIMIT 1"),
+        (("doctor",), """
+            SELECT d.doctorID FROM DOCTOR d
+            WHERE EXISTS (SELECT 1 FROM ROOM r WHERE r.departmentID = d.departmentID AND r.status = 'Available')
+            LIMIT 1
+        """),
+        (("department",), "SELECT deptID FROM DEPARTMENT LIMIT 1"),
+        (("room",), "SELECT roomNumber FROM ROOM LIMIT 1"),
+        (("movable_doctor", "target_department"), """
+            SELECT d.doctorID, t.deptID FROM DOCTOR d
+            JOIN DEPARTMENT t ON t.deptID <> d.departmentID
+            WHERE NOT EXISTS (SELECT 1 FROM DEPARTMENT h WHERE h.headDoctor = d.doctorID)
+              AND NOT EXISTS (SELECT 1 FROM APPOINTMENT a WHERE a.doctorID = d.doctorID AND a.status = 'Scheduled' AND a.dateTime > NOW())
+            LIMIT 1
+        """),
+    ]:
+        cursor.execute(query)
+        row = cursor.fetchone()
+        for index, key in enumerate(keys):
+            samples[key] = row[index] if row else None
+    cursor.close()
+    return samples
+
+
+def bulk_scenarios(hospital_system: HospitalManagementSystem) -> List[Tuple[str, Callable[[], Any]]]:
+    reference = hospital_system.reference
+
+    def reference_load(kind: str) -> Callable[[], Any]:
+        def load():
+            reference.invalidate(kind)
+            reference.all(kind)
+        return load
+
+    def patient_search_load():
+        hospital_system.patient_search.invalidate()
+        hospital_system.patient_search.search("check")
+
+    def analytics_load():
+        hospital_system.analytics.invalidate()
+        hospital_system.analytics.columns()
+
+    def export_load(table: str) -> Callable[[], Any]:
+        def export():
+            with tempfile.TemporaryDirectory() as output_dir:
+                exporter = Exporter(hospital_system.pool, hospital_system.backend)
+                first = exporter.export(table, output_dir)
+                exporter.export(table, output_dir, since=first.watermark)
+        return export
+
+    return [(f"reference_{kind}_load", reference_load(kind)) for kind in REFERENCE_TABLES] + [
+        ("availability_refresh", hospital_system.availability.refresh),
+        ("utilization_refresh", hospital_system.utilization.refresh),
+        ("patient_search_load", patient_search_load),
+        ("analytics_load", analytics_load),
+    ] + [(f"export_{table}", export_load(table)) for table in EXPORT_TABLES]
+
+
+def scenarios(hospital_system: HospitalManagementSystem, samples: Dict[str, Optional[str]]) -> List[Tuple[str, Callable[[], Any]]]:
+    listings = hospital_system.listings
+
+    def resumed_patients_page():
+        page = listings.patients_page(page_size=1)
+        if page.next_token:
+            listings.patients_page(page_size=1, resume_token=page.next_token)
+
+    return [
+        ("is_valid_patient", lambda: hospital_system.is_valid_patient(samples["patient"])),
+        ("is_valid_doctor", lambda: hospital_system.is_valid_doctor(samples["doctor"])),
+        ("is_valid_department", lambda: hospital_system.is_valid_department(samples["department"])),
+        ("find_available_room", lambda: hospital_system.find_available_room(samples["room"], "2030-01-01 09:00:00", 30, samples["doctor"])),
+        ("get_patient_medical_history", lambda: hospital_system.get_patient_medical_history(samples["patient"])),
+        ("search_patients", lambda: hospital_system.search_patients("smith")),
+        ("patients_page", resumed_patients_page),
+        ("doctors_page", lambda: listings.doctors_page(page_size=50)),
+        ("rooms_page", lambda: listings.rooms_page(page_size=50)),
+        ("appointments_page", lambda: listings.appointments_page(page_size=50)),
+        ("appointments_page_today", lambda: listings.appointments_page(today_only=True, page_size=50)),
+        ("appointments_page_doctor", lambda: listings.appointments_page(doctor_id=samples["doctor"], page_size=50)),
+        ("appointments_page_patient", lambda: listings.appointments_page(patient_id=samples["patient"], page_size=50)),
+        ("get_patient_medical_histories", lambda: hospital_system.get_patient_medical_histories([samples["patient"], samples["other_patient"]])),
+        ("find_available_slots", lambda: hospital_system.find_available_slots(30, datetime.date(2030, 1, 7), datetime.date(2030, 1, 11), doctor_id=samples["doctor"])),
+        ("upcoming_appointment_count", lambda: hospital_system.upcoming_appointment_count(samples["doctor"])),
+    ]
+
+
+def write_scenarios(hospital_system: HospitalManagementSystem, samples: Dict[str, Optional[str]]) -> List[Tuple[str, Callable[[], Any]]]:
+    # Each write path books a different week, because the availability index keeps the rolled-back bookings.
+    return [
+        ("schedule_appointment", lambda: hospital_system.schedule_appointment(
+            samples["patient"], samples["doctor"], datetime.datetime(2030, 1, 7, 9), 30, "Consultation")),
+        ("schedule_appointment_series", lambda: hospital_system.schedule_appointment_series(
+            samples["patient"], samples["doctor"], RecurrenceRule(datetime.date(2030, 1, 14), datetime.time(9), 30, 2),
+            "Follow-up")),
+        ("bulk_schedule_appointments", lambda: hospital_system.bulk_schedule_appointments([
+            BookingRequest(1, samples["patient"], samples["doctor"], datetime.datetime(2030, 1, 28, 9), 30, "Consultation"),
+            BookingRequest(2, samples["other_patient"], samples["doctor"], datetime.datetime(2030, 1, 28, 10), 30, "Consultation"),
+        ])),
+        ("reassign_doctor", lambda: hospital_system.reassign_doctor(samples["movable_doctor"], samples["target_department"])),
+        ("bulk_reassign_doctors", lambda: hospital_system.bulk_reassign_doctors({samples["movable_doctor"]: samples["target_department"]})),
+        ("archive_batch", lambda: hospital_system.archiver.archive(max_batches=1)),
+    ]
+
+
+def cached_statements() -> Dict[str, str]:
+    return {name: value for name, value in vars(statement_cache).items()
+            if name.isupper() and isinstance(value, str) and value.lstrip().upper().startswith(EXPLAINABLE)}
+
+
+def record(log: List[Tuple[str, Any]], scenario: Callable[[], Any]) -> List[Tuple[str, Any]]:
+    del log[:]
+    with contextlib.redirect_stdout(io.StringIO()):
+        scenario()
+    return [(statement, params) for statement, params in log if statement.lstrip().upper().startswith(EXPLAINABLE)]
+
+
+def plan_violations(plan: List[Dict[str, Any]]) -> List[str]:
+    violations = []
+    for row in plan:
+        extra = row.get("Extra") or ""
+        if row.get("type") == "ALL":
+            violations.append(f"full scan of {row.get('table')}")
+        if "filesort" in extra:
+            violations.append(f"filesort on {row.get('table')}")
+    return violations
+
+
+def check_statement(cursor, name: str, statement: str, params: Any, bulk: bool) -> bool:
+    cursor.execute("EXPLAIN " + statement, params)
+    violations = plan_violations(cursor.fetchall())
+    if bulk:
+        # Cache and index loads read whole tables on purpose. Only a filesort on top of that is worth a look.
+        violations = [violation for violation in violations if not violation.startswith("full scan")]
+
+    if violations and not bulk:
+        status = "FAIL"
+    elif violations:
+        status = "WARN"
+    else:
+        status = "BULK" if bulk else "OK"
+
+    print(f"{status:<6} {name:<30} {', '.join(violations) or '-'}")
+    if violations:
+        print("       " + " ".join(statement.split()))
+    return status == "FAIL"
+
+
+def check_plans(hospital_system: HospitalManagementSystem, log: List[Tuple[str, Any]],
+                explain_connection, samples: Dict[str, Optional[str]]) -> int:
+    failures = 0
+    cursor = explain_connection.cursor(dictionary=True)
+    bulk_statements = set()
+    seen = set()
+
+    # The sequence row is created for real, as on the first booking. Every later write is rolled back.
+    hospital_system.sequences.ensure_sequence("APPOINTMENT", "appointmentID", "APP")
+    hospital_system.backend.discard_writes = True
+
+    # The loads run first, so every cache and index is warm when the hot paths are recorded. A load that a hot
+    # path still triggers, such as an expired cache, is checked as a load.
+    for name, scenario in bulk_scenarios(hospital_system):
+        for statement, params in record(log, scenario):
+            bulk_statements.add(statement)
+            seen.add(statement)
+            failures += check_statement(cursor, name, statement, params, True)
+
+    for name, scenario in scenarios(hospital_system, samples) + write_scenarios(hospital_system, samples):
+        try:
+            statements = record(log, scenario)
+        except HospitalError as e:
+            print(f"{'ERROR':<6} {name:<30} {e}")
+            failures += 1
+            statements = []
+
+        for statement, params in statements:
+            seen.add(statement)
+            failures += check_statement(cursor, name, statement, params, statement in bulk_statements)
+
+    for name, statement in cached_statements().items():
+        if statement not in seen:
+            print(f"{'MISS':<6} {name:<30} no scenario sends this statement")
+            failures += 1
+
+    cursor.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the application's queries against a seeded database and fail on full scans or filesorts in hot paths.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    log: List[Tuple[str, Any]] = []
+
+    try:
+        explain_connection = MySQLBackend(args.host, args.user, args.password, args.database).connect()
+        samples = sample_ids(explain_connection)
+        hospital_system = HospitalManagementSystem(
+            pool_size=1,
+            backend=RecordingBackend(args.host, args.user, args.password, args.database, log)
+        )
+        failures = check_plans(hospital_system, log, explain_connection, samples)
+        explain_connection.close()
+    except Error as e:
+        print(f"Error checking query plans: {e}")
+        raise SystemExit(2)
+
+    if failures:
+        print(f"\n{failures} hot-path statement(s) use a full scan or filesort, or were not exercised.")
+        raise SystemExit(1)
+
+    print("\nAll hot-path statements use indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import argparse
+import datetime
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from availability_index import IntervalList
+from booking import lock_days
+from models import ConflictError, NotFoundError
+from statement_cache import APPOINTMENT_INSERT
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+@dataclass
+class RecurrenceRule:
+    start_date: datetime.date
+    time: datetime.time
+    duration: int
+    weeks: int
+    weekdays: Tuple[int, ...] = ()
+    interval: int = 1
+
+    def occurrences(self) -> List[datetime.datetime]:
+        # Weeks are counted from the first occurrence on or after start_date, so a series starting mid-week still
+        # has `weeks` weeks of occurrences.
+        weekdays = set(self.weekdays) or {self.start_date.weekday()}
+        first = min(self.start_date + datetime.timedelta(days=(weekday - self.start_date.weekday()) % 7)
+                    for weekday in weekdays)
+        starts = []
+        for offset in range(7 * self.weeks):
+            day = first + datetime.timedelta(days=offset)
+            if day.weekday() in weekdays and (offset // 7) % max(1, self.interval) == 0:
+                starts.append(datetime.datetime.combine(day, self.time))
+        return starts
+
+
+def parse_weekdays(value: str) -> Tuple[int, ...]:
+    weekdays = []
+    for name in value.split(","):
+        name = name.strip().lower()[:3]
+        if name:
+            if name not in WEEKDAYS:
+                raise ValueError(f"Unknown weekday: {name}")
+            weekdays.append(WEEKDAYS.index(name))
+    return tuple(weekdays)
+
+
+@dataclass
+class SeriesOccurrence:
+    start: datetime.datetime
+    booked: bool = False
+    appointment_id: Optional[str] = None
+    room_number: Optional[str] = None
+    reason: str = ""
+
+
+@dataclass
+class SeriesReport:
+    occurrences: List[SeriesOccurrence] = field(default_factory=list)
+
+    @property
+    def booked(self) -> List[SeriesOccurrence]:
+        return [occurrence for occurrence in self.occurrences if occurrence.booked]
+
+    @property
+    def conflicts(self) -> List[SeriesOccurrence]:
+        return [occurrence for occurrence in self.occurrences if not occurrence.booked]
+
+
+def _load_intervals(hospital_system, connection, column: str, values: List[str], first: datetime.datetime,
+                    last: datetime.datetime) -> Dict[str, IntervalList]:
+    intervals = {value: IntervalList() for value in values}
+    if not values:
+        return intervals
+
+    cursor = connection.cursor()
+    cursor.execute(f"""
+        SELECT appointmentID, {column}, dateTime, duration
+        FROM APPOINTMENT
+        WHERE status = 'Scheduled' AND dateTime < %s AND {hospital_system.backend.add_minutes('dateTime', 'duration')} > %s
+          AND {column} IN ({', '.join(['%s'] * len(values))})
+        ORDER BY dateTime
+    """, [last, first] + values)
+    for appointment_id, value, start, duration in cursor.fetchall():
+        intervals[value].add(start, start + datetime.timedelta(minutes=duration), appointment_id)
+    cursor.close()
+    return intervals
+
+
+def _available_rooms(connection, rooms: List[str]) -> List[str]:
+    if not rooms:
+        return []
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT roomNumber FROM ROOM WHERE roomNumber IN ({', '.join(['%s'] * len(rooms))}) AND status = 'Available'", rooms)
+    available = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    return [room_number for room_number in rooms if room_number in available]
+
+
+def _plan(occurrences: List[SeriesOccurrence], appointment_ids: List[str], duration: int, doctor: IntervalList,
+          rooms: List[str], booked_rooms: Dict[str, IntervalList]) -> None:
+    step = datetime.timedelta(minutes=duration)
+    doctor = doctor.copy()
+    booked_rooms = {room_number: intervals.copy() for room_number, intervals in booked_rooms.items()}
+
+    for occurrence, appointment_id in zip(occurrences, appointment_ids):
+        occurrence.booked = False
+        occurrence.appointment_id = occurrence.room_number = None
+        end = occurrence.start + step
+        if doctor.has_conflict(occurrence.start, end):
+            occurrence.reason = "Doctor is not available at the requested time"
+            continue
+
+        room_number = next((room for room in rooms if not booked_rooms[room].has_conflict(occurrence.start, end)), None)
+        if room_number is None:
+            occurrence.reason = "No suitable room available at the requested time"
+            continue
+
+        occurrence.booked = True
+        occurrence.appointment_id = appointment_id
+        occurrence.room_number = room_number
+        occurrence.reason = ""
+        doctor.add(occurrence.start, end, appointment_id)
+        booked_rooms[room_number].add(occurrence.start, end, appointment_id)
+
+
+def _attempt(hospital_system, patient_id: str, doctor_id: str, rooms: List[str], starts: List[datetime.datetime],
+             appointment_ids: List[str], duration: int, appointment_type: str, notes: str,
+             all_or_nothing: bool) -> List[SeriesOccurrence]:
+    booker = hospital_system.booker
+    occurrences = [SeriesOccurrence(start) for start in starts]
+    first, last = starts[0], starts[-1] + datetime.timedelta(minutes=duration)
+
+    with hospital_system.pool.connection() as connection:
+        if booker:
+            days = sorted({day for start in starts for day in lock_days(start, duration)})
+            booker.lock(connection, [(f"doctor:{doctor_id}", day) for day in days])
+
+        rooms = _available_rooms(connection, rooms)
+        doctor = _load_intervals(hospital_system, connection, "doctorID", [doctor_id], first, last)[doctor_id]
+        booked_rooms = _load_intervals(hospital_system, connection, "roomNumber", rooms, first, last)
+        _plan(occurrences, appointment_ids, duration, doctor, rooms, booked_rooms)
+
+        # Lock only the room days the plan uses. Another booking may have taken one of them before the lock, so
+        # reload those rooms and plan again until every chosen room day is locked and was read under its lock.
+        locked = set()
+        while booker:
+            wanted = {(occurrence.room_number, day) for occurrence in occurrences if occurrence.booked
+                      for day in lock_days(occurrence.start, duration)} - locked
+            if not wanted:
+                break
+            booker.lock(connection, [(f"room:{room_number}", day) for room_number, day in wanted])
+            locked |= wanted
+
+            changed = sorted({room_number for room_number, _ in wanted})
+            still_available = set(_available_rooms(connection, changed))
+            rooms = [room_number for room_number in rooms if room_number not in changed or room_number in still_available]
+            booked_rooms.update(_load_intervals(hospital_system, connection, "roomNumber", changed, first, last))
+            _plan(occurrences, appointment_ids, duration, doctor, rooms, booked_rooms)
+
+        booked = [occurrence for occurrence in occurrences if occurrence.booked]
+        if not booked or (all_or_nothing and len(booked) < len(occurrences)):
+            connection.rollback()
+            for occurrence in booked:
+                occurrence.booked = False
+                occurrence.appointment_id = None
+                occurrence.room_number = None
+                occurrence.reason = "Not booked because other dates in the series conflict"
+            return occurrences
+
+        cursor = connection.cursor()
+        cursor.executemany(APPOINTMENT_INSERT, [
+            (occurrence.appointment_id, occurrence.start, duration, "Scheduled", appointment_type, notes,
+             patient_id, doctor_id, occurrence.room_number)
+            for occurrence in booked
+        ])
+        cursor.close()
+        connection.commit()
+
+    return occurrences
+
+
+def schedule_appointment_series(hospital_system, patient_id: str, doctor_id: str, rule: RecurrenceRule,
+                                appointment_type: str, preferred_room: str = "", notes: str = "",
+                                all_or_nothing: bool = False) -> SeriesReport:
+    if not hospital_system.is_valid_patient(patient_id):
+        raise NotFoundError("Invalid patient ID. Please check and try again.")
+
+    doctor = hospital_system.reference.get("doctors", doctor_id)
+    if not doctor:
+        raise NotFoundError("Invalid doctor ID. Please check and try again.")
+
+    starts = rule.occurrences()
+    if not starts:
+        raise ConflictError("The recurrence rule does not produce any dates.")
+
+    rooms = hospital_system.availability.available_rooms(doctor['departmentID'])
+    if preferred_room in rooms:
+        rooms = [preferred_room] + [room for room in rooms if room != preferred_room]
+
+    appointment_ids = hospital_system.sequences.allocate("APPOINTMENT", "appointmentID", "APP", len(starts))
+
+    def attempt() -> List[SeriesOccurrence]:
+        return _attempt(hospital_system, patient_id, doctor_id, rooms, starts, appointment_ids,
+                        rule.duration, appointment_type, notes, all_or_nothing)
+
+    occurrences = hospital_system.booker.with_retries(attempt) if hospital_system.booker else attempt()
+
+    report = SeriesReport(occurrences)
+    for occurrence in report.booked:
+        hospital_system.availability.add(occurrence.appointment_id, doctor_id, occurrence.room_number,
+                                         occurrence.start, rule.duration)
+        hospital_system.utilization.record_appointment(occurrence.room_number, occurrence.start, rule.duration)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Book a recurring appointment series, e.g. every Tuesday at 10:00 for 12 weeks.")
+    parser.add_argument("patient_id")
+    parser.add_argument("doctor_id")
+    parser.add_argument("--start-date", required=True, help="First possible date, YYYY-MM-DD")
+    parser.add_argument("--time", required=True, help="Start time, HH:MM")
+    parser.add_argument("--weekdays", default="", help="Comma-separated days such as tue,thu (default: the start date's weekday)")
+    parser.add_argument("--weeks", type=int, required=True)
+    parser.add_argument("--every", type=int, default=1, help="Repeat every this many weeks")
+    parser.add_argument("--duration", type=int, required=True, help="Minutes")
+    parser.add_argument("--type", dest="appointment_type", required=True)
+    parser.add_argument("--preferred-room", default="")
+    parser.add_argument("--notes", default="")
+    parser.add_argument("--all-or-nothing", action="store_true", help="Book nothing if any date conflicts")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    rule = RecurrenceRule(
+        start_date=datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date(),
+        time=datetime.datetime.strptime(args.time, "%H:%M").time(),
+        duration=args.duration,
+        weeks=args.weeks,
+        weekdays=parse_weekdays(args.weekdays),
+        interval=args.every
+    )
+
+    from hospital_management import HospitalManagementSystem
+
+    hospital_system = HospitalManagementSystem(args.host, args.user, args.password, args.database)
+    try:
+        report = hospital_system.schedule_appointment_series(args.patient_id, args.doctor_id, rule, args.appointment_type,
+                                                             args.preferred_room, args.notes, args.all_or_nothing)
+    except (ConflictError, NotFoundError) as e:
+        print(e)
+        raise SystemExit(1)
+    except Error as e:
+        print(f"Error scheduling appointment series: {e}")
+        raise SystemExit(1)
+
+    print(f"\nBooked {len(report.booked)} of {len(report.occurrences)} appointments")
+    for occurrence in report.occurrences:
+        if occurrence.booked:
+            print(f"{occurrence.start:%a %Y-%m-%d %H:%M}  {occurrence.appointment_id}  room {occurrence.room_number}")
+        else:
+            print(f"{occurrence.start:%a %Y-%m-%d %H:%M}  conflict: {occurrence.reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+from connection_pool import ConnectionPool
+
+REFERENCE_TABLES = {
+    "departments": ("SELECT deptID, name, location, headDoctor FROM DEPARTMENT", "deptID"),
+    "doctors": ("SELECT doctorID, name, specialization, departmentID FROM DOCTOR", "doctorID"),
+    "rooms": ("SELECT roomNumber, type, capacity, status, departmentID FROM ROOM", "roomNumber"),
+    "medications": ("SELECT medicationID, name, type, unit FROM MEDICATION", "medicationID"),
+}
+
+
+class ReferenceTable:
+    def __init__(self):
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.stale: Set[str] = set()
+        self.loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+
+class ReferenceCache:
+    def __init__(self, pool: ConnectionPool, ttl: float = 300.0):
+        self.pool = pool
+        self.ttl = ttl
+
+        self._tables = {kind: ReferenceTable() for kind in REFERENCE_TABLES}
+        self._lock = threading.RLock()
+
+    def _query(self, query: str, params: tuple = ()) -> list:
+        def fetch(connection):
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+
+        return self.pool.read(fetch, primary=True)
+
+    def _load(self, kind: str) -> None:
+        query, key_column = REFERENCE_TABLES[kind]
+        rows = self._query(query)
+
+        table = self._tables[kind]
+        table.rows = {row[key_column]: row for row in rows}
+        table.stale = set()
+        table.loaded_at = time.monotonic()
+
+    def _load_row(self, kind: str, key: str) -> None:
+        query, key_column = REFERENCE_TABLES[kind]
+        rows = self._query(f"{query} WHERE {key_column} = %s", (key,))
+
+        table = self._tables[kind]
+        table.stale.discard(key)
+        if rows:
+            table.rows[key] = rows[0]
+        else:
+            table.rows.pop(key, None)
+
+    def _ensure_loaded(self, kind: str) -> bool:
+        table = self._tables[kind]
+        if table.loaded_at is None or time.monotonic() - table.loaded_at > self.ttl:
+            self._load(kind)
+            return False
+        return True
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            table = self._tables[kind]
+            fresh = self._ensure_loaded(kind)
+
+            if key in table.stale or (fresh and key not in table.rows):
+                self._load_row(kind, key)
+                fresh = False
+
+            if fresh:
+                table.hits += 1
+            else:
+                table.misses += 1
+
+            return table.rows.get(key)
+
+    def contains(self, kind: str, key: str) -> bool:
+        return self.get(kind, key) is not None
+
+    def all(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            table = self._tables[kind]
+            fresh = self._ensure_loaded(kind)
+
+            if fresh and table.stale:
+                self._load(kind)
+                fresh = False
+
+            if fresh:
+                table.hits += 1
+            else:
+                table.misses += 1
+
+            return dict(table.rows)
+
+    def invalidate(self, kind: Optional[str] = None, key: Optional[str] = None) -> None:
+        with self._lock:
+            if kind is None:
+                for table in self._tables.values():
+                    table.loaded_at = None
+            elif key is None:
+                self._tables[kind].loaded_at = None
+            else:
+                self._tables[kind].stale.add(key)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                kind: {"hits": table.hits, "misses": table.misses, "size": len(table.rows)}
+                for kind, table in self._tables.items()
+            }
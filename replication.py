@@ -0,0 +1,214 @@
+import contextvars
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from mysql.connector import Error
+from mysql.connector.errors import InterfaceError, OperationalError, PoolError
+
+from backends import Backend
+from connection_pool import ConnectionPool
+
+READ_STRATEGIES = ("round_robin", "least_latency")
+
+T = TypeVar("T")
+
+
+class Session:
+    def __init__(self):
+        self.last_write = float("-inf")
+
+
+_current_session: contextvars.ContextVar[Optional[Session]] = contextvars.ContextVar("hospital_session", default=None)
+
+
+def current_session() -> Session:
+    session = _current_session.get()
+    if session is None:
+        session = Session()
+        _current_session.set(session)
+    return session
+
+
+@contextmanager
+def new_session() -> Iterator[Session]:
+    token = _current_session.set(Session())
+    try:
+        yield _current_session.get()
+    finally:
+        _current_session.reset(token)
+
+
+class Replica:
+    def __init__(self, name: str, pool: ConnectionPool, backend: Backend):
+        self.name = name
+        self.pool = pool
+        self.backend = backend
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.latency = 0.0
+        self.checked_at: Optional[float] = None
+
+
+class RoutingPool:
+    def __init__(self, primary: ConnectionPool, replicas: List[Replica], strategy: str = "round_robin",
+                 max_lag: float = 5.0, check_interval: float = 5.0, read_your_writes_window: Optional[float] = None):
+        if strategy not in READ_STRATEGIES:
+            raise ValueError(f"Unknown read strategy: {strategy}")
+
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_your_writes_window = max_lag if read_your_writes_window is None else read_your_writes_window
+
+        self._round_robin = itertools.count()
+        self._check_lock = threading.Lock()
+        self._reads: Dict[str, int] = {"primary": 0}
+
+    @property
+    def size(self) -> int:
+        return self.primary.size
+
+    @property
+    def created(self) -> int:
+        return self.primary.created
+
+    @property
+    def idle(self) -> int:
+        return self.primary.idle
+
+    def _check(self, replica: Replica) -> None:
+        try:
+            start = time.perf_counter()
+            connection = replica.backend.connect()
+            try:
+                lag = replica.backend.replica_lag(connection)
+            finally:
+                connection.close()
+            elapsed = time.perf_counter() - start
+
+            replica.latency = elapsed if replica.checked_at is None else 0.8 * replica.latency + 0.2 * elapsed
+            replica.lag = lag
+            replica.healthy = lag is None or lag <= self.max_lag
+        except Error:
+            replica.healthy = False
+        replica.checked_at = time.monotonic()
+
+    def check_replicas(self) -> None:
+        for replica in self.replicas:
+            self._check(replica)
+
+    def _refresh_health(self) -> None:
+        now = time.monotonic()
+        stale = [replica for replica in self.replicas
+                 if replica.checked_at is None or now - replica.checked_at > self.check_interval]
+        if stale and self._check_lock.acquire(blocking=False):
+            try:
+                for replica in stale:
+                    self._check(replica)
+            finally:
+                self._check_lock.release()
+
+    def _choose(self) -> Optional[Replica]:
+        self._refresh_health()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_latency":
+            return min(healthy, key=lambda replica: replica.latency)
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    def _count_read(self, name: str) -> None:
+        self._reads[name] = self._reads.get(name, 0) + 1
+
+    @contextmanager
+    def connection(self, write: bool = True) -> Iterator[Any]:
+        session = current_session()
+        try:
+            with self.primary.connection() as connection:
+                yield connection
+        finally:
+            # Primary reads that need fresh data do not pin the session's later reads to the primary.
+            if write:
+                session.last_write = time.monotonic()
+
+    def _acquire_replica(self) -> Tuple[Optional[Replica], Any]:
+        session = current_session()
+        if time.monotonic() - session.last_write < self.read_your_writes_window:
+            return None, None
+
+        replica = self._choose()
+        if replica is None:
+            return None, None
+        try:
+            return replica, replica.pool.acquire()
+        except PoolError:
+            return None, None
+        except Error:
+            replica.healthy = False
+            return None, None
+
+    @contextmanager
+    def read_connection(self) -> Iterator[Any]:
+        replica, connection = self._acquire_replica()
+
+        if replica is None:
+            self._count_read("primary")
+            with self.primary.connection() as connection:
+                yield connection
+            return
+
+        self._count_read(replica.name)
+        try:
+            yield connection
+        except (InterfaceError, OperationalError):
+            replica.healthy = False
+            replica.pool.release(connection, failed=True)
+            raise
+        except Exception:
+            replica.pool.release(connection, failed=True)
+            raise
+        else:
+            replica.pool.release(connection)
+
+    def read(self, operation: Callable[[Any], T], primary: bool = False) -> T:
+        # Caches built from a read outlive the read-your-writes window, so they pass primary=True rather than
+        # keep rows from a lagging replica for their whole lifetime.
+        replica, connection = (None, None) if primary else self._acquire_replica()
+
+        if replica is not None:
+            self._count_read(replica.name)
+            try:
+                result = operation(connection)
+            except (InterfaceError, OperationalError):
+                # The replica went away mid-query. The operation only reads, so it is safe to run once more on the primary.
+                replica.healthy = False
+                replica.pool.release(connection, failed=True)
+            except Exception:
+                replica.pool.release(connection, failed=True)
+                raise
+            else:
+                replica.pool.release(connection)
+                return result
+
+        self._count_read("primary")
+        with self.primary.connection() as connection:
+            return operation(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "reads": dict(self._reads),
+            "replicas": {
+                replica.name: {"healthy": replica.healthy, "lag": replica.lag, "latency_ms": replica.latency * 1000}
+                for replica in self.replicas
+            },
+        }
+
+    def close(self) -> None:
+        self.primary.close()
+        for replica in self.replicas:
+            replica.pool.close()
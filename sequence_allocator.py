@@ -0,0 +1,93 @@
+import threading
+from typing import Dict, List, Tuple
+
+from mysql.connector.errors import IntegrityError
+
+from backends import Backend
+from connection_pool import ConnectionPool
+
+ID_LENGTH = 10
+
+
+class SequenceAllocator:
+    def __init__(self, pool: ConnectionPool, backend: Backend, block_size: int = 1000):
+        self.pool = pool
+        self.backend = backend
+        self.block_size = block_size
+
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, table: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(table, threading.Lock())
+
+    def _seed(self, connection, table: str, id_field: str, prefix: str) -> None:
+        cursor = connection.cursor()
+        number = self.backend.cast_integer(f"SUBSTRING({id_field}, {len(prefix) + 1})")
+        cursor.execute(f"SELECT MAX({number}) FROM {table}")
+        max_id = cursor.fetchone()[0] or 0
+        try:
+            cursor.execute("INSERT INTO ID_SEQUENCE (name, next_value) VALUES (%s, %s)", (table, max_id + 1))
+            connection.commit()
+        except IntegrityError:
+            connection.rollback()
+        cursor.close()
+
+    def ensure_sequence(self, table: str, id_field: str, prefix: str) -> None:
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT COUNT(*) FROM ID_SEQUENCE WHERE name = %s", (table,))
+            exists = cursor.fetchone()[0] > 0
+            cursor.close()
+            if not exists:
+                self._seed(connection, table, id_field, prefix)
+
+    def _reserve_block(self, table: str, id_field: str, prefix: str, count: int) -> int:
+        while True:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute("UPDATE ID_SEQUENCE SET next_value = next_value + %s WHERE name = %s", (count, table))
+
+                if cursor.rowcount == 0:
+                    connection.rollback()
+                    cursor.close()
+                    self._seed(connection, table, id_field, prefix)
+                    continue
+
+                cursor.execute("SELECT next_value FROM ID_SEQUENCE WHERE name = %s", (table,))
+                end = cursor.fetchone()[0]
+                connection.commit()
+                cursor.close()
+                return end - count
+
+    def format_id(self, prefix: str, value: int) -> str:
+        # Every new ID fills the column, so IDs compare in numeric order past 999, 9999 and so on.
+        return f"{prefix}{value:0{ID_LENGTH - len(prefix)}d}"
+
+    def allocate(self, table: str, id_field: str, prefix: str, count: int = 1) -> List[str]:
+        values = []
+
+        with self._lock_for(table):
+            next_value, limit = self._blocks.get(table, (0, 0))
+
+            while len(values) < count:
+                if next_value >= limit:
+                    size = max(self.block_size, count - len(values))
+                    next_value = self._reserve_block(table, id_field, prefix, size)
+                    limit = next_value + size
+
+                take = min(count - len(values), limit - next_value)
+                values.extend(range(next_value, next_value + take))
+                next_value += take
+
+            self._blocks[table] = (next_value, limit)
+
+        ids = [self.format_id(prefix, value) for value in values]
+        if ids and len(ids[-1]) > ID_LENGTH:
+            raise ValueError(f"{table} IDs have run out: {ids[-1]} is longer than the {ID_LENGTH}-character {id_field} column")
+        return ids
+
+    def next_id(self, table: str, id_field: str, prefix: str) -> str:
+        return self.allocate(table, id_field, prefix, 1)[0]
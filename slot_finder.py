@@ -0,0 +1,139 @@
+import datetime
+import heapq
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from availability_index import AvailabilityIndex
+from models import NotFoundError, SlotOption
+from reference_cache import ReferenceCache
+
+WORKING_DAYS = (0, 1, 2, 3, 4)
+
+Window = Tuple[datetime.datetime, datetime.datetime]
+
+
+def working_windows(start_date: datetime.date, end_date: datetime.date, day_start: datetime.time,
+                    day_end: datetime.time, working_days: Sequence[int], not_before: datetime.datetime) -> List[Window]:
+    windows = []
+    day = start_date
+    while day <= end_date:
+        if day.weekday() in working_days:
+            start = max(datetime.datetime.combine(day, day_start), not_before)
+            end = datetime.datetime.combine(day, day_end)
+            if start < end:
+                windows.append((start, end))
+        day += datetime.timedelta(days=1)
+    return windows
+
+
+def subtract(windows: List[Window], busy: List[Window]) -> List[Window]:
+    free = []
+    first = 0
+    for window_start, window_end in windows:
+        while first < len(busy) and busy[first][1] <= window_start:
+            first += 1
+
+        cursor = window_start
+        index = first
+        while index < len(busy) and busy[index][0] < window_end:
+            busy_start, busy_end = busy[index]
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            index += 1
+
+        if cursor < window_end:
+            free.append((cursor, window_end))
+    return free
+
+
+def intersect(first: List[Window], second: List[Window]) -> Iterator[Window]:
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            yield start, end
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+
+
+def aligned_starts(windows: Iterator[Window], duration: int, step: int) -> Iterator[datetime.datetime]:
+    length = datetime.timedelta(minutes=duration)
+    for window_start, window_end in windows:
+        midnight = datetime.datetime.combine(window_start.date(), datetime.time())
+        offset = -(-(window_start - midnight) // datetime.timedelta(minutes=step))
+        start = midnight + offset * datetime.timedelta(minutes=step)
+        while start + length <= window_end:
+            yield start
+            start += datetime.timedelta(minutes=step)
+
+
+def _tagged(starts: Iterator[datetime.datetime], doctor_order: int, room_order: int, doctor: dict,
+            room_number: str) -> Iterator[Tuple[datetime.datetime, int, int, dict, str]]:
+    for start in starts:
+        yield start, doctor_order, room_order, doctor, room_number
+
+
+class SlotFinder:
+    def __init__(self, availability: AvailabilityIndex, reference: ReferenceCache):
+        self.availability = availability
+        self.reference = reference
+
+    def _doctors(self, doctor_id: Optional[str], specialization: Optional[str],
+                 department_id: Optional[str]) -> List[dict]:
+        if doctor_id:
+            doctor = self.reference.get("doctors", doctor_id)
+            if not doctor:
+                raise NotFoundError("Invalid doctor ID. Please check and try again.")
+            doctors = [doctor]
+        else:
+            doctors = sorted(self.reference.all("doctors").values(), key=lambda doctor: doctor['doctorID'])
+
+        if specialization:
+            doctors = [doctor for doctor in doctors if (doctor['specialization'] or "").lower() == specialization.lower()]
+        if department_id:
+            doctors = [doctor for doctor in doctors if doctor['departmentID'] == department_id]
+        return doctors
+
+    def find(self, duration: int, start_date: datetime.date, end_date: datetime.date,
+             doctor_id: Optional[str] = None, specialization: Optional[str] = None,
+             department_id: Optional[str] = None, limit: int = 10, preferred_room: str = "",
+             day_start: datetime.time = datetime.time(8), day_end: datetime.time = datetime.time(17),
+             step: int = 15, working_days: Sequence[int] = WORKING_DAYS) -> List[SlotOption]:
+        windows = working_windows(start_date, end_date, day_start, day_end, working_days, datetime.datetime.now())
+        if not windows:
+            return []
+
+        horizon_start, horizon_end = windows[0][0], windows[-1][1]
+        length = datetime.timedelta(minutes=duration)
+        room_free = {}
+        candidates = []
+
+        for doctor_order, doctor in enumerate(self._doctors(doctor_id, specialization, department_id)):
+            doctor_free = subtract(windows, self.availability.doctor_busy(doctor['doctorID'], horizon_start, horizon_end))
+            if not doctor_free:
+                continue
+
+            rooms = self.availability.available_rooms(doctor['departmentID'])
+            if preferred_room in rooms:
+                rooms = [preferred_room] + [room for room in rooms if room != preferred_room]
+
+            for room_order, room_number in enumerate(rooms):
+                if room_number not in room_free:
+                    room_free[room_number] = subtract(windows, self.availability.room_busy(room_number, horizon_start, horizon_end))
+                starts = aligned_starts(intersect(doctor_free, room_free[room_number]), duration, step)
+                candidates.append(_tagged(starts, doctor_order, room_order, doctor, room_number))
+
+        slots: List[SlotOption] = []
+        seen = set()
+        for start, _, _, doctor, room_number in heapq.merge(*candidates, key=lambda candidate: candidate[:3]):
+            if (doctor['doctorID'], start) in seen:
+                continue
+            seen.add((doctor['doctorID'], start))
+            slots.append(SlotOption(doctor['doctorID'], doctor['name'], room_number, start, start + length))
+            if len(slots) >= limit:
+                break
+
+        return slots
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Any, List, Sequence, Tuple
+
+from mysql.connector.errors import DatabaseError
+
+UNKNOWN_STATEMENT_ERRNO = 1243
+
+PATIENT_EXISTS = "SELECT COUNT(*) FROM PATIENT WHERE patientID = %s"
+ROOM_STATUS = "SELECT status FROM ROOM WHERE roomNumber = %s"
+LOCK_BUMP = "UPDATE BOOKING_LOCK SET version = version + 1 WHERE resource = %s AND day = %s"
+LOCK_INSERT = "INSERT INTO BOOKING_LOCK (resource, day, version) VALUES (%s, %s, 1)"
+HISTORY_VERSION = "SELECT version FROM PATIENT_HISTORY_VERSION WHERE patientID = %s"
+APPOINTMENT_INSERT = (
+    "INSERT INTO APPOINTMENT (appointmentID, dateTime, duration, status, type, notes, patientID, doctorID, roomNumber) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+
+class StatementCache:
+    def __init__(self, max_statements: int = 64):
+        self.max_statements = max_statements
+        self.prepares = 0
+        self.reuses = 0
+
+    def _entries(self, connection: Any) -> "OrderedDict[Tuple[str, bool], Tuple[str, Any]]":
+        # A reconnect gets a new server thread, and every statement prepared on the old one is gone.
+        connection_id = getattr(connection, "connection_id", None)
+        state = getattr(connection, "_statement_cache", None)
+        if state is None or state[0] != connection_id:
+            state = (connection_id, OrderedDict())
+            connection._statement_cache = state
+        return state[1]
+
+    def cursor(self, connection: Any, statement: str, dictionary: bool = False) -> Tuple[str, Any]:
+        entries = self._entries(connection)
+        key = (statement, dictionary)
+        entry = entries.get(key)
+        if entry is not None:
+            entries.move_to_end(key)
+            self.reuses += 1
+            return entry
+
+        # The connector only re-prepares when it sees a different string object, so the first one is kept.
+        entry = (statement, connection.cursor(prepared=True, dictionary=dictionary))
+        entries[key] = entry
+        self.prepares += 1
+        if len(entries) > self.max_statements:
+            _, (_, evicted) = entries.popitem(last=False)
+            evicted.close()
+        return entry
+
+    def execute(self, connection: Any, statement: str, params: Sequence[Any] = (), dictionary: bool = False) -> Any:
+        text, cursor = self.cursor(connection, statement, dictionary)
+        try:
+            cursor.execute(text, tuple(params))
+        except DatabaseError as e:
+            if e.errno != UNKNOWN_STATEMENT_ERRNO:
+                raise
+            self._entries(connection).pop((statement, dictionary), None)
+            text, cursor = self.cursor(connection, statement, dictionary)
+            cursor.execute(text, tuple(params))
+        return cursor
+
+    def fetchone(self, connection: Any, statement: str, params: Sequence[Any] = (), dictionary: bool = False) -> Any:
+        rows = self.execute(connection, statement, params, dictionary).fetchall()
+        return rows[0] if rows else None
+
+    def fetchall(self, connection: Any, statement: str, params: Sequence[Any] = (),
+                 dictionary: bool = False) -> List[Any]:
+        return self.execute(connection, statement, params, dictionary).fetchall()
+
+    def rowcount(self, connection: Any, statement: str, params: Sequence[Any] = ()) -> int:
+        return self.execute(connection, statement, params).rowcount
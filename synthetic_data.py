@@ -0,0 +1,362 @@
+import argparse
+import datetime
+import random
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from backends import Backend, MySQLBackend, SQLiteBackend
+
+SCALES = {
+    "tiny": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Maria", "Mohammed", "Wei", "Aisha", "Carlos", "Priya", "Hiroshi", "Olga", "Kwame", "Sofia",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Chen", "Ali", "Nguyen", "Patel", "Kim", "Okafor", "Ivanova", "Tanaka", "Rossi",
+]
+CITIES = [
+    ("Springfield", "IL"), ("Chicago", "IL"), ("Houston", "TX"), ("Austin", "TX"), ("Phoenix", "AZ"),
+    ("Denver", "CO"), ("Seattle", "WA"), ("Portland", "OR"), ("Boston", "MA"), ("Miami", "FL"),
+    ("Atlanta", "GA"), ("Columbus", "OH"), ("Nashville", "TN"), ("Raleigh", "NC"), ("Madison", "WI"),
+]
+STREETS = ["Main St", "Oak Ave", "Pine Rd", "Cedar Ln", "Elm St", "Maple Dr", "Lake View Rd", "Hill St"]
+INSURERS = ["BlueCross", "Aetna", "Medicare", "United", "Cigna", "Humana", "Kaiser", "Medicaid"]
+SPECIALIZATIONS = [
+    ("Cardiology", "Cardiologist"), ("Neurology", "Neurologist"), ("Pediatrics", "Pediatrician"),
+    ("Oncology", "Oncologist"), ("Emergency", "Emergency Medicine"), ("Orthopedics", "Orthopedic Surgeon"),
+    ("Dermatology", "Dermatologist"), ("Radiology", "Radiologist"), ("Psychiatry", "Psychiatrist"),
+    ("Gastroenterology", "Gastroenterologist"),
+]
+ROOM_TYPES = ["Examination", "Surgery", "Patient Room", "ICU", "Treatment", "Emergency Bay"]
+DIAGNOSES = [
+    ("Hypertension", "Prescribed medication and lifestyle changes"),
+    ("Migraine", "Pain management and trigger avoidance"),
+    ("Type 2 Diabetes", "Diet control and insulin therapy"),
+    ("Influenza", "Rest and antiviral medication"),
+    ("Asthma", "Inhaled corticosteroids"),
+    ("Back Pain", "Physiotherapy"),
+    ("Annual Check-up", "No treatment needed"),
+    ("Bronchitis", "Antibiotics and rest"),
+]
+MEDICATION_TYPES = [
+    ("Antihypertensive", "Tablet"), ("Antimigraine", "Tablet"), ("Antidiabetic", "Tablet"),
+    ("Antiviral", "Capsule"), ("Antibiotic", "Capsule"), ("Analgesic", "Tablet"), ("Inhaler", "Puff"),
+]
+APPOINTMENT_TYPES = ["Check-up", "Follow-up", "Consultation", "Post-op", "Treatment"]
+FREQUENCIES = ["Once daily", "Twice daily", "8-hourly", "12-hourly", "As needed"]
+
+SLOTS_PER_DAY = 18
+
+
+@dataclass
+class DatasetSize:
+    patients: int
+    doctors: int
+    departments: int
+    rooms: int
+    medications: int
+    records: int
+    appointments: int
+
+    @classmethod
+    def for_patients(cls, patients: int, records_per_patient: float = 0.9,
+                     appointments_per_patient: float = 0.9) -> "DatasetSize":
+        doctors = max(10, patients // 200)
+        size = cls(
+            patients=patients,
+            doctors=doctors,
+            departments=max(5, min(len(SPECIALIZATIONS) * 20, doctors // 25)),
+            rooms=doctors + max(5, doctors // 5),
+            medications=min(500, max(20, patients // 100)),
+            records=int(patients * records_per_patient),
+            appointments=int(patients * appointments_per_patient),
+        )
+        for name, count, prefix in [
+            ("patients", size.patients, "PAT"), ("doctors", size.doctors, "DOC"),
+            ("records", size.records, "REC"), ("appointments", size.appointments, "APP"),
+        ]:
+            if count >= 10 ** (10 - len(prefix)):
+                raise ValueError(f"Too many {name} for a {prefix} ID of 10 characters: {count}")
+        return size
+
+
+def patient_id(index: int) -> str:
+    return f"PAT{index + 1:07d}"
+
+
+def doctor_id(index: int) -> str:
+    return f"DOC{index + 1:07d}"
+
+
+def department_id(index: int) -> str:
+    return f"DEPT{index + 1:06d}"
+
+
+def room_number(index: int) -> str:
+    return f"RM{index + 1:08d}"
+
+
+def medication_id(index: int) -> str:
+    return f"MED{index + 1:07d}"
+
+
+class SyntheticDataGenerator:
+    def __init__(self, size: DatasetSize, seed: int = 42, anchor_date: Optional[datetime.date] = None,
+                 history_days: int = 365, future_days: int = 90):
+        self.size = size
+        self.seed = seed
+        self.anchor_date = anchor_date or datetime.date.today()
+        self.history_days = history_days
+        self.future_days = future_days
+
+    def _random(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def departments(self) -> Iterator[Tuple[Any, ...]]:
+        for index in range(self.size.departments):
+            name, _ = SPECIALIZATIONS[index % len(SPECIALIZATIONS)]
+            if index >= len(SPECIALIZATIONS):
+                name = f"{name} {index // len(SPECIALIZATIONS) + 1}"
+            building = chr(ord("A") + index % 8)
+            yield (department_id(index), name, f"Building {building}, Floor {index % 6 + 1}", None)
+
+    def department_heads(self) -> Iterator[Tuple[Any, ...]]:
+        for index in range(self.size.departments):
+            yield (doctor_id(index), department_id(index))
+
+    def doctors(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._random("DOCTOR")
+        for index in range(self.size.doctors):
+            department = index % self.size.departments
+            _, specialization = SPECIALIZATIONS[department % len(SPECIALIZATIONS)]
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            number = f"{index % 10_000_000:07d}"
+            yield (
+                doctor_id(index), f"{first} {last}", specialization,
+                f"555-{number}", f"556-{number}", f"{first[0].lower()}{last.lower()}{index + 1}@hospital.org",
+                f"557-{number}", f"{rng.choice(FIRST_NAMES)} {last} 558-{number}",
+                department_id(department)
+            )
+
+    def rooms(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._random("ROOM")
+        for index in range(self.size.rooms):
+            if index < self.size.doctors:
+                status = "Available"
+            else:
+                status = rng.choice(["Available", "Available", "Occupied", "Maintenance"])
+            yield (room_number(index), rng.choice(ROOM_TYPES), rng.randint(1, 10), status, department_id(index % self.size.departments))
+
+    def patients(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._random("PATIENT")
+        earliest = datetime.date(1930, 1, 1).toordinal()
+        latest = self.anchor_date.toordinal()
+        for index in range(self.size.patients):
+            city, state = rng.choice(CITIES)
+            yield (
+                patient_id(index), f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                datetime.date.fromordinal(rng.randint(earliest, latest)),
+                str(rng.randint(1, 9999)), rng.choice(STREETS),
+                str(rng.randint(1, 500)) if rng.random() < 0.3 else None,
+                city, state, f"{rng.randint(10000, 99999)}", "USA",
+                f"{rng.choice(INSURERS)} #{rng.randint(10_000_000, 99_999_999)}" if rng.random() < 0.95 else None
+            )
+
+    def phone_numbers(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._random("PATIENT_PHONE_NUMBERS")
+        for index in range(self.size.patients):
+            yield (patient_id(index), f"555-{index % 10_000_000:07d}")
+            if rng.random() < 0.4:
+                yield (patient_id(index), f"556-{index % 10_000_000:07d}")
+
+    def medications(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._random("MEDICATION")
+        for index in range(self.size.medications):
+            medication_type, unit = MEDICATION_TYPES[index % len(MEDICATION_TYPES)]
+            yield (medication_id(index), f"Medication {index + 1}", medication_type, rng.randint(0, 1000), unit)
+
+    def records_and_prescriptions(self) -> Iterator[Tuple[Tuple[Any, ...], List[Tuple[Any, ...]]]]:
+        rng = self._random("MEDICAL_RECORD")
+        latest = self.anchor_date.toordinal()
+        earliest = latest - 5 * 365
+        for index in range(self.size.records):
+            record_id = f"REC{index + 1:07d}"
+            record_date = datetime.date.fromordinal(rng.randint(earliest, latest))
+            diagnosis, treatment = rng.choice(DIAGNOSES)
+            record = (record_id, record_date, diagnosis, treatment, "Generated record", patient_id(rng.randrange(self.size.patients)))
+
+            prescriptions = []
+            for number in range(rng.choice([0, 1, 1, 2, 3])):
+                start = record_date
+                prescriptions.append((
+                    record_id, f"PRE{number + 1:07d}", f"{rng.choice([5, 10, 20, 50, 100, 500])}mg",
+                    rng.choice(FREQUENCIES), start, start + datetime.timedelta(days=rng.randint(7, 180)),
+                    medication_id(rng.randrange(self.size.medications))
+                ))
+
+            yield record, prescriptions
+
+    def appointments(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._random("APPOINTMENT")
+        window_days = self.history_days + self.future_days
+        first_day = self.anchor_date - datetime.timedelta(days=self.history_days)
+        anchor = datetime.datetime.combine(self.anchor_date, datetime.time())
+
+        per_doctor = -(-self.size.appointments // self.size.doctors)
+        if per_doctor > window_days * SLOTS_PER_DAY:
+            raise ValueError("Too many appointments per doctor for the date window")
+
+        for index in range(self.size.appointments):
+            doctor = index % self.size.doctors
+            position = index // self.size.doctors
+
+            if per_doctor <= window_days:
+                day_offset, slot = position * window_days // per_doctor, (position * 7) % SLOTS_PER_DAY
+            else:
+                day_offset, slot = position % window_days, position // window_days
+
+            day = first_day + datetime.timedelta(days=day_offset)
+            start = datetime.datetime.combine(day, datetime.time(8)) + datetime.timedelta(minutes=30 * slot)
+
+            if start >= anchor:
+                status = "Scheduled" if rng.random() < 0.95 else "Cancelled"
+            else:
+                status = rng.choices(["Completed", "Cancelled", "No-show"], weights=[85, 10, 5])[0]
+
+            yield (
+                f"APP{index + 1:07d}", start, rng.choice([15, 20, 30]), status, rng.choice(APPOINTMENT_TYPES),
+                "", patient_id(rng.randrange(self.size.patients)), doctor_id(doctor), room_number(doctor)
+            )
+
+
+INSERTS = {
+    "DEPARTMENT": "INSERT INTO DEPARTMENT (deptID, name, location, headDoctor) VALUES (%s, %s, %s, %s)",
+    "DOCTOR": """INSERT INTO DOCTOR (doctorID, name, specialization, office_phone, mobile_phone, email,
+                 pager_number, emergency_contact, departmentID) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+    "ROOM": "INSERT INTO ROOM (roomNumber, type, capacity, status, departmentID) VALUES (%s, %s, %s, %s, %s)",
+    "PATIENT": """INSERT INTO PATIENT (patientID, name, dateOfBirth, street_number, street_name, apt_number,
+                  city, state, zip_code, country, insuranceInfo) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+    "PATIENT_PHONE_NUMBERS": "INSERT INTO PATIENT_PHONE_NUMBERS (patientID, patientPhoneNumber) VALUES (%s, %s)",
+    "MEDICATION": "INSERT INTO MEDICATION (medicationID, name, type, stockLevel, unit) VALUES (%s, %s, %s, %s, %s)",
+    "MEDICAL_RECORD": "INSERT INTO MEDICAL_RECORD (recordID, date, diagnosis, treatment, note, patientID) VALUES (%s, %s, %s, %s, %s, %s)",
+    "PRESCRIPTION": """INSERT INTO PRESCRIPTION (recordID, prescriptionNumber, dosage, frequency, startDate, endDate,
+                       medicationID) VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+    "APPOINTMENT": """INSERT INTO APPOINTMENT (appointmentID, dateTime, duration, status, type, notes, patientID,
+                      doctorID, roomNumber) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+}
+
+
+def _insert_chunked(connection, table: str, rows: Iterator[Tuple[Any, ...]], chunk_size: int) -> int:
+    cursor = connection.cursor()
+    chunk: List[Tuple[Any, ...]] = []
+    total = 0
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            cursor.executemany(INSERTS[table], chunk)
+            connection.commit()
+            total += len(chunk)
+            chunk = []
+
+    if chunk:
+        cursor.executemany(INSERTS[table], chunk)
+        connection.commit()
+        total += len(chunk)
+
+    cursor.close()
+    return total
+
+
+def load(backend: Backend, generator: SyntheticDataGenerator, chunk_size: int = 5000, verbose: bool = True) -> None:
+    connection = backend.connect()
+
+    def report(table: str, count: int) -> None:
+        if verbose:
+            print(f"Loaded {count} rows into {table}")
+
+    report("DEPARTMENT", _insert_chunked(connection, "DEPARTMENT", generator.departments(), chunk_size))
+    report("DOCTOR", _insert_chunked(connection, "DOCTOR", generator.doctors(), chunk_size))
+
+    cursor = connection.cursor()
+    cursor.executemany("UPDATE DEPARTMENT SET headDoctor = %s WHERE deptID = %s", list(generator.department_heads()))
+    connection.commit()
+
+    report("ROOM", _insert_chunked(connection, "ROOM", generator.rooms(), chunk_size))
+    report("PATIENT", _insert_chunked(connection, "PATIENT", generator.patients(), chunk_size))
+    report("PATIENT_PHONE_NUMBERS", _insert_chunked(connection, "PATIENT_PHONE_NUMBERS", generator.phone_numbers(), chunk_size))
+    report("MEDICATION", _insert_chunked(connection, "MEDICATION", generator.medications(), chunk_size))
+
+    records: List[Tuple[Any, ...]] = []
+    prescriptions: List[Tuple[Any, ...]] = []
+    record_count = prescription_count = 0
+    for record, record_prescriptions in generator.records_and_prescriptions():
+        records.append(record)
+        prescriptions.extend(record_prescriptions)
+        if len(records) >= chunk_size:
+            cursor.executemany(INSERTS["MEDICAL_RECORD"], records)
+            cursor.executemany(INSERTS["PRESCRIPTION"], prescriptions)
+            connection.commit()
+            record_count += len(records)
+            prescription_count += len(prescriptions)
+            records, prescriptions = [], []
+    if records:
+        cursor.executemany(INSERTS["MEDICAL_RECORD"], records)
+        cursor.executemany(INSERTS["PRESCRIPTION"], prescriptions)
+        connection.commit()
+        record_count += len(records)
+        prescription_count += len(prescriptions)
+    report("MEDICAL_RECORD", record_count)
+    report("PRESCRIPTION", prescription_count)
+
+    report("APPOINTMENT", _insert_chunked(connection, "APPOINTMENT", generator.appointments(), chunk_size))
+
+    cursor.execute("DELETE FROM ID_SEQUENCE")
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic hospital dataset and load it into an empty database.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="Number of patients; other tables scale with it")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor-date", type=datetime.date.fromisoformat, help="Date that separates past and upcoming appointments (default: today)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default="mysql")
+    parser.add_argument("--sqlite-path", default="hospital_management.db")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="hospital_management")
+    args = parser.parse_args()
+
+    if args.backend == "sqlite":
+        backend = SQLiteBackend(args.sqlite_path)
+    else:
+        backend = MySQLBackend(args.host, args.user, args.password, args.database)
+
+    size = DatasetSize.for_patients(SCALES[args.scale])
+    generator = SyntheticDataGenerator(size, seed=args.seed, anchor_date=args.anchor_date)
+
+    try:
+        load(backend, generator, chunk_size=args.chunk_size)
+    except Error as e:
+        print(f"Error loading synthetic data: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import datetime
+
+from availability_index import AvailabilityIndex
+from backends import SQLiteBackend
+from connection_pool import ConnectionPool
+
+
+def test_changes_made_during_a_refresh_survive_it():
+    pool = ConnectionPool(SQLiteBackend(load_sample_data=True).connect, size=1)
+    index = AvailabilityIndex(pool)
+    index.refresh()
+    start = datetime.datetime(2030, 1, 7, 9)
+    index.add("APP900", "DOC001", "RM101", start, 30)
+
+    read = pool.read
+
+    def read_while_booking(operation, primary=False):
+        rows = read(operation, primary)
+        index.add("APP901", "DOC002", "RM102", start, 30)
+        index.remove("APP900", "DOC001", "RM101")
+        return rows
+
+    pool.read = read_while_booking
+    index.refresh()
+
+    assert not index.is_doctor_available("DOC002", start, 30)
+    assert not index.is_room_available("RM102", start, 30)
+    assert index.is_doctor_available("DOC001", start, 30)
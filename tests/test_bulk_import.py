@@ -0,0 +1,38 @@
+import datetime
+
+from backends import SQLiteBackend
+from bulk_import import CONFLICT_REASONS, BookingRequest
+from hospital_management import HospitalManagementSystem
+
+
+def test_rows_taken_after_planning_are_rejected_by_the_chunk_check():
+    hospital_system = HospitalManagementSystem(pool_size=1, backend=SQLiteBackend(load_sample_data=True))
+    booker = hospital_system.booker
+    start = datetime.datetime(2030, 1, 7, 9)
+    bookings = [
+        BookingRequest(1, "PAT001", "DOC001", start, 30, "Consultation"),
+        BookingRequest(2, "PAT002", "DOC003", start, 30, "Consultation"),
+        BookingRequest(3, "PAT003", "DOC005", start, 30, "Consultation"),
+    ]
+    conflicts = booker.conflicts
+    checked = []
+
+    def conflicts_after_other_writers(connection, rows):
+        # Another process books DOC001 and takes the room planned for the second row out of service.
+        cursor = connection.cursor()
+        cursor.execute(
+            "INSERT INTO APPOINTMENT (appointmentID, dateTime, duration, status, type, patientID, doctorID, roomNumber) "
+            "VALUES ('APP900', %s, 30, 'Scheduled', 'Consultation', 'PAT004', 'DOC001', 'RM102')", (start,)
+        )
+        cursor.execute("UPDATE ROOM SET status = 'Maintenance' WHERE roomNumber = %s", (rows[1][2],))
+        cursor.close()
+        checked.append(len(rows))
+        return conflicts(connection, rows)
+
+    booker.conflicts = conflicts_after_other_writers
+    report = hospital_system.bulk_schedule_appointments(bookings)
+
+    assert checked == [3]
+    assert [result.accepted for result in report.results] == [False, False, True]
+    assert report.results[0].reason == CONFLICT_REASONS["doctor"]
+    assert report.results[1].reason == CONFLICT_REASONS["room"]
@@ -0,0 +1,21 @@
+from backends import SQLiteBackend
+from connection_pool import ConnectionPool
+from history_cache import HistoryCache
+from medical_history import MedicalHistoryBuilder
+
+
+def test_renaming_a_doctor_or_medication_refreshes_cached_histories():
+    pool = ConnectionPool(SQLiteBackend(load_sample_data=True).connect, size=1)
+    cache = HistoryCache(pool, MedicalHistoryBuilder(pool))
+    cache.get("PAT001")
+
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("UPDATE DOCTOR SET name = 'Dr. Renamed' WHERE doctorID = 'DOC001'")
+        cursor.execute("UPDATE MEDICATION SET name = 'Renamed' WHERE medicationID = 'MED001'")
+        connection.commit()
+
+    history = cache.get("PAT001")
+    assert "Dr. Renamed" in [appointment.doctor_name for appointment in history.appointments]
+    prescriptions = [prescription for record in history.records for prescription in record.prescriptions]
+    assert "Renamed" in [prescription.medication_name for prescription in prescriptions]
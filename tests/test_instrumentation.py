@@ -0,0 +1,31 @@
+from backends import SQLiteBackend
+from hospital_management import HospitalManagementSystem
+from instrumentation import QueryMetrics, fingerprint
+from statement_cache import PATIENT_EXISTS
+
+
+def test_cached_statement_records_every_call():
+    metrics = QueryMetrics()
+    hospital_system = HospitalManagementSystem(pool_size=1, backend=SQLiteBackend(load_sample_data=True), metrics=metrics)
+    metrics.reset()
+
+    for _ in range(5):
+        assert hospital_system.is_valid_patient("PAT001")
+
+    calls = [stats for _, stats in metrics.statements() if stats.fingerprint == fingerprint(PATIENT_EXISTS)]
+    assert len(calls) == 1
+    assert calls[0].calls == 5
+    assert calls[0].rows == 5
+
+
+def test_statements_are_attributed_to_the_application_method():
+    metrics = QueryMetrics()
+    hospital_system = HospitalManagementSystem(pool_size=1, backend=SQLiteBackend(load_sample_data=True), metrics=metrics)
+    metrics.reset()
+
+    hospital_system.is_valid_patient("PAT001")
+    hospital_system.is_valid_doctor("DOC001")
+    hospital_system.listings.doctors_page(page_size=5)
+
+    callers = {caller for caller, _ in metrics.statements()}
+    assert callers == {"hospital_management.is_valid_patient", "reference_cache.get", "listings.doctors_page"}
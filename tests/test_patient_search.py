@@ -0,0 +1,38 @@
+import threading
+
+from backends import SQLiteBackend
+from connection_pool import ConnectionPool
+from patient_search import PatientSearch
+
+
+def test_expired_index_is_served_while_it_rebuilds():
+    pool = ConnectionPool(SQLiteBackend(load_sample_data=True).connect, size=2)
+    search = PatientSearch(pool)
+    search.search("anything")
+    search.upsert("PAT900", "Zelda Quartermaine", "Springfield")
+
+    read = pool.read
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_read(operation, primary=False):
+        started.set()
+        release.wait(5)
+        return read(operation, primary)
+
+    pool.read = slow_read
+    search.ttl = 0
+    search._loaded_at -= 1
+
+    assert search.search("Zelda Quartermaine")[0].patient_id == "PAT900"
+    assert started.wait(5)
+    assert search.search("Zelda Quartermaine")[0].patient_id == "PAT900"
+
+    search.upsert("PAT901", "Yorick Pennyworth", "Shelbyville")
+    search.ttl = 300
+    release.set()
+    while search._rebuilding:
+        threading.Event().wait(0.01)
+
+    assert search.search("Yorick Pennyworth")[0].patient_id == "PAT901"
+    assert all(match.patient_id != "PAT900" for match in search.search("Zelda Quartermaine"))
@@ -0,0 +1,28 @@
+import datetime
+
+from recurring import RecurrenceRule
+
+WEDNESDAY = datetime.date(2030, 1, 2)
+
+
+def test_weeks_are_counted_from_the_first_occurrence():
+    rule = RecurrenceRule(WEDNESDAY, datetime.time(10), duration=30, weeks=12, weekdays=(0,))
+    starts = rule.occurrences()
+
+    assert len(starts) == 12
+    assert starts[0] == datetime.datetime(2030, 1, 7, 10)
+    assert all(later - earlier == datetime.timedelta(weeks=1) for earlier, later in zip(starts, starts[1:]))
+
+
+def test_several_weekdays_with_an_interval():
+    rule = RecurrenceRule(WEDNESDAY, datetime.time(10), duration=30, weeks=4, weekdays=(0, 3), interval=2)
+    starts = [start.date() for start in rule.occurrences()]
+
+    assert starts == [datetime.date(2030, 1, 3), datetime.date(2030, 1, 7),
+                      datetime.date(2030, 1, 17), datetime.date(2030, 1, 21)]
+
+
+def test_start_date_is_the_weekday_by_default():
+    rule = RecurrenceRule(WEDNESDAY, datetime.time(10), duration=30, weeks=3)
+
+    assert [start.date() for start in rule.occurrences()] == [WEDNESDAY + datetime.timedelta(weeks=week) for week in range(3)]
@@ -0,0 +1,26 @@
+from backends import SQLiteBackend
+from connection_pool import ConnectionPool
+from sequence_allocator import ID_LENGTH, SequenceAllocator
+
+
+def allocate_from(next_value: int, count: int):
+    backend = SQLiteBackend(load_sample_data=True)
+    pool = ConnectionPool(backend.connect, size=1)
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("INSERT INTO ID_SEQUENCE (name, next_value) VALUES ('APPOINTMENT', %s)", (next_value,))
+        connection.commit()
+        cursor.close()
+    return SequenceAllocator(pool, backend, block_size=2).allocate("APPOINTMENT", "appointmentID", "APP", count)
+
+
+def test_ids_sort_numerically_past_999():
+    ids = allocate_from(998, 4)
+    assert ids == ["APP0000998", "APP0000999", "APP0001000", "APP0001001"]
+    assert sorted(ids) == ids
+
+
+def test_ids_sort_numerically_past_9999():
+    ids = allocate_from(9998, 4)
+    assert sorted(ids) == ids
+    assert all(len(appointment_id) == ID_LENGTH for appointment_id in ids)
@@ -0,0 +1,20 @@
+import datetime
+
+from backends import SQLiteBackend
+from hospital_management import HospitalManagementSystem
+
+
+def test_bookings_from_another_instance_appear_after_the_refresh_interval(tmp_path):
+    path = str(tmp_path / "hospital.db")
+    first = HospitalManagementSystem(pool_size=1, backend=SQLiteBackend(path, load_sample_data=True))
+    second = HospitalManagementSystem(pool_size=1, backend=SQLiteBackend(path))
+    day = datetime.date.today() + datetime.timedelta(days=30)
+    start = datetime.datetime.combine(day, datetime.time(9))
+
+    confirmation = second.schedule_appointment("PAT001", "DOC001", start, 45, "Consultation")
+    department_id = second.reference.get("rooms", confirmation.room_number)["departmentID"]
+    before = first.utilization.booked_minutes(department_id, day)
+
+    first.utilization.refresh_interval = 0.0
+    assert first.utilization.booked_minutes(department_id, day) == before + 45
+    assert second.utilization.booked_minutes(department_id, day) == before + 45
@@ -0,0 +1,179 @@
+import datetime
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from connection_pool import ConnectionPool
+
+
+@dataclass
+class DepartmentSummary:
+    dept_id: str
+    name: str
+    location: str
+    head_doctor: Optional[str]
+    room_count: int = 0
+    doctor_count: int = 0
+    rooms_by_status: Dict[str, int] = field(default_factory=dict)
+    booked_minutes: Dict[datetime.date, int] = field(default_factory=dict)
+
+
+def _as_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+def _record_appointment(summaries: Dict[str, DepartmentSummary], room_departments: Dict[str, str], room_number: str,
+                        start: datetime.datetime, duration: int) -> None:
+    summary = summaries.get(room_departments.get(room_number))
+    day = start.date()
+    if summary is not None and day >= datetime.date.today():
+        summary.booked_minutes[day] = summary.booked_minutes.get(day, 0) + duration
+
+
+def _move_doctor(summaries: Dict[str, DepartmentSummary], from_dept_id: Optional[str], to_dept_id: str) -> None:
+    if from_dept_id == to_dept_id:
+        return
+    if from_dept_id in summaries:
+        summaries[from_dept_id].doctor_count -= 1
+    if to_dept_id in summaries:
+        summaries[to_dept_id].doctor_count += 1
+
+
+class UtilizationSummary:
+    def __init__(self, pool: ConnectionPool, refresh_interval: float = 60.0):
+        self.pool = pool
+        self.refresh_interval = refresh_interval
+
+        self._departments: Dict[str, DepartmentSummary] = {}
+        self._room_departments: Dict[str, str] = {}
+        self._room_status_totals: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._changes: Optional[List[Tuple[str, tuple]]] = None
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            self._rebuild()
+
+    def _fetch(self, connection) -> Tuple[List[tuple], List[tuple], List[tuple], List[tuple]]:
+        today = datetime.date.today()
+        cursor = connection.cursor()
+
+        cursor.execute("""
+            SELECT d.deptID, d.name, d.location, doc.name
+            FROM DEPARTMENT d
+            LEFT JOIN DOCTOR doc ON d.headDoctor = doc.doctorID
+        """)
+        departments = cursor.fetchall()
+
+        cursor.execute("SELECT departmentID, COUNT(*) FROM DOCTOR GROUP BY departmentID")
+        doctor_counts = cursor.fetchall()
+
+        cursor.execute("SELECT roomNumber, departmentID, status FROM ROOM")
+        rooms = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT r.departmentID, DATE(a.dateTime), SUM(a.duration)
+            FROM APPOINTMENT a
+            JOIN ROOM r ON a.roomNumber = r.roomNumber
+            WHERE a.status = 'Scheduled' AND a.dateTime >= %s
+            GROUP BY r.departmentID, DATE(a.dateTime)
+        """, (today,))
+        booked = cursor.fetchall()
+
+        cursor.close()
+        return departments, doctor_counts, rooms, booked
+
+    def _rebuild(self) -> None:
+        # Deltas recorded while the rows are read are logged and replayed onto the new summaries below. One whose
+        # commit the read already saw is counted twice until the next refresh.
+        with self._lock:
+            self._changes = []
+        try:
+            departments, doctor_counts, rooms, booked = self.pool.read(self._fetch, primary=True)
+        except Exception:
+            with self._lock:
+                self._changes = None
+            raise
+
+        summaries = {
+            dept_id: DepartmentSummary(dept_id, name, location, head_doctor)
+            for dept_id, name, location, head_doctor in departments
+        }
+
+        for department_id, count in doctor_counts:
+            if department_id in summaries:
+                summaries[department_id].doctor_count = count
+
+        room_departments: Dict[str, str] = {}
+        status_totals: Dict[str, int] = {}
+        for room_number, department_id, status in rooms:
+            room_departments[room_number] = department_id
+            status_totals[status] = status_totals.get(status, 0) + 1
+            if department_id in summaries:
+                summary = summaries[department_id]
+                summary.room_count += 1
+                summary.rooms_by_status[status] = summary.rooms_by_status.get(status, 0) + 1
+
+        for department_id, day, minutes in booked:
+            if department_id in summaries:
+                summaries[department_id].booked_minutes[_as_date(day)] = int(minutes)
+
+        with self._lock:
+            for change, args in self._changes:
+                if change == "appointment":
+                    _record_appointment(summaries, room_departments, *args)
+                else:
+                    _move_doctor(summaries, *args)
+            self._changes = None
+
+            self._departments = summaries
+            self._room_departments = room_departments
+            self._room_status_totals = status_totals
+            self._loaded_at = time.monotonic()
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_interval
+
+    def _ensure_loaded(self) -> None:
+        if self._expired():
+            with self._refresh_lock:
+                if self._expired():
+                    self._rebuild()
+
+    def departments(self) -> List[DepartmentSummary]:
+        self._ensure_loaded()
+        with self._lock:
+            return sorted(self._departments.values(), key=lambda summary: summary.name)
+
+    def department(self, dept_id: str) -> Optional[DepartmentSummary]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._departments.get(dept_id)
+
+    def room_status_totals(self) -> Dict[str, int]:
+        self._ensure_loaded()
+        with self._lock:
+            return dict(self._room_status_totals)
+
+    def booked_minutes(self, dept_id: str, day: datetime.date) -> int:
+        summary = self.department(dept_id)
+        return summary.booked_minutes.get(day, 0) if summary else 0
+
+    def record_appointment(self, room_number: str, start: datetime.datetime, duration: int) -> None:
+        with self._lock:
+            _record_appointment(self._departments, self._room_departments, room_number, start, duration)
+            if self._changes is not None:
+                self._changes.append(("appointment", (room_number, start, duration)))
+
+    def move_doctor(self, from_dept_id: Optional[str], to_dept_id: str) -> None:
+        with self._lock:
+            _move_doctor(self._departments, from_dept_id, to_dept_id)
+            if self._changes is not None:
+                self._changes.append(("doctor", (from_dept_id, to_dept_id)))